@@ -1,6 +1,316 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
+from tkinter import ttk, messagebox, scrolledtext, filedialog
 import sqlite3
+import threading
+import queue
+import re
+import argparse
+import bisect
+import csv
+import itertools
+import json
+import os
+import random
+import shutil
+import struct
+import sys
+import tempfile
+import time
+import urllib.parse
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from datetime import date, timedelta
+
+# Reference point for the startup timeline
+PROCESS_STARTED = time.perf_counter()
+
+TABLES_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS Patient (
+        patient_id INTEGER PRIMARY KEY,
+        full_name TEXT NOT NULL,
+        date_of_birth TEXT,
+        street TEXT,
+        city TEXT,
+        province TEXT,
+        postal_code TEXT,
+        gender TEXT,
+        phone TEXT,
+        email TEXT UNIQUE,
+        medical_history TEXT,
+        insurance TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Room (
+        room_number INTEGER PRIMARY KEY,
+        room_type TEXT,
+        capacity INTEGER DEFAULT 0,
+        availability TEXT DEFAULT 'Y' CHECK (availability IN ('Y', 'N'))
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Staff (
+        staff_id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        phone TEXT,
+        email TEXT,
+        salary REAL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Staff_Schedule (
+        schedule_id INTEGER PRIMARY KEY,
+        staff_id INTEGER NOT NULL,
+        start_time TEXT NOT NULL,
+        end_time TEXT NOT NULL,
+        FOREIGN KEY (staff_id) REFERENCES Staff(staff_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Dentist (
+        staff_id INTEGER PRIMARY KEY,
+        license_no TEXT,
+        specialization TEXT,
+        FOREIGN KEY (staff_id) REFERENCES Staff(staff_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Dental_Assistant (
+        staff_id INTEGER PRIMARY KEY,
+        certification TEXT,
+        FOREIGN KEY (staff_id) REFERENCES Staff(staff_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Receptionist (
+        staff_id INTEGER PRIMARY KEY,
+        FOREIGN KEY (staff_id) REFERENCES Staff(staff_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Appointment (
+        appointment_id INTEGER PRIMARY KEY,
+        patient_id INTEGER NOT NULL,
+        room_number INTEGER NOT NULL,
+        appointment_datetime TEXT NOT NULL,
+        status TEXT DEFAULT 'SCHEDULED' CHECK (status IN ('SCHEDULED', 'COMPLETED', 'CANCELLED')),
+        FOREIGN KEY (patient_id) REFERENCES Patient(patient_id),
+        FOREIGN KEY (room_number) REFERENCES Room(room_number)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Appointment_Staff (
+        appointment_id INTEGER NOT NULL,
+        staff_id INTEGER NOT NULL,
+        PRIMARY KEY (appointment_id, staff_id),
+        FOREIGN KEY (appointment_id) REFERENCES Appointment(appointment_id),
+        FOREIGN KEY (staff_id) REFERENCES Staff(staff_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Dental_Action (
+        dental_action_id INTEGER PRIMARY KEY,
+        appointment_id INTEGER NOT NULL,
+        cost REAL,
+        FOREIGN KEY (appointment_id) REFERENCES Appointment(appointment_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Treatment (
+        treatment_id INTEGER PRIMARY KEY,
+        dental_action_id INTEGER NOT NULL,
+        description TEXT,
+        type TEXT,
+        FOREIGN KEY (dental_action_id) REFERENCES Dental_Action(dental_action_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Prescription (
+        prescription_id INTEGER PRIMARY KEY,
+        dental_action_id INTEGER NOT NULL,
+        medication TEXT NOT NULL,
+        dosage TEXT,
+        duration TEXT,
+        FOREIGN KEY (dental_action_id) REFERENCES Dental_Action(dental_action_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Inventory (
+        item_id INTEGER PRIMARY KEY,
+        item_name TEXT NOT NULL,
+        quantity INTEGER NOT NULL,
+        supplier TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS DentalAction_Inventory (
+        dental_action_id INTEGER NOT NULL,
+        item_id INTEGER NOT NULL,
+        quantity_used INTEGER NOT NULL,
+        PRIMARY KEY (dental_action_id, item_id),
+        FOREIGN KEY (dental_action_id) REFERENCES Dental_Action(dental_action_id),
+        FOREIGN KEY (item_id) REFERENCES Inventory(item_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Bill (
+        bill_id INTEGER PRIMARY KEY,
+        dental_action_id INTEGER NOT NULL,
+        total_amount REAL,
+        status TEXT DEFAULT 'UNPAID' CHECK (status IN ('UNPAID', 'PARTIALLY_PAID', 'PAID')),
+        issue_date TEXT,
+        FOREIGN KEY (dental_action_id) REFERENCES Dental_Action(dental_action_id)
+    )
+    """
+]
+
+# Parents before children, so foreign keys always point at rows already loaded
+TABLE_LOAD_ORDER = [
+    'Patient',
+    'Room',
+    'Staff',
+    'Staff_Schedule',
+    'Dentist',
+    'Dental_Assistant',
+    'Receptionist',
+    'Appointment',
+    'Appointment_Staff',
+    'Dental_Action',
+    'Treatment',
+    'Prescription',
+    'Inventory',
+    'DentalAction_Inventory',
+    'Bill'
+]
+
+
+# Secondary indexes for the joins and filters used by the canned reports.
+# Several are covering so the report never has to touch the base table.
+INDEXES_SQL = [
+    "CREATE INDEX IF NOT EXISTS idx_patient_city ON Patient(city, full_name)",
+    "CREATE INDEX IF NOT EXISTS idx_room_type ON Room(room_type, availability)",
+    "CREATE INDEX IF NOT EXISTS idx_staff_schedule_staff ON Staff_Schedule(staff_id)",
+    "CREATE INDEX IF NOT EXISTS idx_dentist_specialization ON Dentist(specialization)",
+    "CREATE INDEX IF NOT EXISTS idx_appointment_patient ON Appointment(patient_id)",
+    "CREATE INDEX IF NOT EXISTS idx_appointment_status_datetime ON Appointment(status, appointment_datetime)",
+    "CREATE INDEX IF NOT EXISTS idx_appointment_datetime ON Appointment(appointment_datetime)",
+    "CREATE INDEX IF NOT EXISTS idx_appointment_staff_staff ON Appointment_Staff(staff_id, appointment_id)",
+    "CREATE INDEX IF NOT EXISTS idx_dental_action_appointment ON Dental_Action(appointment_id, cost)",
+    "CREATE INDEX IF NOT EXISTS idx_dental_action_cost ON Dental_Action(cost)",
+    "CREATE INDEX IF NOT EXISTS idx_treatment_dental_action ON Treatment(dental_action_id)",
+    "CREATE INDEX IF NOT EXISTS idx_treatment_type ON Treatment(type)",
+    "CREATE INDEX IF NOT EXISTS idx_prescription_dental_action ON Prescription(dental_action_id)",
+    "CREATE INDEX IF NOT EXISTS idx_prescription_medication ON Prescription(medication COLLATE NOCASE)",
+    "CREATE INDEX IF NOT EXISTS idx_inventory_quantity ON Inventory(quantity)",
+    "CREATE INDEX IF NOT EXISTS idx_dai_item ON DentalAction_Inventory(item_id, quantity_used)",
+    "CREATE INDEX IF NOT EXISTS idx_bill_dental_action ON Bill(dental_action_id, total_amount)",
+    "CREATE INDEX IF NOT EXISTS idx_bill_status_issue_date ON Bill(status, issue_date)"
+]
+
+# Lets the billing report refresh look up changed patients by name
+PATIENT_NAME_INDEX_SQL = "CREATE INDEX IF NOT EXISTS idx_patient_full_name ON Patient(full_name)"
+
+
+# Lists the clinic's own tables, leaving out SQLite internals, FTS shadow
+# tables, materialized report tables and the change counters
+USER_TABLES_SQL = r"""
+    SELECT name FROM sqlite_master
+    WHERE type='table'
+    AND name != 'table_versions'
+    AND name NOT LIKE 'sqlite\_%' ESCAPE '\'
+    AND name NOT LIKE 'mv\_%' ESCAPE '\'
+    AND name NOT LIKE '%\_fts' ESCAPE '\'
+    AND name NOT LIKE '%\_fts\_%' ESCAPE '\'
+    ORDER BY name
+"""
+
+# Canned reports are re-run with different parameters, so keep plenty of
+# prepared statements around instead of re-parsing them
+CACHED_STATEMENTS = 256
+
+
+def create_tables(connection):
+    # Creates whatever is missing (every migration step is idempotent) and
+    # marks the schema current
+    SchemaMigrator().migrate(connection, reapply=True)
+
+
+def create_clinic_tables(connection):
+    cursor = connection.cursor()
+    for sql in TABLES_SQL:
+        cursor.execute(sql)
+
+
+def create_indexes(connection):
+    # Like the other migration steps this leaves committing to the caller
+    cursor = connection.cursor()
+    for sql in INDEXES_SQL:
+        cursor.execute(sql)
+
+
+def create_patient_name_index(connection):
+    connection.execute(PATIENT_NAME_INDEX_SQL)
+
+
+class SchemaMigrator:
+    # Ordered schema changes keyed on PRAGMA user_version. Each step runs in
+    # its own savepoint together with the version bump, so a failed step
+    # leaves the database at the previous version. Outside a transaction the
+    # savepoint commits on release; inside one it nests and the caller
+    # commits. On a current database the only cost is reading user_version.
+    # Steps must be idempotent (older databases already have some of these
+    # objects) and must not commit. New schema changes are appended with the
+    # next version number.
+    MIGRATIONS = [
+        (1, "Create clinic tables", create_clinic_tables),
+        (2, "Add indexes for the canned reports", create_indexes),
+        (3, "Add full-text search tables", lambda connection: SearchEngine().create(connection)),
+        (4, "Materialize the heavy join reports", lambda connection: ReportMaterializer().create(connection)),
+        (5, "Track per-table change counters", lambda connection: TableVersions().create(connection)),
+        (6, "Index patient names for report refreshes", create_patient_name_index)
+    ]
+    LATEST = MIGRATIONS[-1][0]
+
+    @staticmethod
+    def current_version(connection):
+        return connection.execute("PRAGMA user_version").fetchone()[0]
+
+    def pending(self, connection):
+        version = self.current_version(connection)
+        if version > self.LATEST:
+            raise ValueError(f"Database schema version {version} is newer than this application supports "
+                             f"({self.LATEST})")
+        return [step for step in self.MIGRATIONS if step[0] > version]
+
+    def migrate(self, connection, reapply=False, progress=None):
+        # Returns the versions applied; reapply runs every step again to
+        # restore dropped objects. progress(version, description) is called
+        # before each step.
+        steps = self.MIGRATIONS if reapply else self.pending(connection)
+        current = self.current_version(connection)
+        applied = []
+        for version, description, step in steps:
+            if progress:
+                progress(version, description)
+            connection.execute("SAVEPOINT migration")
+            try:
+                step(connection)
+                connection.execute(f"PRAGMA user_version = {max(version, current)}")
+                connection.execute("RELEASE migration")
+            except Exception:
+                connection.execute("ROLLBACK TO migration")
+                connection.execute("RELEASE migration")
+                raise
+            applied.append(version)
+        return applied
+
+    @staticmethod
+    def reset(connection):
+        # After the clinic tables are dropped the next login starts from scratch
+        connection.execute("PRAGMA user_version = 0")
+
 
 class LoginWindow:
     def __init__(self, root):
@@ -15,8 +325,10 @@ class LoginWindow:
         self.db_file = "dental_clinic.db"
         self.connection = None
         self.cursor = None
+        self.timeline = StartupTimeline()
         
         self.setup_login_ui()
+        self.timeline.mark("Login window built")
     
     def center_window(self):
         self.root.update_idletasks()
@@ -103,7 +415,7 @@ class LoginWindow:
         
         try:
             # Test database connection
-            test_conn = sqlite3.connect(self.db_file)
+            test_conn = ConnectionProfile.load().connect(self.db_file)
             test_cursor = test_conn.cursor()
             test_cursor.execute("SELECT 1")
             test_conn.close()
@@ -129,20 +441,26 @@ class LoginWindow:
             messagebox.showerror("Login Failed", "Invalid username or password")
             return
         
+        self.timeline.mark("Login submitted")
         try:
-            # Connect to database
-            self.connection = sqlite3.connect(self.db_file)
+            # Connect to database with the saved connection profile
+            self.profile = ConnectionProfile.load()
+            self.connection = self.profile.connect(self.db_file)
             self.cursor = self.connection.cursor()
+            self.timeline.mark("Database connected")
             
-            # Create tables if they don't exist
-            self.create_tables()
-            self.populate_tables()
+            # Bring the schema up to date; a current database skips all DDL.
+            # Sample data only goes into a database created just now.
+            applied = SchemaMigrator().migrate(self.connection)
+            if 1 in applied:
+                self.populate_tables()
+            self.timeline.mark(f"Schema migrated to v{SchemaMigrator.LATEST}" if applied else "Schema current")
             
             self.status_label.config(text="✅ Logged in successfully! Opening application...", 
                                    foreground='#27ae60')
             
             # Close login window and open main application
-            self.root.after(500, self.open_main_application)
+            self.root.after_idle(self.open_main_application)
             
         except Exception as e:
             self.status_label.config(text=f"❌ Login failed: {str(e)}", foreground='#e74c3c')
@@ -154,155 +472,11 @@ class LoginWindow:
         
         # Open main application window
         main_root = tk.Tk()
-        app = DentalClinicApp(main_root, self.connection, self.cursor)
+        app = DentalClinicApp(main_root, self.connection, self.cursor, self.profile, self.timeline)
         main_root.mainloop()
     
     def create_tables(self):
-        tables_sql = [
-            """
-            CREATE TABLE IF NOT EXISTS Patient (
-                patient_id INTEGER PRIMARY KEY,
-                full_name TEXT NOT NULL,
-                date_of_birth TEXT,
-                street TEXT,
-                city TEXT,
-                province TEXT,
-                postal_code TEXT,
-                gender TEXT,
-                phone TEXT,
-                email TEXT UNIQUE,
-                medical_history TEXT,
-                insurance TEXT
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS Room (
-                room_number INTEGER PRIMARY KEY,
-                room_type TEXT,
-                capacity INTEGER DEFAULT 0,
-                availability TEXT DEFAULT 'Y' CHECK (availability IN ('Y', 'N'))
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS Staff (
-                staff_id INTEGER PRIMARY KEY,
-                name TEXT NOT NULL,
-                phone TEXT,
-                email TEXT,
-                salary REAL
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS Staff_Schedule (
-                schedule_id INTEGER PRIMARY KEY,
-                staff_id INTEGER NOT NULL,
-                start_time TEXT NOT NULL,
-                end_time TEXT NOT NULL,
-                FOREIGN KEY (staff_id) REFERENCES Staff(staff_id)
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS Dentist (
-                staff_id INTEGER PRIMARY KEY,
-                license_no TEXT,
-                specialization TEXT,
-                FOREIGN KEY (staff_id) REFERENCES Staff(staff_id)
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS Dental_Assistant (
-                staff_id INTEGER PRIMARY KEY,
-                certification TEXT,
-                FOREIGN KEY (staff_id) REFERENCES Staff(staff_id)
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS Receptionist (
-                staff_id INTEGER PRIMARY KEY,
-                FOREIGN KEY (staff_id) REFERENCES Staff(staff_id)
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS Appointment (
-                appointment_id INTEGER PRIMARY KEY,
-                patient_id INTEGER NOT NULL,
-                room_number INTEGER NOT NULL,
-                appointment_datetime TEXT NOT NULL,
-                status TEXT DEFAULT 'SCHEDULED' CHECK (status IN ('SCHEDULED', 'COMPLETED', 'CANCELLED')),
-                FOREIGN KEY (patient_id) REFERENCES Patient(patient_id),
-                FOREIGN KEY (room_number) REFERENCES Room(room_number)
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS Appointment_Staff (
-                appointment_id INTEGER NOT NULL,
-                staff_id INTEGER NOT NULL,
-                PRIMARY KEY (appointment_id, staff_id),
-                FOREIGN KEY (appointment_id) REFERENCES Appointment(appointment_id),
-                FOREIGN KEY (staff_id) REFERENCES Staff(staff_id)
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS Dental_Action (
-                dental_action_id INTEGER PRIMARY KEY,
-                appointment_id INTEGER NOT NULL,
-                cost REAL,
-                FOREIGN KEY (appointment_id) REFERENCES Appointment(appointment_id)
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS Treatment (
-                treatment_id INTEGER PRIMARY KEY,
-                dental_action_id INTEGER NOT NULL,
-                description TEXT,
-                type TEXT,
-                FOREIGN KEY (dental_action_id) REFERENCES Dental_Action(dental_action_id)
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS Prescription (
-                prescription_id INTEGER PRIMARY KEY,
-                dental_action_id INTEGER NOT NULL,
-                medication TEXT NOT NULL,
-                dosage TEXT,
-                duration TEXT,
-                FOREIGN KEY (dental_action_id) REFERENCES Dental_Action(dental_action_id)
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS Inventory (
-                item_id INTEGER PRIMARY KEY,
-                item_name TEXT NOT NULL,
-                quantity INTEGER NOT NULL,
-                supplier TEXT
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS DentalAction_Inventory (
-                dental_action_id INTEGER NOT NULL,
-                item_id INTEGER NOT NULL,
-                quantity_used INTEGER NOT NULL,
-                PRIMARY KEY (dental_action_id, item_id),
-                FOREIGN KEY (dental_action_id) REFERENCES Dental_Action(dental_action_id),
-                FOREIGN KEY (item_id) REFERENCES Inventory(item_id)
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS Bill (
-                bill_id INTEGER PRIMARY KEY,
-                dental_action_id INTEGER NOT NULL,
-                total_amount REAL,
-                status TEXT DEFAULT 'UNPAID' CHECK (status IN ('UNPAID', 'PARTIALLY_PAID', 'PAID')),
-                issue_date TEXT,
-                FOREIGN KEY (dental_action_id) REFERENCES Dental_Action(dental_action_id)
-            )
-            """
-        ]
-        
-        for sql in tables_sql:
-            self.cursor.execute(sql)
-        
-        self.connection.commit()
+        create_tables(self.connection)
     
     def populate_tables(self):
         # Check if data already exists
@@ -416,140 +590,3148 @@ class LoginWindow:
             raise
 
 
-class DentalClinicApp:
-    def __init__(self, root, connection, cursor):
+class ConnectionProfile:
+    # PRAGMA settings applied to every connection the app opens, kept in a
+    # JSON file next to the database. Missing entries use the defaults below.
+    CONFIG_FILE = "dental_clinic_config.json"
+    DEFAULTS = {
+        'journal_mode': 'WAL',      # readers don't block the writer
+        'synchronous': 'NORMAL',    # safe with WAL, far fewer fsyncs than FULL
+        'cache_size': -65536,       # negative means KiB, so 64 MiB of page cache
+        'mmap_size': 268435456,     # 256 MiB
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,       # milliseconds
+        'foreign_keys': True
+    }
+    CHOICES = {
+        'journal_mode': ('DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF'),
+        'synchronous': ('OFF', 'NORMAL', 'FULL', 'EXTRA'),
+        'temp_store': ('DEFAULT', 'FILE', 'MEMORY')
+    }
+    # Order matters: journal_mode must be set before anything opens a transaction
+    PRAGMAS = ['journal_mode', 'synchronous', 'cache_size', 'mmap_size', 'temp_store', 'busy_timeout', 'foreign_keys']
+
+    def __init__(self, settings=None, path=None):
+        self.path = path or self.CONFIG_FILE
+        self.settings = self.validate(settings or {})
+
+    @classmethod
+    def load(cls, path=None):
+        path = path or cls.CONFIG_FILE
+        if not os.path.exists(path):
+            return cls(path=path)
+        try:
+            with open(path, encoding='utf-8') as f:
+                return cls(json.load(f), path)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring connection profile {path}: {str(e)}")
+            return cls(path=path)
+
+    def save(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.settings, f, indent=2)
+
+    @classmethod
+    def validate(cls, settings):
+        unknown = set(settings) - set(cls.DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown connection settings: {', '.join(sorted(unknown))}")
+        
+        validated = dict(cls.DEFAULTS)
+        for name, value in settings.items():
+            if name in cls.CHOICES:
+                value = str(value).upper()
+                if value not in cls.CHOICES[name]:
+                    raise ValueError(f"{name} must be one of {', '.join(cls.CHOICES[name])}")
+            elif name == 'foreign_keys':
+                if isinstance(value, str):
+                    value = value.strip().lower() in ('1', 'on', 'true', 'yes')
+                value = bool(value)
+            else:
+                try:
+                    value = int(value)
+                except (TypeError, ValueError):
+                    raise ValueError(f"{name} must be a whole number")
+                if name != 'cache_size' and value < 0:
+                    raise ValueError(f"{name} can't be negative")
+            validated[name] = value
+        return validated
+
+    def connect(self, db_file, read_only=False):
+        # read_only expects a mode=ro URI
+        connection = sqlite3.connect(db_file, cached_statements=CACHED_STATEMENTS, uri=read_only,
+                                     timeout=self.settings['busy_timeout'] / 1000)
+        self.apply(connection, read_only)
+        return connection
+
+    def apply(self, connection, read_only=False):
+        for name in self.PRAGMAS:
+            if read_only and name == 'journal_mode':
+                continue  # Changing it needs write access; the writer sets it
+            value = self.settings[name]
+            if name == 'foreign_keys':
+                value = 'ON' if value else 'OFF'
+            connection.execute(f"PRAGMA {name}={value}").fetchall()
+
+    def effective(self, connection):
+        # What SQLite actually uses, which can differ from the profile
+        # (e.g. WAL is unavailable for in-memory databases)
+        values = {}
+        for name in self.PRAGMAS:
+            value = connection.execute(f"PRAGMA {name}").fetchone()[0]
+            if name in ('synchronous', 'temp_store'):
+                value = self.CHOICES[name][value] if 0 <= value < len(self.CHOICES[name]) else value
+            elif name == 'foreign_keys':
+                value = bool(value)
+            values[name] = value
+        return values
+
+    @staticmethod
+    def describe(values):
+        cache_size = values['cache_size']
+        cache = f"{-cache_size // 1024} MiB" if cache_size < 0 else f"{cache_size} pages"
+        return (f"journal_mode={str(values['journal_mode']).upper()}  "
+                f"synchronous={values['synchronous']}  cache={cache}  "
+                f"mmap={values['mmap_size'] // (1024 * 1024)} MiB  temp_store={values['temp_store']}  "
+                f"busy_timeout={values['busy_timeout']} ms  "
+                f"foreign_keys={'ON' if values['foreign_keys'] else 'OFF'}")
+
+
+class QueryProfiler:
+    # Times every statement the app runs, keyed by a label such as the report
+    # or table name: latency samples for percentiles, row counts and a rolling
+    # log of slow queries with their plans. With tracing on, each connection
+    # also gets a trace callback (every statement SQLite runs, trigger bodies
+    # included) and a progress handler that counts VM steps per query.
+    SLOW_MS = 200
+    MAX_SAMPLES = 1000      # latency samples kept per label
+    SLOW_LOG_SIZE = 100
+    TRACE_LOG_SIZE = 500
+    PROGRESS_STEPS = 1000   # VM instructions between progress handler calls
+
+    def __init__(self, slow_ms=None):
+        self.slow_ms = self.SLOW_MS if slow_ms is None else slow_ms
+        self.lock = threading.Lock()
+        self.stats = {}
+        self.slow_log = deque(maxlen=self.SLOW_LOG_SIZE)
+        self.trace_log = deque(maxlen=self.TRACE_LOG_SIZE)
+        self.tracing = False
+        self.version = 0  # Bumped when tracing is toggled so workers re-attach
+        self.local = threading.local()
+
+    def set_tracing(self, enabled):
+        self.tracing = enabled
+        self.version += 1
+
+    def attach(self, connection):
+        # Must be called on the thread that owns the connection
+        if self.tracing:
+            connection.set_trace_callback(self._trace)
+            connection.set_progress_handler(self._progress, self.PROGRESS_STEPS)
+        else:
+            connection.set_trace_callback(None)
+            connection.set_progress_handler(None, 0)
+
+    def _trace(self, statement):
+        self.trace_log.append((time.strftime('%Y-%m-%d %H:%M:%S'), threading.current_thread().name, statement))
+
+    def _progress(self):
+        self.local.steps = getattr(self.local, 'steps', 0) + 1
+        return 0  # Non-zero would abort the statement
+
+    def start(self):
+        self.local.steps = 0
+        return time.perf_counter()
+
+    def record(self, label, started, sql=None, params=(), rows=None, connection=None, error=None):
+        # Returns the elapsed time in milliseconds
+        elapsed = (time.perf_counter() - started) * 1000
+        steps = getattr(self.local, 'steps', 0) * self.PROGRESS_STEPS if self.tracing else None
+        slow = elapsed >= self.slow_ms
+        plan = None
+        if slow and sql and connection is not None and error is None:
+            try:
+                plan = [row[3] for row in connection.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()]
+            except sqlite3.Error:
+                pass  # Not a single explainable statement
+        
+        with self.lock:
+            entry = self.stats.get(label)
+            if entry is None:
+                entry = self.stats[label] = {'calls': 0, 'errors': 0, 'rows': 0, 'total_ms': 0.0,
+                                             'samples': deque(maxlen=self.MAX_SAMPLES)}
+            entry['calls'] += 1
+            entry['errors'] += error is not None
+            entry['rows'] += rows or 0
+            entry['total_ms'] += elapsed
+            entry['samples'].append(elapsed)
+            if slow:
+                self.slow_log.append({
+                    'time': time.strftime('%Y-%m-%d %H:%M:%S'), 'label': label, 'ms': round(elapsed, 3),
+                    'rows': rows, 'vm_steps': steps, 'sql': sql, 'params': list(params or ()),
+                    'plan': plan, 'error': str(error) if error is not None else None
+                })
+        return elapsed
+
+    @staticmethod
+    def percentile(samples, pct):
+        # Nearest-rank percentile of a list of samples
+        ordered = sorted(samples)
+        if not ordered:
+            return 0.0
+        rank = max(1, -(-len(ordered) * pct // 100))
+        return ordered[int(rank) - 1]
+
+    def summary(self):
+        # [(label, calls, errors, rows, p50, p95, p99, max)], slowest p95 first
+        with self.lock:
+            entries = [(label, dict(entry, samples=list(entry['samples']))) for label, entry in self.stats.items()]
+        rows = []
+        for label, entry in entries:
+            samples = entry['samples']
+            rows.append((label, entry['calls'], entry['errors'], entry['rows'],
+                         self.percentile(samples, 50), self.percentile(samples, 95),
+                         self.percentile(samples, 99), max(samples)))
+        return sorted(rows, key=lambda row: row[5], reverse=True)
+
+    def clear(self):
+        with self.lock:
+            self.stats.clear()
+            self.slow_log.clear()
+            self.trace_log.clear()
+
+    def export(self, path):
+        # JSON for offline analysis: summary, raw samples, slow log and trace
+        columns = ['label', 'calls', 'errors', 'rows', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms']
+        with self.lock:
+            samples = {label: [round(ms, 3) for ms in entry['samples']] for label, entry in self.stats.items()}
+            slow_log = list(self.slow_log)
+            trace = [{'time': t, 'thread': thread, 'sql': sql} for t, thread, sql in self.trace_log]
+        report = {
+            'exported_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'slow_ms': self.slow_ms,
+            'summary': [dict(zip(columns, row)) for row in self.summary()],
+            'samples_ms': samples,
+            'slow_queries': slow_log,
+            'trace': trace
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, default=str)
+        return report
+
+
+class StartupTimeline:
+    # Milestones from process start to an interactive dashboard (and the
+    # tabs built later on first use), shown in the Performance tab
+    def __init__(self, started=None):
+        self.started = PROCESS_STARTED if started is None else started
+        self.events = []  # (label, seconds since start, seconds the step took or None)
+
+    def mark(self, label, duration=None):
+        self.events.append((label, time.perf_counter() - self.started, duration))
+
+    def has(self, label):
+        return any(event[0] == label for event in self.events)
+
+    def at(self, label):
+        # Seconds since start of the first event with this label, 0 if there is none
+        return next((event[1] for event in self.events if event[0] == label), 0.0)
+
+    def rows(self):
+        # (label, at, since previous milestone, duration)
+        rows = []
+        previous = 0.0
+        for label, at, duration in self.events:
+            rows.append((label, at, at - previous, duration))
+            previous = at
+        return rows
+
+
+class ConnectionManager:
+    # Hands out the app's database connections. There is one writer: a
+    # single worker thread that owns the only read-write connection, so
+    # edits, DDL, console statements and imports queue behind each other
+    # instead of competing for the write lock. Query workers open read-only
+    # connections (mode=ro URIs), so reports and browsing never take write
+    # locks, and the Tk thread keeps its connection for metadata reads only
+    # (query_only). Statements that fail with SQLITE_BUSY after busy_timeout,
+    # because another workstation holds the lock, are retried with
+    # exponential backoff.
+    RETRIES = 4
+    BACKOFF = 0.1  # seconds, doubled after every attempt
+
+    def __init__(self, db_file, profile, root=None, profiler=None):
+        self.db_file = db_file
+        self.writer = QueryExecutor(db_file, root, workers=1, profile=profile, profiler=profiler)
+
+    @staticmethod
+    def is_busy(error):
+        message = str(error).lower()
+        return isinstance(error, sqlite3.OperationalError) and ('locked' in message or 'busy' in message)
+
+    @classmethod
+    def retry(cls, fn, *args, connection=None, can_retry=None):
+        for attempt in range(cls.RETRIES + 1):
+            try:
+                return fn(*args)
+            except sqlite3.OperationalError as e:
+                if not cls.is_busy(e) or attempt == cls.RETRIES or (can_retry and not can_retry()):
+                    raise
+                if connection is not None and connection.in_transaction:
+                    connection.rollback()
+                time.sleep(cls.BACKOFF * 2 ** attempt)
+
+    @staticmethod
+    def apply_write(connection, job, sql, params, many=False, read_back=None):
+        # One statement, or one executemany batch, committed as a single
+        # transaction. Returns (rowcount, lastrowid, rows); rows come from
+        # read_back(connection, lastrowid) after the commit, or are None.
+        if job is not None:
+            # The first parameter set stands in for a batch in the slow-query log
+            job.sql = sql
+            job.params = (params[0] if params else ()) if many else params
+        try:
+            cursor = connection.executemany(sql, params) if many else connection.execute(sql, params)
+            connection.commit()
+        except Exception:
+            # Never leave a transaction open for the next write to commit
+            connection.rollback()
+            raise
+        if job is not None:
+            job.rows = cursor.rowcount
+        rows = read_back(connection, cursor.lastrowid) if read_back else None
+        return cursor.rowcount, cursor.lastrowid, rows
+
+    def write(self, sql, params=(), label='write', read_back=None, on_done=None, on_error=None):
+        # Queues one statement on the writer; on_done gets apply_write's result
+        return self.writer.submit(self.apply_write, sql, params, False, read_back, label=label,
+                                  on_done=on_done, on_error=on_error)
+
+    def write_many(self, sql, seq_of_params, label='write', read_back=None, on_done=None, on_error=None):
+        # One statement run for every parameter set and committed once, so a
+        # batch is all-or-nothing
+        return self.writer.submit(self.apply_write, sql, list(seq_of_params), True, read_back, label=label,
+                                  on_done=on_done, on_error=on_error)
+
+
+class QueryJob(Future):
+    # Future for work queued on a QueryExecutor. Unlike a plain Future it can
+    # also be cancelled while running, by interrupting the worker connection.
+    def __init__(self):
+        super().__init__()
+        self.connection = None
+        self.interrupted = False
+        self.lock = threading.Lock()
+        self.on_batch = None
+        self.executor = None
+        self.emitted = False
+        # Filled in for the profiler: fetch helpers record their SQL and rows
+        self.label = None
+        self.sql = None
+        self.params = ()
+        self.rows = None
+
+    def cancel(self):
+        if super().cancel():
+            return True
+        with self.lock:
+            if self.connection is not None and not self.done():
+                self.interrupted = True
+                self.connection.interrupt()
+                return True
+        return False
+
+    def emit(self, batch):
+        # Called from the worker to stream partial results to on_batch
+        self.emitted = True
+        if self.on_batch and not self.interrupted:
+            self.executor.dispatch(self.on_batch, batch)
+
+
+class QueryExecutor:
+    # Runs SQLite work on worker threads that each own their own connection,
+    # so the Tk main loop never waits on a query. Callbacks are delivered on
+    # the Tk thread by polling a queue with root.after; without a root they
+    # run directly on the worker thread (command line use).
+    POLL_MS = 25
+
+    def __init__(self, db_file, root=None, workers=2, profile=None, read_only=False, profiler=None):
+        self.db_file = db_file
         self.root = root
-        self.root.title("Dental Clinic Management System")
-        self.root.geometry("1200x800")
-        self.root.configure(bg='#f5f5f5')
-        
-        # Use passed connection and cursor
-        self.connection = connection
+        self.profile = profile
+        self.read_only = read_only
+        self.profiler = profiler
+        self.tasks = queue.Queue()
+        self.callbacks = queue.Queue()
+        self.threads = []
+        self.running = True
+        
+        for i in range(workers):
+            thread = threading.Thread(target=self._worker_loop, name=f"query-worker-{i}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        
+        if self.root:
+            self.root.after(self.POLL_MS, self._poll)
+
+    def connect(self):
+        db_file = self.db_file
+        if self.read_only:
+            db_file = f"file:{urllib.parse.quote(os.path.abspath(self.db_file))}?mode=ro"
+        if self.profile:
+            return self.profile.connect(db_file, self.read_only)
+        return sqlite3.connect(db_file, cached_statements=CACHED_STATEMENTS, uri=self.read_only)
+
+    def _worker_loop(self):
+        connection = self.connect()
+        applied = self.profile
+        attached = None
+        while True:
+            task = self.tasks.get()
+            if task is None:
+                break
+            if self.profile is not applied:
+                # The profile was edited since this connection was set up
+                self.profile.apply(connection, self.read_only)
+                applied = self.profile
+            if self.profiler and self.profiler.version != attached:
+                self.profiler.attach(connection)
+                attached = self.profiler.version
+            job, fn, args, on_done, on_error, on_cancel = task
+            if not job.set_running_or_notify_cancel():
+                if on_cancel:
+                    self.dispatch(on_cancel)
+                continue
+            with job.lock:
+                job.connection = connection
+            started = self.profiler.start() if self.profiler else None
+            try:
+                # Busy errors are retried unless rows were already streamed out
+                result = ConnectionManager.retry(fn, connection, job, *args, connection=connection,
+                                                 can_retry=lambda: not job.emitted and not job.interrupted)
+            except Exception as e:
+                if connection.in_transaction:
+                    connection.rollback()
+                with job.lock:
+                    job.connection = None
+                if self.profiler:
+                    self.profiler.record(job.label, started, job.sql, job.params, job.rows, error=e)
+                job.set_exception(e)
+                if job.interrupted:
+                    if on_cancel:
+                        self.dispatch(on_cancel)
+                elif on_error:
+                    self.dispatch(on_error, e)
+                continue
+            with job.lock:
+                job.connection = None
+            if self.profiler:
+                self.profiler.record(job.label, started, job.sql, job.params, job.rows, connection)
+            job.set_result(result)
+            if job.interrupted:
+                if on_cancel:
+                    self.dispatch(on_cancel)
+            elif on_done:
+                self.dispatch(on_done, result)
+        connection.close()
+
+    def dispatch(self, callback, *args):
+        if self.root:
+            self.callbacks.put((callback, args))
+        else:
+            callback(*args)
+
+    def _poll(self):
+        if not self.running:
+            return
+        try:
+            while True:
+                callback, args = self.callbacks.get_nowait()
+                try:
+                    callback(*args)
+                except Exception as e:
+                    print(f"Error in query callback: {str(e)}")
+        except queue.Empty:
+            pass
+        self.root.after(self.POLL_MS, self._poll)
+
+    def submit(self, fn, *args, label=None, on_done=None, on_error=None, on_cancel=None, on_batch=None):
+        # fn(connection, job, *args) runs on a worker thread; label names it in the profiler
+        job = QueryJob()
+        job.executor = self
+        job.on_batch = on_batch
+        job.label = label or getattr(fn, '__name__', 'task').strip('_')
+        self.tasks.put((job, fn, args, on_done, on_error, on_cancel))
+        return job
+
+    def run_query(self, sql, params=(), **callbacks):
+        # Result is (columns, rows)
+        return self.submit(self._fetch_all, sql, params, **callbacks)
+
+    def stream_query(self, sql, params=(), batch_size=500, **callbacks):
+        # Rows are delivered in batches through on_batch; result is (columns, row_count)
+        return self.submit(self._fetch_batches, sql, params, batch_size, **callbacks)
+
+    @staticmethod
+    def _fetch_all(connection, job, sql, params):
+        job.sql, job.params = sql, params
+        cursor = connection.execute(sql, params)
+        columns = [desc[0] for desc in cursor.description] if cursor.description else []
+        rows = cursor.fetchall()
+        job.rows = len(rows)
+        return columns, rows
+
+    @staticmethod
+    def _fetch_batches(connection, job, sql, params, batch_size):
+        job.sql, job.params, job.rows = sql, params, 0
+        cursor = connection.execute(sql, params)
+        columns = [desc[0] for desc in cursor.description] if cursor.description else []
+        count = 0
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            count += len(rows)
+            job.rows = count
+            job.emit((columns, rows))
+        return columns, count
+
+    def shutdown(self):
+        self.running = False
+        for _ in self.threads:
+            self.tasks.put(None)
+
+
+class ResultGrid:
+    # Fills a Treeview without freezing the UI: clearing is a single delete
+    # call and rows are inserted from a queue in slices of at most CHUNK_MS,
+    # each slice scheduled with after_idle so input and redraws get a turn.
+    CHUNK_MS = 15
+    SAMPLE_ROWS = 50
+    CHAR_WIDTH = 8
+    MIN_WIDTH = 50
+    MAX_WIDTH = 400
+
+    def __init__(self, tree):
+        self.tree = tree
+        self.columns = []
+        self.pending = deque()
+        self.inserted = 0
+        self.scheduled = False
+        self.generation = 0
+
+    def clear(self):
+        # Rows still queued for the previous result are dropped as well
+        self.generation += 1
+        self.pending.clear()
+        self.scheduled = False
+        self.inserted = 0
+        self.tree.delete(*self.tree.get_children())
+        self.columns = []
+        self.tree["columns"] = []
+
+    def set_columns(self, columns, sample_rows=()):
+        if list(columns) == self.columns:
+            return
+        self.columns = list(columns)
+        self.tree["columns"] = self.columns
+        widths = self.column_widths(self.columns, sample_rows)
+        for col, width in zip(self.columns, widths):
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=width, minwidth=self.MIN_WIDTH)
+
+    def column_widths(self, columns, sample_rows):
+        # Character widths of the heading and a sample of values, not every row
+        widths = [len(str(col)) for col in columns]
+        for row in itertools.islice(sample_rows, self.SAMPLE_ROWS):
+            for i, value in enumerate(row[:len(widths)]):
+                widths[i] = max(widths[i], len(str(value)))
+        return [min(max(width * self.CHAR_WIDTH + 16, self.MIN_WIDTH), self.MAX_WIDTH) for width in widths]
+
+    def show(self, columns, rows):
+        self.clear()
+        self.set_columns(columns, rows)
+        self.append(rows)
+
+    def append(self, rows):
+        self.pending.extend(rows)
+        if self.pending and not self.scheduled:
+            self.scheduled = True
+            self.tree.after_idle(self._insert_chunk, self.generation)
+
+    def row_count(self):
+        return self.inserted + len(self.pending)
+
+    def _insert_chunk(self, generation):
+        if generation != self.generation:
+            return
+        deadline = time.perf_counter() + self.CHUNK_MS / 1000
+        count = 0
+        while self.pending:
+            self.tree.insert("", tk.END, values=self.pending.popleft())
+            count += 1
+            if count % 100 == 0 and time.perf_counter() >= deadline:
+                break
+        self.inserted += count
+        if self.pending:
+            self.tree.after_idle(self._insert_chunk, generation)
+        else:
+            self.scheduled = False
+
+
+class CursorPager:
+    # An open SELECT from the SQL console. Rows are read with fetchmany only
+    # up to the row cap; the rest stay in SQLite until "Fetch More" asks for
+    # them. Only use it on the thread that owns the cursor's connection.
+    BATCH_SIZE = 500
+
+    def __init__(self, cursor):
         self.cursor = cursor
-        self.db_file = "dental_clinic.db"
-        
-        # Track current table and selected row
-        self.current_table = None
-        self.selected_row = None
-        
-        # Setup UI
-        self.setup_ui()
-        
-        # Update dashboard stats
-        self.root.after(100, self.update_dashboard_stats)
-        self.root.after(100, self.populate_table_list)
-    
-    def setup_ui(self):
-        self.setup_styles()
-        
-        # Create notebook for tabbed interface
-        self.notebook = ttk.Notebook(self.root)
-        self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # Create frames for each tab
-        self.dashboard_frame = ttk.Frame(self.notebook)
-        self.query_frame = ttk.Frame(self.notebook)
-        self.tables_frame = ttk.Frame(self.notebook)
-        self.schema_frame = ttk.Frame(self.notebook)
-        self.sql_frame = ttk.Frame(self.notebook)
-        self.search_frame = ttk.Frame(self.notebook)
-        
-        # Add tabs to notebook
-        self.notebook.add(self.dashboard_frame, text="🏠 Dashboard")
-        self.notebook.add(self.query_frame, text="🔍 Query Builder")
-        self.notebook.add(self.tables_frame, text="📊 Browse Tables")
-        self.notebook.add(self.schema_frame, text="📋 Schema")
-        self.notebook.add(self.sql_frame, text="⚡ SQL Console")
-        self.notebook.add(self.search_frame, text="🔎 Search Records")
-        
-        self.setup_dashboard()
-        self.setup_query_frame()
-        self.setup_tables_frame()
-        self.setup_schema_frame()
-        self.setup_sql_frame()
-        self.setup_search_frame()
-    
-    def setup_styles(self):
-        style = ttk.Style()
-        style.theme_use('clam')
-        
-        # Configure styles
-        style.configure('Title.TLabel', font=('Arial', 16, 'bold'), foreground='#2c3e50')
-        style.configure('Subtitle.TLabel', font=('Arial', 12), foreground='#7f8c8d')
-        style.configure('Card.TFrame', background='white', relief='raised', borderwidth=1)
-        style.configure('Card.TLabel', background='white', font=('Arial', 10))
-        style.configure('Success.TLabel', foreground='#27ae60', font=('Arial', 9))
-        style.configure('Warning.TLabel', foreground='#e67e22', font=('Arial', 9))
-        style.configure('Custom.TButton', font=('Arial', 10), padding=(10, 5))
-        style.configure('Danger.TButton', font=('Arial', 10), padding=(10, 5), background='#e74c3c')
-    
-    def setup_dashboard(self):
-        # Header
-        header_frame = ttk.Frame(self.dashboard_frame)
-        header_frame.pack(fill=tk.X, pady=20)
-        
-        title_label = ttk.Label(header_frame, text="Dental Clinic Management System", style='Title.TLabel')
-        title_label.pack()
-        
-        subtitle = ttk.Label(header_frame, text="Professional Database Management Interface", style='Subtitle.TLabel')
-        subtitle.pack(pady=5)
-        
-        # Connection status
-        self.connection_status = ttk.Label(header_frame, text="✅ Connected to database", style='Success.TLabel')
-        self.connection_status.pack()
-        
-        # Stats cards
-        stats_frame = ttk.Frame(self.dashboard_frame)
-        stats_frame.pack(fill=tk.X, pady=20)
-        
-        stats_data = [
-            ("Patients", "SELECT COUNT(*) FROM Patient", "👥"),
-            ("Staff", "SELECT COUNT(*) FROM Staff", "👨‍⚕️"),
-            ("Appointments", "SELECT COUNT(*) FROM Appointment", "📅"),
-            ("Treatments", "SELECT COUNT(*) FROM Treatment", "🦷"),
-            ("Prescriptions", "SELECT COUNT(*) FROM Prescription", "💊"),
-            ("Inventory Items", "SELECT COUNT(*) FROM Inventory", "📦"),
-            ("Bills", "SELECT COUNT(*) FROM Bill", "💰"),
-            ("Dentists", "SELECT COUNT(*) FROM Dentist", "🩺")
-        ]
-        
-        for i, (title, query, icon) in enumerate(stats_data):
-            card = ttk.Frame(stats_frame, style='Card.TFrame')
-            card.grid(row=i//4, column=i%4, padx=10, pady=10, sticky='nsew')
-            stats_frame.columnconfigure(i%4, weight=1)
-            
-            # Card content
-            ttk.Label(card, text=icon, style='Card.TLabel', font=('Arial', 20)).pack(pady=5)
-            ttk.Label(card, text=title, style='Card.TLabel', font=('Arial', 11, 'bold')).pack()
-            count_label = ttk.Label(card, text="Loading...", style='Card.TLabel', font=('Arial', 14, 'bold'))
-            count_label.pack(pady=5)
+        self.columns = [desc[0] for desc in cursor.description]
+        self.fetched = 0
+        self.elapsed = 0.0
+        self.exhausted = False
+        self.lookahead = None
+
+    def fetch(self, job, limit):
+        # Emits (columns, rows) batches to the job; returns the rows fetched by this call
+        started = time.perf_counter()
+        count = 0
+        if self.lookahead is not None:
+            job.emit((self.columns, [self.lookahead]))
+            self.lookahead = None
+            count = 1
+        while count < limit:
+            rows = self.cursor.fetchmany(min(self.BATCH_SIZE, limit - count))
+            if not rows:
+                break
+            count += len(rows)
+            job.emit((self.columns, rows))
+        
+        # Peek one row ahead so "Fetch More" is only offered when there is more
+        self.lookahead = self.cursor.fetchone() if count >= limit else None
+        self.exhausted = self.lookahead is None
+        if self.exhausted:
+            self.cursor.close()
+        self.fetched += count
+        self.elapsed += time.perf_counter() - started
+        job.rows = count
+        return count
+
+    def close(self):
+        # Finalizes the statement so it stops holding a read lock
+        self.cursor.close()
+
+    def finish(self):
+        # Keeps only the rows already fetched; "Fetch More" is no longer offered
+        self.cursor.close()
+        self.lookahead = None
+        self.exhausted = True
+
+
+class ScriptRunner:
+    # Runs a multi-statement script from the SQL console. Statements are split
+    # with sqlite3.complete_statement, so semicolons inside strings and trigger
+    # bodies are left alone. The script runs in a single transaction that is
+    # rolled back on the first error; with continue_on_error each statement
+    # gets its own savepoint instead, so a failure only undoes that statement.
+    # Scripts that issue their own BEGIN/COMMIT are run as written.
+    TRANSACTION_CONTROL = ('BEGIN', 'COMMIT', 'END', 'ROLLBACK', 'SAVEPOINT', 'RELEASE', 'VACUUM')
+    PROGRESS_EVERY = 100
+
+    def __init__(self, row_limit=1000, continue_on_error=False):
+        self.row_limit = row_limit
+        self.continue_on_error = continue_on_error
+
+    @staticmethod
+    def split(script):
+        statements = []
+        current = ""
+        for part in script.split(";"):
+            current += part + ";"
+            if sqlite3.complete_statement(current):
+                statements.append(current)
+                current = ""
+        statements.append(current[:-1])
+        
+        # Drop empty fragments and ones that are only comments
+        return [statement.strip() for statement in statements if ScriptRunner.strip_comments(statement)]
+
+    @staticmethod
+    def strip_comments(statement):
+        return re.sub(r"--[^\n]*|/\*.*?\*/", "", statement, flags=re.S).strip(" \t\r\n;")
+
+    def manages_transactions(self, statements):
+        return any(self.strip_comments(statement).split(None, 1)[0].upper() in self.TRANSACTION_CONTROL
+                   for statement in statements)
+
+    def run(self, connection, statements, job=None):
+        # Returns ([(statement, rowcount, columns, rows, seconds, error)], outcome)
+        manual = self.manages_transactions(statements)
+        savepoints = self.continue_on_error and not manual
+        results = []
+        isolation_level = connection.isolation_level
+        connection.isolation_level = None  # Transactions are managed explicitly below
+        try:
+            if not manual:
+                connection.execute("BEGIN")
+            for number, statement in enumerate(statements, 1):
+                started = time.perf_counter()
+                if savepoints:
+                    connection.execute("SAVEPOINT script_statement")
+                columns, rows, rowcount, error = None, None, -1, None
+                try:
+                    cursor = connection.execute(statement)
+                    if cursor.description:
+                        columns = [desc[0] for desc in cursor.description]
+                        rows = cursor.fetchmany(self.row_limit)
+                    rowcount = cursor.rowcount
+                    cursor.close()
+                except sqlite3.Error as e:
+                    if job is not None and job.interrupted:
+                        raise
+                    error = str(e)
+                    if savepoints:
+                        connection.execute("ROLLBACK TO script_statement")
+                if savepoints:
+                    connection.execute("RELEASE script_statement")
+                results.append((statement, rowcount, columns, rows, time.perf_counter() - started, error))
+                
+                if error and not savepoints:
+                    break
+                if job is not None and number % self.PROGRESS_EVERY == 0:
+                    job.emit((number, len(statements)))
             
-            # Store reference to update later
-            setattr(self, f"{title.lower().replace(' ', '_')}_count", count_label)
-        
-        # Quick actions
-        actions_frame = ttk.LabelFrame(self.dashboard_frame, text="Quick Actions", padding=15)
-        actions_frame.pack(fill=tk.BOTH, expand=True, pady=10)
+            failed = results and results[-1][5] is not None
+            if manual:
+                outcome = ""
+                if failed and connection.in_transaction:
+                    connection.rollback()
+                    outcome = "rolled back"
+            elif failed and not savepoints:
+                connection.rollback()
+                outcome = "rolled back"
+            else:
+                connection.commit()
+                outcome = "committed"
+            return results, outcome
+        except Exception:
+            if connection.in_transaction:
+                connection.rollback()
+            raise
+        finally:
+            connection.isolation_level = isolation_level
+
+    @staticmethod
+    def format_report(results, outcome, row_limit):
+        total = sum(seconds for _, _, _, _, seconds, _ in results)
+        errors = sum(1 for *_, error in results if error)
+        lines = [f"Script: {len(results)} statement(s) in {total:.3f}s, {errors} error(s)"
+                 + (f", {outcome}" if outcome else "")]
+        for number, (statement, rowcount, columns, rows, seconds, error) in enumerate(results, 1):
+            text = " ".join(statement.split())
+            if len(text) > 80:
+                text = text[:77] + "..."
+            if error:
+                status = f"❌ {error}"
+            elif columns is not None:
+                status = f"{len(rows)}{'+' if len(rows) >= row_limit else ''} row(s) returned"
+            elif rowcount >= 0:
+                status = f"{rowcount} row(s) affected"
+            else:
+                status = "ok"
+            lines.append(f"{number:>5}  {seconds:8.4f}s  {status:<28}  {text}")
+        return "\n".join(lines) + "\n"
+
+
+class PagedTableView:
+    # Keyset-paginated view of one table. Only a bounded window of pages is
+    # kept in the Treeview; neighbouring pages are fetched through the query
+    # executor as the scrollbar approaches an edge. Sorting and filtering run
+    # in SQLite: pages are keyed on (sort column, rowid) so paging stays
+    # stable under any sort, and filter values are always bound parameters.
+    PAGE_SIZE = 200
+    MAX_PAGES = 3
+    EDGE_FRACTION = 0.1
+    FILTER_OPERATORS = ('>=', '<=', '!=', '=', '>', '<')
+
+    def __init__(self, tree, v_scrollbar, executor, on_status=None, on_error=None, on_column_use=None,
+                 search_engine=None):
+        self.tree = tree
+        self.v_scrollbar = v_scrollbar
+        self.executor = executor
+        self.on_status = on_status
+        self.on_error = on_error
+        self.on_column_use = on_column_use  # called with (table, column) on every sort or filter
+        self.search_engine = search_engine
+        self.full_text_tables = set()  # tables whose FTS index exists; starts-with filters use it
+        self.grid = ResultGrid(tree)
+
+        self.table_name = None
+        self.columns = []
+        self.sort = None   # (column, descending)
+        self.filters = {}  # column -> filter text
+        self.total_count = None
+        self.pages = deque()  # each page: [first_key, last_key, iids]; keys are rowids unless sorted
+        self.window_offset = 0
+        self.has_before = False
+        self.has_after = False
+        self.pending = False
+        self.generation = 0
+        self.load_generation = 0
+        self.seek_offset = 0
+
+        self.tree.configure(yscrollcommand=self._on_yscroll)
+
+    def _request(self, kind, sql, params):
+        if kind == 'count':
+            generation, current = self.load_generation, lambda: self.load_generation
+        else:
+            generation, current = self.generation, lambda: self.generation
+        
+        def on_done(result):
+            if generation != current():
+                return  # Result for a table or position no longer shown
+            columns, rows = result
+            if kind == 'count':
+                self.total_count = rows[0][0]
+                self.update_status()
+            else:
+                self._apply_page(kind, columns, rows)
         
-        actions = [
-            ("🗑️ Drop Tables", "Remove all tables from the database", self.drop_tables_only),
-            ("➕ Create Tables", "Create database tables", self.create_tables_only),
-            ("📥 Populate Tables", "Insert sample data into tables", self.insert_sample_data_only),
-            ("🔄 Test Connection", "Verify database connectivity", self.test_connection),
-            ("📊 View All Tables", "Browse all database tables", lambda: self.notebook.select(2)),
-            ("🔍 Run Queries", "Execute analytical queries", lambda: self.notebook.select(1)),
-            ("📋 View Schema", "Database structure overview", lambda: self.notebook.select(3)),
-            ("⚡ SQL Console", "Execute custom SQL commands", lambda: self.notebook.select(4)),
-            ("🔎 Search Records", "Search for specific records", lambda: self.notebook.select(5))
-        ]
+        def on_error(error):
+            if generation != current():
+                return
+            self.pending = False
+            if self.on_error:
+                self.on_error(error)
         
-        for i, (text, description, command) in enumerate(actions):
-            btn_frame = ttk.Frame(actions_frame)
-            btn_frame.grid(row=i//3, column=i%3, padx=10, pady=10, sticky='nsew')
-            actions_frame.columnconfigure(i%3, weight=1)
-            actions_frame.rowconfigure(i//3, weight=1)
-            
-            btn = ttk.Button(btn_frame, text=text, command=command, style='Custom.TButton')
+        self.executor.run_query(sql, params, label=f"browse {self.table_name} ({kind})",
+                                on_done=on_done, on_error=on_error)
+
+    def load(self, table_name):
+        self.table_name = table_name
+        self.columns = []
+        self.sort = None
+        self.filters = {}
+        self.clear()
+        self.grid.clear()
+        self.reload()
+
+    def reload(self, offset=0):
+        # Re-count and re-read the window, e.g. after the filters changed
+        self.load_generation += 1
+        self.total_count = None
+        self.seek(offset)
+        where, params = self.where_clause()
+        self._request('count', f"SELECT COUNT(*) FROM {self.table_name}" + (f" WHERE {where}" if where else ""),
+                      params)
+
+    def _configure_columns(self, columns, rows):
+        self.columns = columns
+        self.grid.set_columns(columns, [row[1:] for row in rows])
+        self.update_headings()
+
+    def update_headings(self):
+        # Clicking a heading cycles ascending, descending and unsorted
+        for col in self.columns:
+            arrow = ""
+            if self.sort and self.sort[0] == col:
+                arrow = " ▼" if self.sort[1] else " ▲"
+            self.tree.heading(col, text=f"{col}{arrow}", command=lambda c=col: self.toggle_sort(c))
+
+    def toggle_sort(self, column):
+        if not self.sort or self.sort[0] != column:
+            self.sort = (column, False)
+        elif not self.sort[1]:
+            self.sort = (column, True)
+        else:
+            self.sort = None
+        if self.sort and self.on_column_use:
+            self.on_column_use(self.table_name, column)
+        self.update_headings()
+        self.seek(0)
+
+    def set_filter(self, column, text):
+        # Empty text removes the column's filter
+        text = text.strip()
+        if text:
+            self.filters[column] = text
+            if self.on_column_use:
+                self.on_column_use(self.table_name, column)
+        else:
+            self.filters.pop(column, None)
+        self.reload()
+
+    def clear_filters(self):
+        self.filters = {}
+        self.reload()
+
+    def filter_condition(self, column, text):
+        # "=x", "!=x", ">x", ">=x", "<x", "<=x", "null" and "not null";
+        # "^x" matches values starting with x, looked up through the full-text
+        # index when the column has one; anything else matches values
+        # containing the text
+        if text.lower() == 'null':
+            return f"{column} IS NULL", []
+        if text.lower() == 'not null':
+            return f"{column} IS NOT NULL", []
+        for operator in self.FILTER_OPERATORS:
+            if text.startswith(operator):
+                return f"{column} {operator} ?", [text[len(operator):].strip()]
+        if text.startswith('^'):
+            prefix = text[1:]
+            candidates = None
+            if self.search_engine and self.table_name in self.full_text_tables:
+                candidates = self.search_engine.startswith_condition(self.table_name, column, prefix)
+            if candidates:
+                return f"{candidates[0]} AND {column} LIKE ?", candidates[1] + [f"{prefix}%"]
+            return f"{column} LIKE ?", [f"{prefix}%"]
+        return f"{column} LIKE ?", [f"%{text}%"]
+
+    def where_clause(self):
+        conditions, params = [], []
+        for column, text in self.filters.items():
+            condition, values = self.filter_condition(column, text)
+            conditions.append(condition)
+            params.extend(values)
+        return " AND ".join(conditions), params
+
+    def order_by(self, backward=False):
+        if self.sort is None:
+            return "rowid DESC" if backward else "rowid"
+        column, descending = self.sort
+        if descending != backward:
+            return f"{column} DESC, rowid DESC"
+        return f"{column}, rowid"
+
+    @staticmethod
+    def keyset_condition(column, value, rowid, greater):
+        # Rows after (or before) the key in (column, rowid) order, with NULLs
+        # sorting first as they do in SQLite
+        if greater:
+            if value is None:
+                return f"(({column} IS NULL AND rowid > ?) OR {column} IS NOT NULL)", [rowid]
+            return f"({column}, rowid) > (?, ?)", [value, rowid]
+        if value is None:
+            return f"({column} IS NULL AND rowid < ?)", [rowid]
+        return f"({column} IS NULL OR ({column}, rowid) < (?, ?))", [value, rowid]
+
+    def seek_query(self, offset):
+        where, params = self.where_clause()
+        if self.sort is None and not where:
+            return self.seek_sql(self.table_name), (offset, self.PAGE_SIZE + 1)
+        where = f"WHERE {where} " if where else ""
+        return (f"SELECT rowid, * FROM {self.table_name} {where}ORDER BY {self.order_by()} LIMIT ? OFFSET ?",
+                params + [self.PAGE_SIZE + 1, offset])
+
+    def adjacent_query(self, direction, key):
+        where, params = self.where_clause()
+        if self.sort is None and not where:
+            return self.adjacent_sql(self.table_name, direction), (key, self.PAGE_SIZE + 1)
+        backward = direction == 'before'
+        if self.sort is None:
+            condition, key_params = ("rowid < ?" if backward else "rowid > ?"), [key]
+        else:
+            column, descending = self.sort
+            condition, key_params = self.keyset_condition(column, key[0], key[1], greater=backward == descending)
+        where = f"{where} AND {condition}" if where else condition
+        return (f"SELECT rowid, * FROM {self.table_name} WHERE {where} ORDER BY {self.order_by(backward)} LIMIT ?",
+                params + key_params + [self.PAGE_SIZE + 1])
+
+    def export_query(self):
+        # The whole table as currently filtered and sorted, without the rowid
+        where, params = self.where_clause()
+        where = f" WHERE {where}" if where else ""
+        return f"SELECT * FROM {self.table_name}{where} ORDER BY {self.order_by()}", params
+
+    def _key(self, row):
+        if self.sort is None:
+            return row[0]
+        return (row[1 + self.columns.index(self.sort[0])], row[0])
+
+    def clear(self):
+        self.tree.delete(*self.tree.get_children())
+        self.pages.clear()
+        self.window_offset = 0
+        self.has_before = False
+        self.has_after = False
+        self.pending = False
+
+    def seek(self, offset):
+        if not self.table_name:
+            return
+        offset = max(int(offset), 0)
+        # A new generation discards any page requests still in flight
+        self.generation += 1
+        self.pending = True
+        self.seek_offset = offset
+        self._request('seek', *self.seek_query(offset))
+
+    @staticmethod
+    def seek_sql(table_name):
+        # Parameters: (offset, limit)
+        return (f"SELECT rowid, * FROM {table_name} "
+                f"WHERE rowid >= (SELECT rowid FROM {table_name} ORDER BY rowid LIMIT 1 OFFSET ?) "
+                f"ORDER BY rowid LIMIT ?")
+
+    @staticmethod
+    def adjacent_sql(table_name, direction):
+        # Parameters: (rowid to continue from, limit)
+        if direction == 'after':
+            return f"SELECT rowid, * FROM {table_name} WHERE rowid > ? ORDER BY rowid LIMIT ?"
+        return f"SELECT rowid, * FROM {table_name} WHERE rowid < ? ORDER BY rowid DESC LIMIT ?"
+
+    def seek_fraction(self, fraction):
+        if self.total_count is None:
+            return
+        last_start = max(self.total_count - self.PAGE_SIZE, 0)
+        self.seek(min(int(float(fraction) * self.total_count), last_start))
+
+    def _request_adjacent(self, direction):
+        self.pending = True
+        key = self.pages[-1][1] if direction == 'after' else self.pages[0][0]
+        self._request(direction, *self.adjacent_query(direction, key))
+
+    def _on_yscroll(self, first, last):
+        self.v_scrollbar.set(first, last)
+        if self.pending or not self.pages:
+            return
+        if float(last) >= 1 - self.EDGE_FRACTION and self.has_after:
+            self._request_adjacent('after')
+        elif float(first) <= self.EDGE_FRACTION and self.has_before:
+            self._request_adjacent('before')
+
+    def _apply_page(self, kind, columns, rows):
+        self.pending = False
+        more = len(rows) > self.PAGE_SIZE
+        rows = rows[:self.PAGE_SIZE]
+
+        if kind == 'seek':
+            self.clear()
+            self._configure_columns(columns[1:], rows)
+            self.window_offset = self.seek_offset
+            self.has_before = self.window_offset > 0
+            self.has_after = more
+            self._append_page(rows)
+            self.tree.yview_moveto(0)
+            self.update_status()
+            return
+
+        if not rows:
+            if kind == 'after':
+                self.has_after = False
+            else:
+                self.has_before = False
+            return
+
+        anchor = self._top_visible_item()
+        if kind == 'after':
+            self.has_after = more
+            self._append_page(rows)
+            if len(self.pages) > self.MAX_PAGES:
+                _, _, dropped = self.pages.popleft()
+                self.tree.delete(*dropped)
+                self.window_offset += len(dropped)
+                self.has_before = True
+        else:
+            rows.reverse()
+            self.has_before = more
+            self._prepend_page(rows)
+            self.window_offset = max(self.window_offset - len(rows), 0)
+            if len(self.pages) > self.MAX_PAGES:
+                _, _, dropped = self.pages.pop()
+                self.tree.delete(*dropped)
+                self.has_after = True
+
+        if anchor:
+            self._scroll_to_item(anchor)
+        self.update_status()
+
+    def _append_page(self, rows):
+        if not rows:
+            return
+        iids = [self.tree.insert("", tk.END, iid=str(row[0]), values=row[1:]) for row in rows]
+        self.pages.append([self._key(rows[0]), self._key(rows[-1]), iids])
+
+    def _prepend_page(self, rows):
+        iids = [self.tree.insert("", i, iid=str(row[0]), values=row[1:]) for i, row in enumerate(rows)]
+        self.pages.appendleft([self._key(rows[0]), self._key(rows[-1]), iids])
+
+    def refresh_rows(self, rows):
+        # Rows are (rowid, *values) read back after an edit; only items
+        # already in the window change, so the scroll position is kept
+        for row in rows:
+            if self.tree.exists(str(row[0])):
+                self.tree.item(str(row[0]), values=row[1:])
+
+    def insert_rows(self, rows):
+        # New rows go into the window only where they fall inside the loaded
+        # rowid range; elsewhere they just count towards the total. Under a
+        # sort or filter the position is SQLite's to decide, so the window is
+        # re-read where it stands.
+        if self.sort is not None or self.filters:
+            self.reload(self.window_offset)
+            return
+        for row in rows:
+            rowid, iid = row[0], str(row[0])
+            if self.total_count is not None:
+                self.total_count += 1
+            if self.tree.exists(iid):
+                self.tree.item(iid, values=row[1:])
+                continue
+            if not self.pages:
+                if not self.has_before and not self.has_after:
+                    self.tree.insert("", tk.END, iid=iid, values=row[1:])
+                    self.pages.append([rowid, rowid, [iid]])
+                continue
+            if rowid < self.pages[0][0] and self.has_before:
+                self.window_offset += 1
+                continue
+            if rowid > self.pages[-1][1] and self.has_after:
+                continue
+            # Pages are contiguous, so the row belongs to the first page that
+            # ends at or after it (or the last page if it extends the window)
+            index = 0
+            for page in self.pages:
+                if rowid <= page[1] or page is self.pages[-1]:
+                    position = bisect.bisect_left([int(item) for item in page[2]], rowid)
+                    self.tree.insert("", index + position, iid=iid, values=row[1:])
+                    page[2].insert(position, iid)
+                    page[0], page[1] = min(page[0], rowid), max(page[1], rowid)
+                    break
+                index += len(page[2])
+        self.update_status()
+
+    def remove_rows(self, rowids):
+        iids = {str(rowid) for rowid in rowids}
+        present = [iid for iid in iids if self.tree.exists(iid)]
+        if present:
+            self.tree.delete(*present)
+        for page in list(self.pages):
+            page[2] = [iid for iid in page[2] if iid not in iids]
+            if not page[2]:
+                self.pages.remove(page)
+        if self.total_count is not None:
+            self.total_count = max(self.total_count - len(present), 0)
+        if not self.pages and (self.has_before or self.has_after):
+            # Window emptied; fetch the rows around where it was
+            last_start = max((self.total_count or 0) - self.PAGE_SIZE, 0)
+            self.seek(min(self.window_offset, last_start))
+        self.update_status()
+
+    def _top_visible_item(self):
+        children = self.tree.get_children()
+        if not children:
+            return None
+        index = int(float(self.tree.yview()[0]) * len(children))
+        return children[min(index, len(children) - 1)]
+
+    def _scroll_to_item(self, iid):
+        children = self.tree.get_children()
+        if children and self.tree.exists(iid):
+            self.tree.yview_moveto(self.tree.index(iid) / len(children))
+
+    def loaded_count(self):
+        return sum(len(page[2]) for page in self.pages)
+
+    def update_status(self):
+        if not self.on_status or not self.table_name:
+            return
+        loaded = self.loaded_count()
+        total = "…" if self.total_count is None else self.total_count
+        if loaded:
+            text = (f"Showing {self.window_offset + 1} to {self.window_offset + loaded} "
+                    f"of {total} entries from {self.table_name}")
+        else:
+            text = f"Showing 0 of {total} entries from {self.table_name}"
+        if self.filters:
+            text += " where " + " and ".join(f"{column} {self.describe_filter(value)}"
+                                             for column, value in self.filters.items())
+        if self.sort:
+            text += f", sorted by {self.sort[0]} {'descending' if self.sort[1] else 'ascending'}"
+        self.on_status(text)
+
+    @classmethod
+    def describe_filter(cls, text):
+        if text.lower() in ('null', 'not null'):
+            return f"is {text.lower()}"
+        for operator in cls.FILTER_OPERATORS:
+            if text.startswith(operator):
+                return f"{operator} {text[len(operator):].strip()}"
+        if text.startswith('^'):
+            return f"starts with '{text[1:]}'"
+        return f"contains '{text}'"
+
+
+class QueryRegistry:
+    # The canned reports, built once. Values a user is likely to change are
+    # named parameters with defaults instead of literals, so a report keeps
+    # the same SQL text whatever it runs with and reuses its cached statement.
+    QUERIES = [
+        # (key, description, sql, [(parameter, label, default)])
+        ("patients_from_city", "Find patients from a given city", """
+            SELECT patient_id, full_name, city, phone
+            FROM Patient
+            WHERE city = :city
+            ORDER BY full_name ASC
+            """, [('city', "City", 'Toronto')]),
+        ("available_surgery_rooms", "Find all available surgery rooms", """
+            SELECT room_number, room_type, capacity
+            FROM Room
+            WHERE room_type = 'Surgery'
+            AND availability = 'Y'
+            """, []),
+        ("upcoming_scheduled_appointments", "Get upcoming appointments for scheduled patients", """
+            SELECT appointment_id, appointment_datetime, room_number
+            FROM Appointment
+            WHERE status = 'SCHEDULED'
+            AND appointment_datetime > CURRENT_TIMESTAMP
+            ORDER BY appointment_datetime ASC
+            """, []),
+        ("distinct_staff_emails", "Find distinct staff emails", """
+            SELECT DISTINCT email, salary
+            FROM Staff
+            WHERE email IS NOT NULL
+            ORDER BY salary DESC
+            """, []),
+        ("long_staff_schedules", "Find staff schedules longer than 8 hours", """
+            SELECT schedule_id, staff_id, start_time, end_time
+            FROM Staff_Schedule
+            WHERE (strftime('%s', end_time) - strftime('%s', start_time)) = 8 * 3600
+            ORDER BY start_time ASC
+            """, []),
+        ("orthodontic_dentists", "Get all dentists with specialization in Orthodontics", """
+            SELECT d.staff_id, s.name, d.license_no, d.specialization
+            FROM Dentist d
+            JOIN Staff s ON d.staff_id = s.staff_id
+            WHERE d.specialization = 'Orthodontics';
+            """, []),
+        ("certified_dental_assistants", "List dental assistants with a specific certification", """
+            SELECT da.staff_id, s.name, da.certification
+            FROM Dental_Assistant da
+            JOIN Staff s ON da.staff_id = s.staff_id
+            WHERE da.certification LIKE '%Dental Assistant Level%';
+            """, []),
+        ("receptionist_details", "Show receptionist staff details", """
+            SELECT r.staff_id, s.name, s.phone
+            FROM Receptionist r
+            JOIN Staff s ON r.staff_id = s.staff_id
+            ORDER BY s.name ASC
+            """, []),
+        ("staff_for_appointment", "Find staff assigned to a specific appointment", """
+            SELECT a.appointment_id, s.name, s.email
+            FROM Appointment_Staff a
+            JOIN Staff s ON a.staff_id = s.staff_id
+            WHERE a.appointment_id = :appointment_id
+            """, [('appointment_id', "Appointment ID", 1002)]),
+        ("expensive_dental_actions", "Show dental actions costing more than a given amount", """
+            SELECT dental_action_id, appointment_id, cost
+            FROM Dental_Action
+            WHERE cost > :min_cost
+            ORDER BY cost DESC;
+            """, [('min_cost', "Minimum cost ($)", 200.0)]),
+        ("treatment_count_by_type", "Count treatments by type", """
+            SELECT type, COUNT(*) AS num_treatments
+            FROM Treatment
+            GROUP BY type
+            ORDER BY num_treatments DESC
+            """, []),
+        ("prescriptions_for_medication", "Get prescriptions for a specific medication", """
+            SELECT prescription_id, medication, dosage, duration
+            FROM Prescription
+            WHERE medication LIKE :medication
+            """, [('medication', "Medication (LIKE pattern)", 'Amoxicillin%')]),
+        ("low_stock_items", "Show items low in stock", """
+            SELECT item_id, item_name, quantity
+            FROM Inventory
+            WHERE quantity < :max_quantity
+            ORDER BY quantity ASC
+            """, [('max_quantity', "Fewer than (units)", 40)]),
+        ("total_items_used_per_action", "Find total items used per dental action", """
+            SELECT dental_action_id, SUM(quantity_used) AS total_items_used
+            FROM DentalAction_Inventory
+            GROUP BY dental_action_id
+            ORDER BY total_items_used DESC
+            """, []),
+        ("unpaid_bills_in_period", "List unpaid bills issued within a date range", """
+            SELECT bill_id, dental_action_id, total_amount, status, issue_date
+            FROM Bill
+            WHERE status = 'UNPAID'
+            AND issue_date BETWEEN :start_date AND :end_date
+            ORDER BY total_amount DESC;
+            """, [('start_date', "Issued from", '2025-09-01'), ('end_date', "Issued to", '2025-09-30')]),
+        ("least_popular_treatments", "Find least popular treatment types (occur less than 3 times)", """
+            SELECT t.type, COUNT(*) AS num_treatments
+            FROM Treatment t
+            GROUP BY t.type
+            HAVING COUNT(*) <= 3
+            ORDER BY num_treatments DESC
+            """, []),
+        ("patients_both_treatment_prescription", "Find patients who had both treatments and prescriptions", """
+            SELECT p.patient_id, p.full_name
+            FROM Patient p
+            JOIN Appointment a ON a.patient_id = p.patient_id
+            JOIN Dental_Action da ON a.appointment_id = da.appointment_id
+            JOIN Treatment t ON t.dental_action_id = da.dental_action_id
+            INTERSECT
+            SELECT p.patient_id, p.full_name
+            FROM Patient p
+            JOIN Appointment a ON a.patient_id = p.patient_id
+            JOIN Dental_Action da ON a.appointment_id = da.appointment_id
+            JOIN Prescription pr ON pr.dental_action_id = da.dental_action_id
+            """, []),
+        ("patients_no_bills", "Find patients with appointments but no bills generated", """
+            SELECT DISTINCT p.patient_id, p.full_name
+            FROM Appointment a
+            JOIN Patient p ON a.patient_id = p.patient_id
+            WHERE NOT EXISTS (
+                SELECT 1
+                FROM Bill b
+                JOIN Dental_Action da ON b.dental_action_id = da.dental_action_id
+                WHERE da.appointment_id = a.appointment_id
+            )
+            """, []),
+        ("most_expensive_actions", "Find the most expensive dental actions per patient", """
+            SELECT p.full_name, MAX(da.cost) AS highest_cost
+            FROM Dental_Action da
+            JOIN Appointment a ON da.appointment_id = a.appointment_id
+            JOIN Patient p ON a.patient_id = p.patient_id
+            GROUP BY p.full_name
+            ORDER BY highest_cost DESC
+            """, []),
+        ("patients_no_treatments", "Find patients who had appointments but no treatments", """
+            SELECT p.patient_id, p.full_name
+            FROM Patient p
+            JOIN Appointment a ON p.patient_id = a.patient_id
+            WHERE NOT EXISTS (
+                SELECT 1
+                FROM Dental_Action da
+                JOIN Treatment t ON da.dental_action_id = t.dental_action_id
+                WHERE da.appointment_id = a.appointment_id
+            )
+            """, []),
+        ("inventory_used_by_dentists", "Show inventory items used in treatments involving dentists", """
+            SELECT DISTINCT i.item_name, i.supplier, s.name AS dentist_name
+            FROM Inventory i
+            JOIN DentalAction_Inventory dai ON i.item_id = dai.item_id
+            JOIN Dental_Action da ON dai.dental_action_id = da.dental_action_id
+            JOIN Appointment a ON da.appointment_id = a.appointment_id
+            JOIN Appointment_Staff ast ON a.appointment_id = ast.appointment_id
+            JOIN Dentist d ON ast.staff_id = d.staff_id
+            JOIN Staff s ON d.staff_id = s.staff_id
+            ORDER BY dentist_name, item_name
+            """, []),
+        ("patient_billing_summary", "Patient billing summary (total billed, average bill amount)", """
+            SELECT p.full_name, 
+                   COUNT(b.bill_id) AS num_bills,
+                   SUM(b.total_amount) AS total_billed, 
+                   ROUND(AVG(b.total_amount),2) AS avg_bill
+            FROM Bill b
+            JOIN Dental_Action da ON b.dental_action_id = da.dental_action_id
+            JOIN Appointment a ON da.appointment_id = a.appointment_id
+            JOIN Patient p ON a.patient_id = p.patient_id
+            GROUP BY p.full_name
+            HAVING SUM(b.total_amount) > 0
+            ORDER BY total_billed DESC
+            """, []),
+        ("staff_with_roles", "List all staff members and their roles", """
+            SELECT s.staff_id, s.name, s.email, s.salary,
+                   CASE 
+                       WHEN d.staff_id IS NOT NULL THEN 'Dentist - ' || d.specialization
+                       WHEN da.staff_id IS NOT NULL THEN 'Dental Assistant'
+                       WHEN r.staff_id IS NOT NULL THEN 'Receptionist'
+                       ELSE 'Unknown'
+                   END AS role
+            FROM Staff s
+            LEFT JOIN Dentist d ON s.staff_id = d.staff_id
+            LEFT JOIN Dental_Assistant da ON s.staff_id = da.staff_id
+            LEFT JOIN Receptionist r ON s.staff_id = r.staff_id
+            ORDER BY s.name
+            """, []),
+        ("appointments_with_staff", "Show appointments with assigned staff", """
+            SELECT a.appointment_id, p.full_name AS patient, 
+                   a.appointment_datetime, a.status,
+                   GROUP_CONCAT(s.name, ', ') AS staff_assigned
+            FROM Appointment a
+            JOIN Patient p ON a.patient_id = p.patient_id
+            LEFT JOIN Appointment_Staff ast ON a.appointment_id = ast.appointment_id
+            LEFT JOIN Staff s ON ast.staff_id = s.staff_id
+            GROUP BY a.appointment_id, p.full_name, a.appointment_datetime, a.status
+            ORDER BY a.appointment_datetime DESC
+            """, []),
+        ("inventory_usage_report", "Inventory usage report", """
+            SELECT i.item_name, i.quantity AS current_stock,
+                   COALESCE(SUM(dai.quantity_used), 0) AS total_used,
+                   COUNT(DISTINCT dai.dental_action_id) AS times_used
+            FROM Inventory i
+            LEFT JOIN DentalAction_Inventory dai ON i.item_id = dai.item_id
+            GROUP BY i.item_id, i.item_name, i.quantity
+            ORDER BY total_used DESC
+            """, []),
+    ]
+
+    def __init__(self, queries=None):
+        self.queries = {}
+        self.keys = []
+        for key, description, sql, parameters in queries or self.QUERIES:
+            self.queries[key] = (description, sql, parameters)
+            self.keys.append(key)
+
+    def __contains__(self, key):
+        return key in self.queries
+
+    def descriptions(self):
+        return [(self.queries[key][0], key) for key in self.keys]
+
+    def sql(self, key):
+        return self.queries[key][1]
+
+    def parameters(self, key):
+        return self.queries[key][2]
+
+    def bind(self, key, values=None):
+        # Missing values fall back to the defaults; each value is converted
+        # to the type of its default so "40" compares as a number
+        values = values or {}
+        params = {}
+        for name, label, default in self.parameters(key):
+            value = values.get(name, default)
+            try:
+                params[name] = type(default)(value)
+            except ValueError:
+                raise ValueError(f"Invalid value for {label}: {value!r}")
+        return params
+
+
+class SchemaCatalog:
+    # Table, column, key and index metadata loaded once and shared by every
+    # UI path. It reloads only when PRAGMA schema_version changes (checked at
+    # most every CHECK_INTERVAL seconds) or when the app itself runs DDL.
+    CHECK_INTERVAL = 2.0
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.schema_version = None
+        self.checked_at = 0.0
+        self.tables = []
+        self.columns = {}       # table -> PRAGMA table_info rows
+        self.foreign_keys = {}  # table -> [(column, referenced table, referenced column)]
+        self.indexes = {}       # table -> [(index name, [columns], unique)]
+
+    def invalidate(self):
+        self.schema_version = None
+
+    def ensure_current(self):
+        now = time.monotonic()
+        if self.schema_version is not None and now - self.checked_at < self.CHECK_INTERVAL:
+            return
+        version = self.connection.execute("PRAGMA schema_version").fetchone()[0]
+        self.checked_at = now
+        if version != self.schema_version:
+            self.load()
+            self.schema_version = version
+
+    def load(self):
+        cursor = self.connection.cursor()
+        tables = [row[0] for row in cursor.execute(USER_TABLES_SQL).fetchall()]
+        columns, foreign_keys, indexes = {}, {}, {}
+        for table in tables:
+            columns[table] = cursor.execute(f"PRAGMA table_info({table})").fetchall()
+            foreign_keys[table] = [(row[3], row[2], row[4]) for row in
+                                   cursor.execute(f"PRAGMA foreign_key_list({table})").fetchall()]
+            indexes[table] = []
+            for index in cursor.execute(f"PRAGMA index_list({table})").fetchall():
+                index_columns = [row[2] for row in cursor.execute(f"PRAGMA index_info('{index[1]}')").fetchall()]
+                indexes[table].append((index[1], index_columns, bool(index[2])))
+        # Swap in whole dicts so a reader never sees a half-loaded catalog
+        self.tables, self.columns, self.foreign_keys, self.indexes = tables, columns, foreign_keys, indexes
+
+    def approximate_row_counts(self):
+        # Row estimates from the last ANALYZE: the first number of each
+        # sqlite_stat1 entry is the row count of the table or index
+        exists = self.connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='sqlite_stat1'").fetchone()
+        if not exists:
+            return {}
+        counts = {}
+        for table, stat in self.connection.execute("SELECT tbl, stat FROM sqlite_stat1").fetchall():
+            if stat:
+                counts[table] = max(counts.get(table, 0), int(stat.split()[0]))
+        return counts
+
+    def table_names(self):
+        self.ensure_current()
+        return list(self.tables)
+
+    def has_table(self, table_name):
+        self.ensure_current()
+        return table_name in self.columns
+
+    def table_columns(self, table_name):
+        self.ensure_current()
+        return self.columns.get(table_name, [])
+
+    def column_names(self, table_name):
+        return [col[1] for col in self.table_columns(table_name)]
+
+    def primary_key(self, table_name):
+        # Primary key column names in key order
+        pk_columns = sorted((col for col in self.table_columns(table_name) if col[5]), key=lambda col: col[5])
+        return [col[1] for col in pk_columns]
+
+
+class DashboardStats:
+    # Dashboard counters fetched in a single query and cached. The app's own
+    # inserts and deletes adjust the cache by delta; a full recount is only
+    # needed when PRAGMA data_version shows that another connection wrote.
+    STATS = [
+        ('patients', 'Patient'),
+        ('staff', 'Staff'),
+        ('appointments', 'Appointment'),
+        ('treatments', 'Treatment'),
+        ('prescriptions', 'Prescription'),
+        ('inventory_items', 'Inventory'),
+        ('bills', 'Bill'),
+        ('dentists', 'Dentist')
+    ]
+
+    def __init__(self):
+        self.counts = None
+        self.data_version = None
+
+    def build_query(self, existing_tables):
+        # Missing tables count as zero so one dropped table doesn't fail the lot
+        parts = []
+        for stat, table in self.STATS:
+            if table in existing_tables:
+                parts.append(f"(SELECT COUNT(*) FROM {table}) AS {stat}")
+            else:
+                parts.append(f"0 AS {stat}")
+        return "SELECT " + ", ".join(parts)
+
+    def count_all(self, connection, job=None):
+        existing = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        row = connection.execute(self.build_query(existing)).fetchone()
+        return {stat: count for (stat, _), count in zip(self.STATS, row)}
+
+    def is_current(self, connection):
+        # data_version only changes when some other connection commits
+        version = connection.execute("PRAGMA data_version").fetchone()[0]
+        current = self.counts is not None and version == self.data_version
+        self.data_version = version
+        return current
+
+    def set_counts(self, counts):
+        self.counts = dict(counts)
+
+    def apply_delta(self, table_name, delta):
+        if self.counts is None:
+            return
+        for stat, table in self.STATS:
+            if table == table_name:
+                self.counts[stat] = max(self.counts[stat] + delta, 0)
+
+    def invalidate(self):
+        self.counts = None
+
+
+class BulkImporter:
+    # Streams CSV / JSONL / JSON files into the clinic tables. Rows are read in
+    # chunks and written with executemany inside one transaction, and files
+    # are loaded in TABLE_LOAD_ORDER so parents exist before their children.
+    # The materialized reports' change-log triggers are dropped for the load
+    # and the reports rebuilt once at the end, in the same transaction.
+    CHUNK_SIZE = 10000
+    EXTENSIONS = ('.csv', '.jsonl', '.ndjson', '.json')
+    CONFLICT_MODES = {'abort': "INSERT", 'ignore': "INSERT OR IGNORE", 'replace': "INSERT OR REPLACE"}
+
+    def __init__(self, chunk_size=CHUNK_SIZE, on_conflict='abort'):
+        if on_conflict not in self.CONFLICT_MODES:
+            raise ValueError(f"Unknown conflict mode: {on_conflict}")
+        self.chunk_size = chunk_size
+        self.on_conflict = on_conflict
+
+    def collect_files(self, paths):
+        files = []
+        for path in paths:
+            if os.path.isdir(path):
+                for name in sorted(os.listdir(path)):
+                    if name.lower().endswith(self.EXTENSIONS):
+                        files.append(os.path.join(path, name))
+            else:
+                files.append(path)
+        return files
+
+    def table_for_file(self, path):
+        # "Appointment.csv" or "Appointment_2024.csv" -> Appointment; the longest
+        # matching table name wins so "Appointment_Staff.csv" isn't taken as Appointment
+        stem = os.path.splitext(os.path.basename(path))[0].lower()
+        matches = [table for table in TABLE_LOAD_ORDER
+                   if stem == table.lower() or stem.startswith(table.lower() + "_")
+                   or stem.startswith(table.lower() + "-")]
+        if not matches:
+            raise ValueError(f"{path}: file name does not match any clinic table")
+        return max(matches, key=len)
+
+    def plan(self, paths, table=None):
+        # Returns [(table, path)] ordered so foreign keys are satisfied
+        files = self.collect_files(paths)
+        planned = [(table or self.table_for_file(path), path) for path in files]
+        return sorted(planned, key=lambda item: TABLE_LOAD_ORDER.index(item[0])
+                      if item[0] in TABLE_LOAD_ORDER else len(TABLE_LOAD_ORDER))
+
+    def read_file(self, path):
+        # Yields the header (list of column names) first, then one tuple per row
+        ext = os.path.splitext(path)[1].lower()
+        if ext == '.csv':
+            with open(path, newline='', encoding='utf-8-sig') as f:
+                reader = csv.reader(f)
+                header = next(reader, None)
+                if header is None:
+                    return
+                yield [name.strip() for name in header]
+                for row in reader:
+                    if row:
+                        yield tuple(None if value == "" else value for value in row)
+        elif ext in ('.jsonl', '.ndjson'):
+            # The header is fixed by the first record, so later records may
+            # leave keys out but can't add new ones
+            with open(path, encoding='utf-8') as f:
+                header = None
+                for line_number, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    record = json.loads(line)
+                    if header is None:
+                        header = list(record.keys())
+                        yield header
+                    extra = [name for name in record if name not in header]
+                    if extra:
+                        raise ValueError(f"{path}, line {line_number}: keys not in the first record: "
+                                         f"{', '.join(extra)}")
+                    yield tuple(record.get(name) for name in header)
+        elif ext == '.json':
+            # Plain JSON arrays have to be parsed whole; prefer JSONL for big files
+            with open(path, encoding='utf-8') as f:
+                records = json.load(f)
+            if not records:
+                return
+            # Union of every record's keys, in first-seen order
+            header = list(dict.fromkeys(name for record in records for name in record))
+            yield header
+            for record in records:
+                yield tuple(record.get(name) for name in header)
+        else:
+            raise ValueError(f"{path}: unsupported file type {ext}")
+
+    def import_files(self, connection, paths, table=None, progress=None, job=None):
+        # progress(table, rows_loaded, elapsed_seconds) is called after every chunk.
+        # Returns [(table, path, rows, seconds)]; everything is rolled back on error.
+        plan = self.plan(paths, table)
+        results = []
+        materializer = ReportMaterializer()
+        
+        connection.execute("BEGIN")
+        try:
+            materialized = materializer.is_installed(connection)
+            if materialized:
+                materializer.drop_triggers(connection)
+            for table_name, path in plan:
+                table_columns = [col[1] for col in connection.execute(f"PRAGMA table_info({table_name})")]
+                if not table_columns:
+                    raise ValueError(f"{path}: table {table_name} does not exist")
+                
+                rows_iter = self.read_file(path)
+                header = next(rows_iter, None)
+                if header is None:
+                    results.append((table_name, path, 0, 0.0))
+                    continue
+                unknown = [name for name in header if name not in table_columns]
+                if unknown:
+                    raise ValueError(f"{path}: unknown columns for {table_name}: {', '.join(unknown)}")
+                
+                sql = self.insert_sql(table_name, header)
+                
+                started = time.perf_counter()
+                loaded = 0
+                while True:
+                    if job is not None and job.interrupted:
+                        raise sqlite3.OperationalError("interrupted")
+                    chunk = list(itertools.islice(rows_iter, self.chunk_size))
+                    if not chunk:
+                        break
+                    connection.executemany(sql, chunk)
+                    loaded += len(chunk)
+                    if progress:
+                        progress(table_name, loaded, time.perf_counter() - started)
+                
+                results.append((table_name, path, loaded, time.perf_counter() - started))
+            if materialized:
+                materializer.create(connection)
+                materializer.rebuild_all(connection)
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        return results
+
+    def insert_sql(self, table_name, columns):
+        placeholders = ", ".join("?" for _ in columns)
+        return f"{self.CONFLICT_MODES[self.on_conflict]} INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+
+    @staticmethod
+    def format_summary(results):
+        lines = []
+        total_rows = 0
+        total_seconds = 0.0
+        for table_name, path, rows, seconds in results:
+            rate = rows / seconds if seconds > 0 else 0
+            lines.append(f"{table_name:<25} {rows:>10} rows  {seconds:8.2f}s  {rate:>12,.0f} rows/s  ({os.path.basename(path)})")
+            total_rows += rows
+            total_seconds += seconds
+        rate = total_rows / total_seconds if total_seconds > 0 else 0
+        lines.append(f"{'Total':<25} {total_rows:>10} rows  {total_seconds:8.2f}s  {rate:>12,.0f} rows/s")
+        return "\n".join(lines)
+
+
+class SyntheticDataGenerator:
+    # Seeded, reproducible test data for all 15 clinic tables. Scale 1 is one
+    # clinic (10,000 patients, 100,000 appointments); scale 100 is a clinic
+    # chain with 1M patients and 10M appointments. Rows go through the
+    # BulkImporter executemany path in one transaction. Secondary indexes,
+    # search tables and report snapshots are dropped first and rebuilt from
+    # the finished data, since per-row index and trigger upkeep would
+    # dominate the load.
+    PATIENTS = 10000                # per unit of scale
+    APPOINTMENTS_PER_PATIENT = 10
+    PATIENTS_PER_STAFF = 200
+    STAFF_PER_ROOM = 3
+    INVENTORY_ITEMS = 200
+    BLOCK_SIZE = 5000               # appointments generated (with their children) per block
+    TODAY = date(2025, 10, 31)      # fixed by default, so the data doesn't depend on when it runs
+    HISTORY_DAYS = 1400             # appointments from about 4 years before "today"...
+    FUTURE_DAYS = 180               # ...to 6 months after it
+
+    # (city, province, postal code prefix, phone area code, weight)
+    CITIES = [
+        ('Toronto', 'ON', 'M', '416', 28), ('Mississauga', 'ON', 'L', '905', 9), ('Brampton', 'ON', 'L', '905', 7),
+        ('Ottawa', 'ON', 'K', '613', 8), ('Hamilton', 'ON', 'L', '905', 5), ('Montreal', 'QC', 'H', '514', 12),
+        ('Quebec City', 'QC', 'G', '418', 4), ('Vancouver', 'BC', 'V', '604', 8), ('Surrey', 'BC', 'V', '604', 4),
+        ('Calgary', 'AB', 'T', '403', 8), ('Edmonton', 'AB', 'T', '780', 7), ('Winnipeg', 'MB', 'R', '204', 5),
+        ('Halifax', 'NS', 'B', '902', 3), ('Saskatoon', 'SK', 'S', '306', 2), ('St. John\'s', 'NL', 'A', '709', 1)
+    ]
+    FIRST_NAMES = ['James', 'Mary', 'John', 'Patricia', 'Robert', 'Jennifer', 'Michael', 'Linda', 'David',
+                   'Elizabeth', 'William', 'Susan', 'Richard', 'Jessica', 'Joseph', 'Sarah', 'Thomas', 'Karen',
+                   'Wei', 'Priya', 'Mohammed', 'Fatima', 'Arjun', 'Mei', 'Luc', 'Chloe', 'Omar', 'Aisha',
+                   'Daniel', 'Emily', 'Noah', 'Olivia', 'Liam', 'Emma', 'Ethan', 'Sophia', 'Lucas', 'Amelia']
+    LAST_NAMES = ['Smith', 'Brown', 'Tremblay', 'Martin', 'Roy', 'Wilson', 'MacDonald', 'Gagnon', 'Johnson',
+                  'Taylor', 'Lee', 'Chen', 'Wang', 'Singh', 'Patel', 'Nguyen', 'Khan', 'Campbell', 'Anderson',
+                  'Leblanc', 'Thompson', 'White', 'Li', 'Kim', 'Garcia', 'Cote', 'Ali', 'Scott', 'Young']
+    STREETS = ['Main St', 'King St', 'Queen St', 'Yonge St', 'Oak Ave', 'Maple Dr', 'Pine Rd', 'Elm St',
+               'Bay St', 'Church St', 'Park Ave', 'Lakeshore Blvd', 'Victoria Rd', 'Cedar Cres']
+    GENDERS = [('Female', 50), ('Male', 48), ('Other', 2)]
+    INSURERS = [('SunLife', 25), ('Manulife', 22), ('BlueCross', 18), ('Canada Life', 15), ('Desjardins', 8),
+                (None, 12)]
+    MEDICAL_HISTORY = [('None', 45), ('No allergies', 20), ('Asthma', 8), ('Diabetes', 7), ('Hypertension', 8),
+                       ('Penicillin allergy', 5), ('Latex allergy', 2), ('Heart condition', 3), ('Pregnant', 2)]
+    SPECIALIZATIONS = [('General Dentistry', 50), ('Orthodontics', 12), ('Endodontics', 10),
+                       ('Pediatric Dentistry', 10), ('Periodontics', 8), ('Prosthodontics', 5), ('Oral Surgery', 5)]
+    CERTIFICATIONS = [('Certified Dental Assistant Level I', 55), ('Certified Dental Assistant Level II', 45)]
+    ROOM_TYPES = [('Consultation', 35), ('Cleaning', 30), ('Surgery', 15), ('X-Ray', 10), ('Orthodontics', 10)]
+    # (description, type, typical cost, chance of a prescription, weight)
+    TREATMENTS = [
+        ('Dental Checkup', 'Examination', 75.0, 0.0, 25), ('Teeth Cleaning', 'Hygiene', 150.0, 0.0, 25),
+        ('Fluoride Treatment', 'Hygiene', 60.0, 0.0, 8), ('X-Ray', 'Diagnostic', 90.0, 0.0, 10),
+        ('Filling', 'Restorative', 200.0, 0.05, 12), ('Crown', 'Restorative', 1200.0, 0.1, 4),
+        ('Root Canal', 'Surgery', 900.0, 0.7, 5), ('Tooth Extraction', 'Surgery', 300.0, 0.8, 5),
+        ('Braces Adjustment', 'Orthodontic', 250.0, 0.0, 4), ('Whitening', 'Cosmetic', 400.0, 0.0, 2)
+    ]
+    MEDICATIONS = [('Amoxicillin', '500mg', '7 days'), ('Ibuprofen', '400mg', '5 days'),
+                   ('Acetaminophen', '500mg', '3 days'), ('Hydrocodone', '5mg', '3 days'),
+                   ('Clindamycin', '300mg', '7 days'), ('Chlorhexidine Rinse', '15ml', '14 days')]
+    SUPPLIES = ['Dental Gloves', 'Surgical Masks', 'Anesthetic Cartridges', 'Dental Floss', 'Fluoride Gel',
+                'Composite Resin', 'Impression Material', 'Cotton Rolls', 'Suture Kit', 'Saliva Ejectors',
+                'Prophy Paste', 'Bite Blocks', 'X-Ray Film', 'Sterilization Pouches', 'Bonding Agent',
+                'Temporary Cement', 'Gauze Pads', 'Needles', 'Burs', 'Matrix Bands']
+    SUPPLIERS = ['MedSupply Inc', 'DentalPro', 'OralCare Co', 'SafetyFirst', 'Henry Schein', 'Patterson Dental']
+    SLOTS = [f"{hour:02d}:{minute:02d}:00" for hour in range(8, 18) for minute in (0, 15, 30, 45)]
+
+    def __init__(self, scale=1.0, seed=42, today=None, importer=None):
+        if scale <= 0:
+            raise ValueError("Scale must be a positive number")
+        self.scale = scale
+        self.seed = seed
+        self.today = today or self.TODAY
+        self.start_date = self.today - timedelta(days=self.HISTORY_DAYS)
+        self.end_date = self.today + timedelta(days=self.FUTURE_DAYS)
+        self.importer = importer or BulkImporter()
+        self.patients = max(1, round(self.PATIENTS * scale))
+        self.appointments = self.patients * self.APPOINTMENTS_PER_PATIENT
+        self.staff = max(5, self.patients // self.PATIENTS_PER_STAFF)
+        self.rooms = max(4, self.staff // self.STAFF_PER_ROOM)
+        self.counts = {}
+        self.seconds = {}
+        self.sql = {}
+        self.progress = None
+        self.started = None
+
+    @staticmethod
+    def weighted(choices):
+        # [(value..., weight)] -> (values, cumulative weights) for rng.choices
+        values = [item[:-1] if len(item) > 2 else item[0] for item in choices]
+        return values, list(itertools.accumulate(item[-1] for item in choices))
+
+    def generate(self, connection, progress=None, job=None):
+        # Fills an empty database. progress(table, rows_loaded, elapsed_seconds) is
+        # called after every chunk; returns [(table, source, rows, seconds)] like
+        # BulkImporter.import_files.
+        for table in TABLE_LOAD_ORDER:
+            if connection.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone():
+                raise ValueError(f"{table} already has rows; generate into an empty database")
+        
+        ReportMaterializer().drop(connection)
+        SearchEngine().drop(connection)
+        TableVersions().drop(connection)
+        for sql in INDEXES_SQL + [PATIENT_NAME_INDEX_SQL]:
+            connection.execute(f"DROP INDEX IF EXISTS {sql.split()[5]}")
+        connection.commit()
+        
+        rng = random.Random(self.seed)
+        self.counts = {}
+        self.seconds = {}
+        self.sql = {}
+        self.progress = progress
+        self.started = time.perf_counter()
+        connection.execute("BEGIN")
+        try:
+            staff = self.load_reference_data(connection, rng, job)
+            self.load_appointments(connection, rng, staff, job)
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            create_tables(connection)  # Rebuilds indexes, search tables and report snapshots
+        
+        connection.execute("PRAGMA analysis_limit=1000")
+        connection.execute("ANALYZE")
+        connection.commit()
+        return [(table, f"synthetic (scale {self.scale:g}, seed {self.seed}, today {self.today})",
+                 self.counts.get(table, 0), self.seconds.get(table, 0.0)) for table in TABLE_LOAD_ORDER]
+
+    def insert(self, connection, table, rows, job):
+        if job is not None and job.interrupted:
+            raise sqlite3.OperationalError("interrupted")
+        if not rows:
+            return
+        if table not in self.sql:
+            columns = [col[1] for col in connection.execute(f"PRAGMA table_info({table})")]
+            self.sql[table] = self.importer.insert_sql(table, columns)
+        started = time.perf_counter()
+        connection.executemany(self.sql[table], rows)
+        self.seconds[table] = self.seconds.get(table, 0.0) + time.perf_counter() - started
+        self.counts[table] = self.counts.get(table, 0) + len(rows)
+        if self.progress:
+            self.progress(table, self.counts[table], time.perf_counter() - self.started)
+
+    def insert_all(self, connection, table, rows_iter, job):
+        while True:
+            chunk = list(itertools.islice(rows_iter, self.importer.chunk_size))
+            if not chunk:
+                break
+            self.insert(connection, table, chunk, job)
+
+    def load_reference_data(self, connection, rng, job):
+        # Patients, rooms, staff with their roles and schedules, and inventory.
+        # Returns (dentist ids, assistant ids) for assigning appointments.
+        self.insert_all(connection, 'Patient', self.patient_rows(rng), job)
+        
+        room_types, room_weights = self.weighted(self.ROOM_TYPES)
+        rooms = [(100 + i, rng.choices(room_types, cum_weights=room_weights)[0], rng.randint(1, 3),
+                  'Y' if rng.random() < 0.92 else 'N') for i in range(self.rooms)]
+        self.insert(connection, 'Room', rooms, job)
+        
+        # Roles: 20% dentists, 35% assistants, 15% receptionists, the rest other staff
+        dentists = list(range(1, max(1, self.staff // 5) + 1))
+        assistants = list(range(dentists[-1] + 1, dentists[-1] + max(1, self.staff * 35 // 100) + 1))
+        receptionists = list(range(assistants[-1] + 1, assistants[-1] + max(1, self.staff * 15 // 100) + 1))
+        staff_rows = []
+        for staff_id in range(1, self.staff + 1):
+            first, last = rng.choice(self.FIRST_NAMES), rng.choice(self.LAST_NAMES)
+            if staff_id <= dentists[-1]:
+                name, salary = f"Dr. {first} {last}", rng.gauss(125000, 20000)
+            elif staff_id <= assistants[-1]:
+                name, salary = f"{first} {last}", rng.gauss(45000, 5000)
+            elif staff_id <= receptionists[-1]:
+                name, salary = f"{first} {last}", rng.gauss(38000, 4000)
+            else:
+                name, salary = f"{first} {last}", rng.gauss(60000, 10000)
+            staff_rows.append((staff_id, name, f"416-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+                               f"{first}.{last}.{staff_id}@dental.com".lower(), round(salary, 2)))
+        self.insert(connection, 'Staff', staff_rows, job)
+        
+        self.insert_all(connection, 'Staff_Schedule', self.schedule_rows(rng), job)
+        
+        specializations, specialization_weights = self.weighted(self.SPECIALIZATIONS)
+        self.insert(connection, 'Dentist', [
+            (staff_id, f"DEN-{rng.randint(1995, 2024)}-{staff_id:05d}",
+             rng.choices(specializations, cum_weights=specialization_weights)[0]) for staff_id in dentists], job)
+        certifications, certification_weights = self.weighted(self.CERTIFICATIONS)
+        self.insert(connection, 'Dental_Assistant', [
+            (staff_id, rng.choices(certifications, cum_weights=certification_weights)[0])
+            for staff_id in assistants], job)
+        self.insert(connection, 'Receptionist', [(staff_id,) for staff_id in receptionists], job)
+        
+        # A few items are always running low so the low-stock report has rows
+        self.insert(connection, 'Inventory', [
+            (item_id, f"{self.SUPPLIES[(item_id - 1) % len(self.SUPPLIES)]} #{(item_id - 1) // len(self.SUPPLIES) + 1}",
+             rng.randint(0, 60) if rng.random() < 0.1 else rng.randint(100, 5000), rng.choice(self.SUPPLIERS))
+            for item_id in range(1, self.INVENTORY_ITEMS + 1)], job)
+        return dentists, assistants
+
+    def schedule_rows(self, rng):
+        # One eight-hour shift per staff member per week, Monday to Saturday
+        schedule_id = 0
+        for staff_id in range(1, self.staff + 1):
+            for week in range((self.end_date - self.start_date).days // 7):
+                schedule_id += 1
+                day = self.start_date + timedelta(days=week * 7 + rng.randint(0, 5))
+                start = rng.choice((7, 8, 9))
+                yield schedule_id, staff_id, f"{day} {start:02d}:00:00", f"{day} {start + 8:02d}:00:00"
+
+    def patient_rows(self, rng):
+        cities, city_weights = self.weighted(self.CITIES)
+        genders, gender_weights = self.weighted(self.GENDERS)
+        insurers, insurer_weights = self.weighted(self.INSURERS)
+        histories, history_weights = self.weighted(self.MEDICAL_HISTORY)
+        letters = "ABCEGHJKLMNPRSTVWXYZ"
+        for patient_id in range(1, self.patients + 1):
+            first, last = rng.choice(self.FIRST_NAMES), rng.choice(self.LAST_NAMES)
+            city, province, postal, area = rng.choices(cities, cum_weights=city_weights)[0]
+            age = int(rng.triangular(1, 95, 40))
+            yield (patient_id, f"{first} {last}", f"{self.today.year - age}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                   f"{rng.randint(1, 9999)} {rng.choice(self.STREETS)}", city, province,
+                   f"{postal}{rng.randint(1, 9)}{rng.choice(letters)}{rng.randint(0, 9)}{rng.choice(letters)}{rng.randint(0, 9)}",
+                   rng.choices(genders, cum_weights=gender_weights)[0],
+                   f"{area}-{rng.randint(200, 999)}-{rng.randint(1000, 9999)}",
+                   f"{first}.{last}.{patient_id}@example.com".lower(),
+                   rng.choices(histories, cum_weights=history_weights)[0],
+                   rng.choices(insurers, cum_weights=insurer_weights)[0])
+
+    def load_appointments(self, connection, rng, staff, job):
+        # Appointments and everything hanging off them, a block at a time so
+        # memory stays flat at any scale. Past appointments are mostly
+        # completed and billed; future ones are scheduled.
+        dentists, assistants = staff
+        days = [str(self.start_date + timedelta(days=offset))
+                for offset in range((self.end_date - self.start_date).days + 1)
+                if (self.start_date + timedelta(days=offset)).weekday() != 6]  # Closed on Sundays
+        rooms = list(range(100, 100 + self.rooms))
+        treatments, treatment_weights = self.weighted(self.TREATMENTS)
+        items = range(1, self.INVENTORY_ITEMS + 1)
+        random_, choice, choices, randint = rng.random, rng.choice, rng.choices, rng.randint
+        patients, today = self.patients, str(self.today)
+        action_id = prescription_id = 0
+        
+        for first in range(1, self.appointments + 1, self.BLOCK_SIZE):
+            block = {table: [] for table in ('Appointment', 'Appointment_Staff', 'Dental_Action', 'Treatment',
+                                             'Prescription', 'DentalAction_Inventory', 'Bill')}
+            for appointment_id in range(first, min(first + self.BLOCK_SIZE, self.appointments + 1)):
+                day = choice(days)
+                if day < today:
+                    status = 'COMPLETED' if random_() < 0.85 else 'CANCELLED'
+                else:
+                    status = 'SCHEDULED' if random_() < 0.95 else 'CANCELLED'
+                # Skewed so some patients visit much more often than others
+                patient_id = int(patients * random_() ** 1.5) + 1
+                block['Appointment'].append((appointment_id, patient_id, choice(rooms), f"{day} {choice(self.SLOTS)}", status))
+                block['Appointment_Staff'].append((appointment_id, choice(dentists)))
+                if random_() < 0.7:
+                    block['Appointment_Staff'].append((appointment_id, choice(assistants)))
+                if status != 'COMPLETED':
+                    continue
+                
+                for _ in range(choice((1, 1, 1, 2, 2, 3))):
+                    action_id += 1
+                    description, kind, typical_cost, prescription_rate = choices(treatments, cum_weights=treatment_weights)[0]
+                    cost = round(typical_cost * rng.uniform(0.8, 1.3), 2)
+                    block['Dental_Action'].append((action_id, appointment_id, cost))
+                    block['Treatment'].append((action_id, action_id, description, kind))
+                    if random_() < prescription_rate:
+                        prescription_id += 1
+                        block['Prescription'].append((prescription_id, action_id) + choice(self.MEDICATIONS))
+                    for item_id in rng.sample(items, randint(1, 3)):
+                        block['DentalAction_Inventory'].append((action_id, item_id, randint(1, 5)))
+                    paid = random_()
+                    bill_status = 'PAID' if paid < 0.75 else 'UNPAID' if paid < 0.9 else 'PARTIALLY_PAID'
+                    block['Bill'].append((action_id, action_id, cost, bill_status, day))
+            
+            for table, rows in block.items():
+                self.insert(connection, table, rows, job)
+
+
+class SearchEngine:
+    # Full-text search over the free-text columns, backed by external-content
+    # FTS5 tables that triggers keep in sync with their base tables.
+    # Each entry: base table -> (fts table, key column, indexed columns)
+    FTS_TABLES = {
+        'Patient': ('patient_fts', 'patient_id',
+                    ['full_name', 'city', 'email', 'phone', 'medical_history', 'insurance']),
+        'Treatment': ('treatment_fts', 'treatment_id', ['description', 'type']),
+        'Prescription': ('prescription_fts', 'prescription_id', ['medication', 'dosage', 'duration'])
+    }
+    TOKEN = re.compile(r"\w+", re.UNICODE)
+
+    @staticmethod
+    def available(connection):
+        options = {row[0] for row in connection.execute("PRAGMA compile_options")}
+        return 'ENABLE_FTS5' in options
+
+    def create(self, connection):
+        # Creates missing FTS tables and triggers, filling new ones from the base table
+        if not self.available(connection):
+            return False
+        existing = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        for table, (fts, key, columns) in self.FTS_TABLES.items():
+            if table not in existing:
+                continue
+            col_list = ", ".join(columns)
+            new_values = ", ".join(f"new.{col}" for col in columns)
+            old_values = ", ".join(f"old.{col}" for col in columns)
+            
+            connection.execute(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                    {col_list}, content='{table}', content_rowid='{key}',
+                    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+                )
+            """)
+            connection.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+                    INSERT INTO {fts}(rowid, {col_list}) VALUES (new.{key}, {new_values});
+                END
+            """)
+            connection.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+                    INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.{key}, {old_values});
+                END
+            """)
+            connection.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table} BEGIN
+                    INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.{key}, {old_values});
+                    INSERT INTO {fts}(rowid, {col_list}) VALUES (new.{key}, {new_values});
+                END
+            """)
+            if fts not in existing:
+                connection.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+        return True
+
+    def drop(self, connection):
+        # The sync triggers live on the base tables, so they are dropped explicitly
+        for fts, _, _ in self.FTS_TABLES.values():
+            for suffix in ('ai', 'ad', 'au'):
+                connection.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+            connection.execute(f"DROP TABLE IF EXISTS {fts}")
+        connection.commit()
+
+    def rebuild(self, connection):
+        for fts, _, _ in self.FTS_TABLES.values():
+            connection.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+        connection.commit()
+
+    def build_match(self, term, prefix=True):
+        # User text -> FTS5 query: every word must match, optionally as a prefix.
+        # Words are quoted so punctuation and operators in the input are literal.
+        words = self.TOKEN.findall(term)
+        if not words:
+            raise ValueError("Search term has no searchable words")
+        suffix = "*" if prefix else ""
+        return " ".join(f'"{word}"{suffix}' for word in words)
+
+    def startswith_condition(self, table, column, term):
+        # Narrows a starts-with search on an indexed column to the rows whose
+        # first words match: the term as a phrase anchored with ^ whose last
+        # word is a prefix. Every value starting with the term is among them.
+        # Returns (condition, params), or None when the column isn't indexed or
+        # the term has no words.
+        if table not in self.FTS_TABLES:
+            return None
+        fts, key, columns = self.FTS_TABLES[table]
+        words = self.TOKEN.findall(term)
+        if column not in columns or not words:
+            return None
+        return (f"{key} IN (SELECT rowid FROM {fts} WHERE {fts} MATCH ?)",
+                [f'{column} : ^"{" ".join(words)}" *'])
+
+    def column_query(self, connection, table, column, term, startswith=False):
+        # Contains / Starts-with on one column -> (sql, params). Contains is a
+        # plain LIKE scan, since a match can start inside a word; starts-with
+        # runs LIKE only on the FTS candidates when the column is indexed.
+        if not startswith:
+            return f"SELECT * FROM {table} WHERE {column} LIKE ?", (f"%{term}%",)
+        pattern = f"{term}%"
+        candidates = self.startswith_condition(table, column, term)
+        if candidates is None or not connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (self.FTS_TABLES[table][0],)).fetchone():
+            return f"SELECT * FROM {table} WHERE {column} LIKE ?", (pattern,)
+        condition, params = candidates
+        return f"SELECT * FROM {table} WHERE {condition} AND {column} LIKE ?", tuple(params) + (pattern,)
+
+    def search(self, connection, table, term, prefix=True, limit=500):
+        # Ranked search across all indexed columns of one table -> (columns, rows)
+        fts, key, _ = self.FTS_TABLES[table]
+        cursor = connection.execute(f"""
+            SELECT t.* FROM {fts}
+            JOIN {table} t ON t.{key} = {fts}.rowid
+            WHERE {fts} MATCH ?
+            ORDER BY {fts}.rank
+            LIMIT ?
+        """, (self.build_match(term, prefix), limit))
+        return [desc[0] for desc in cursor.description], cursor.fetchall()
+
+    def search_everything(self, connection, term, prefix=True, limit=500):
+        # One ranked list of matches from every indexed table -> (columns, rows)
+        match = self.build_match(term, prefix)
+        existing = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        parts = []
+        params = []
+        for table, (fts, _, columns) in self.FTS_TABLES.items():
+            if fts not in existing:
+                continue
+            # Show the best matching column as a highlighted snippet
+            parts.append(f"""
+                SELECT '{table}' AS source, rowid AS id,
+                       snippet({fts}, -1, '[', ']', '…', 12) AS matched_text,
+                       ROUND(bm25({fts}), 3) AS score
+                FROM {fts} WHERE {fts} MATCH ?
+            """)
+            params.append(match)
+        if not parts:
+            return ['source', 'id', 'matched_text', 'score'], []
+        cursor = connection.execute(" UNION ALL ".join(parts) + " ORDER BY score LIMIT ?", params + [limit])
+        return [desc[0] for desc in cursor.description], cursor.fetchall()
+
+
+class ReportMaterializer:
+    # Keeps the heaviest canned reports as summary tables (mv_<report>).
+    # Triggers on the base tables record which groups of a report a change
+    # touches in mv_change_log; refresh() recomputes only those groups in one
+    # set-based statement (or rebuilds when most groups changed), so opening
+    # a report reads a small table instead of re-running the join.
+    # Each entry: report key -> (group column, select with a {where} slot,
+    #   indexed group expression in the select, served columns, order by,
+    #   {base table: select of the affected group keys from {row}})
+    REBUILD_FRACTION = 0.1  # pending groups / summary rows above which refresh() rebuilds
+    REPORTS = {
+        'patient_billing_summary': ('full_name', """
+            SELECT p.full_name AS full_name,
+                   COUNT(b.bill_id) AS num_bills,
+                   SUM(b.total_amount) AS total_billed,
+                   ROUND(AVG(b.total_amount),2) AS avg_bill
+            FROM Bill b
+            JOIN Dental_Action da ON b.dental_action_id = da.dental_action_id
+            JOIN Appointment a ON da.appointment_id = a.appointment_id
+            JOIN Patient p ON a.patient_id = p.patient_id
+            {where}
+            GROUP BY p.full_name
+            HAVING SUM(b.total_amount) > 0
+        """, "p.full_name", "full_name, num_bills, total_billed, avg_bill", "total_billed DESC", {
+            'Bill': """SELECT p.full_name FROM Dental_Action da
+                       JOIN Appointment a ON da.appointment_id = a.appointment_id
+                       JOIN Patient p ON a.patient_id = p.patient_id
+                       WHERE da.dental_action_id = {row}.dental_action_id""",
+            'Dental_Action': """SELECT p.full_name FROM Appointment a
+                                JOIN Patient p ON a.patient_id = p.patient_id
+                                WHERE a.appointment_id = {row}.appointment_id""",
+            'Appointment': "SELECT full_name FROM Patient WHERE patient_id = {row}.patient_id",
+            'Patient': "SELECT {row}.full_name"
+        }),
+        'inventory_usage_report': ('item_id', """
+            SELECT i.item_id AS item_id, i.item_name AS item_name, i.quantity AS current_stock,
+                   COALESCE(SUM(dai.quantity_used), 0) AS total_used,
+                   COUNT(DISTINCT dai.dental_action_id) AS times_used
+            FROM Inventory i
+            LEFT JOIN DentalAction_Inventory dai ON i.item_id = dai.item_id
+            {where}
+            GROUP BY i.item_id, i.item_name, i.quantity
+        """, "i.item_id", "item_name, current_stock, total_used, times_used", "total_used DESC", {
+            'Inventory': "SELECT {row}.item_id",
+            'DentalAction_Inventory': "SELECT {row}.item_id"
+        }),
+        'appointments_with_staff': ('appointment_id', """
+            SELECT a.appointment_id AS appointment_id, p.full_name AS patient,
+                   a.appointment_datetime AS appointment_datetime, a.status AS status,
+                   GROUP_CONCAT(s.name, ', ') AS staff_assigned
+            FROM Appointment a
+            JOIN Patient p ON a.patient_id = p.patient_id
+            LEFT JOIN Appointment_Staff ast ON a.appointment_id = ast.appointment_id
+            LEFT JOIN Staff s ON ast.staff_id = s.staff_id
+            {where}
+            GROUP BY a.appointment_id, p.full_name, a.appointment_datetime, a.status
+        """, "a.appointment_id", "appointment_id, patient, appointment_datetime, status, staff_assigned",
+           "appointment_datetime DESC", {
+            'Appointment': "SELECT {row}.appointment_id",
+            'Appointment_Staff': "SELECT {row}.appointment_id",
+            'Patient': "SELECT appointment_id FROM Appointment WHERE patient_id = {row}.patient_id",
+            'Staff': "SELECT appointment_id FROM Appointment_Staff WHERE staff_id = {row}.staff_id"
+        }),
+        'inventory_used_by_dentists': ('dentist_id', """
+            SELECT DISTINCT d.staff_id AS dentist_id, i.item_name AS item_name,
+                   i.supplier AS supplier, s.name AS dentist_name
+            FROM Inventory i
+            JOIN DentalAction_Inventory dai ON i.item_id = dai.item_id
+            JOIN Dental_Action da ON dai.dental_action_id = da.dental_action_id
+            JOIN Appointment a ON da.appointment_id = a.appointment_id
+            JOIN Appointment_Staff ast ON a.appointment_id = ast.appointment_id
+            JOIN Dentist d ON ast.staff_id = d.staff_id
+            JOIN Staff s ON d.staff_id = s.staff_id
+            {where}
+        """, "d.staff_id", "DISTINCT item_name, supplier, dentist_name", "dentist_name, item_name", {
+            'Staff': "SELECT {row}.staff_id",
+            'Dentist': "SELECT {row}.staff_id",
+            'Appointment_Staff': "SELECT {row}.staff_id",
+            'Appointment': "SELECT staff_id FROM Appointment_Staff WHERE appointment_id = {row}.appointment_id",
+            'Dental_Action': "SELECT staff_id FROM Appointment_Staff WHERE appointment_id = {row}.appointment_id",
+            'DentalAction_Inventory': """SELECT ast.staff_id FROM Dental_Action da
+                                         JOIN Appointment_Staff ast ON ast.appointment_id = da.appointment_id
+                                         WHERE da.dental_action_id = {row}.dental_action_id""",
+            'Inventory': """SELECT ast.staff_id FROM DentalAction_Inventory dai
+                            JOIN Dental_Action da ON dai.dental_action_id = da.dental_action_id
+                            JOIN Appointment_Staff ast ON ast.appointment_id = da.appointment_id
+                            WHERE dai.item_id = {row}.item_id"""
+        })
+    }
+    TRIGGER_EVENTS = [('ai', 'INSERT', ['new']), ('ad', 'DELETE', ['old']), ('au', 'UPDATE', ['old', 'new'])]
+
+    @staticmethod
+    def summary_table(key):
+        return f"mv_{key}"
+
+    def dependencies(self, key):
+        return set(self.REPORTS[key][5])
+
+    def create(self, connection):
+        # Creates the change log, then any missing summary table (built in
+        # full) and its triggers, for reports whose base tables all exist
+        existing = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS mv_change_log (
+                report TEXT NOT NULL,
+                group_key,
+                UNIQUE (report, group_key)
+            )
+        """)
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS mv_report_state (
+                report TEXT PRIMARY KEY,
+                refreshed_at TEXT,
+                row_count INTEGER
+            )
+        """)
+        for key, (group, select, _, _, _, changes) in self.REPORTS.items():
+            if not self.dependencies(key) <= existing:
+                continue
+            table = self.summary_table(key)
+            for base, sql in changes.items():
+                for suffix, event, rows in self.TRIGGER_EVENTS:
+                    body = "\n".join(
+                        f"INSERT OR IGNORE INTO mv_change_log (report, group_key) "
+                        f"SELECT '{key}', * FROM ({sql.format(row=row)});" for row in rows)
+                    connection.execute(f"""
+                        CREATE TRIGGER IF NOT EXISTS {table}_{base}_{suffix} AFTER {event} ON {base} BEGIN
+                            {body}
+                        END
+                    """)
+            if table not in existing:
+                connection.execute(f"CREATE TABLE {table} AS {select.format(where='')}")
+                connection.execute(f"CREATE INDEX {table}_group ON {table}({group})")
+                connection.execute("DELETE FROM mv_change_log WHERE report = ?", (key,))
+                self._record_refresh(connection, key)
+
+    def is_installed(self, connection):
+        return connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='mv_change_log'").fetchone() is not None
+
+    def drop_triggers(self, connection):
+        # Triggers live on the base tables, so they are dropped explicitly;
+        # create() puts them back
+        for (name,) in connection.execute(
+                r"SELECT name FROM sqlite_master WHERE type='trigger' AND name LIKE 'mv\_%' ESCAPE '\'").fetchall():
+            connection.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+    def drop(self, connection):
+        self.drop_triggers(connection)
+        for key in self.REPORTS:
+            connection.execute(f"DROP TABLE IF EXISTS {self.summary_table(key)}")
+        connection.execute("DROP TABLE IF EXISTS mv_change_log")
+        connection.execute("DROP TABLE IF EXISTS mv_report_state")
+        connection.commit()
+
+    def is_materialized(self, connection, key):
+        if key not in self.REPORTS:
+            return False
+        return connection.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?",
+                                  (self.summary_table(key),)).fetchone() is not None
+
+    def refresh(self, connection, key):
+        # Recomputes the groups touched since the last refresh. Returns the number of groups.
+        group, select, group_expression, _, _, _ = self.REPORTS[key]
+        table = self.summary_table(key)
+        connection.execute("BEGIN IMMEDIATE")  # Keep writers out between reading and clearing the log
+        try:
+            pending = connection.execute("SELECT COUNT(*) FROM mv_change_log WHERE report = ?", (key,)).fetchone()[0]
+            summary_rows = connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            if pending > summary_rows * self.REBUILD_FRACTION:
+                # Recomputing most groups one by one costs more than the whole join
+                self._rebuild(connection, key)
+            elif pending:
+                changed = "(SELECT group_key FROM mv_change_log WHERE report = ?)"
+                connection.execute(f"DELETE FROM {table} WHERE {group} IN {changed}", (key,))
+                connection.execute(f"INSERT INTO {table} {select.format(where=f'WHERE {group_expression} IN {changed}')}",
+                                   (key,))
+                connection.execute("DELETE FROM mv_change_log WHERE report = ?", (key,))
+                self._record_refresh(connection, key)
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        return pending
+
+    def rebuild(self, connection, key):
+        self._rebuild(connection, key)
+        connection.commit()
+
+    def rebuild_all(self, connection):
+        # Like create() this leaves committing to the caller
+        for key in self.REPORTS:
+            if self.is_materialized(connection, key):
+                self._rebuild(connection, key)
+
+    def _rebuild(self, connection, key):
+        _, select, _, _, _, _ = self.REPORTS[key]
+        table = self.summary_table(key)
+        connection.execute(f"DELETE FROM {table}")
+        connection.execute(f"INSERT INTO {table} {select.format(where='')}")
+        connection.execute("DELETE FROM mv_change_log WHERE report = ?", (key,))
+        self._record_refresh(connection, key)
+
+    def _record_refresh(self, connection, key):
+        connection.execute(f"""
+            INSERT OR REPLACE INTO mv_report_state (report, refreshed_at, row_count)
+            SELECT ?, datetime('now', 'localtime'), COUNT(*) FROM {self.summary_table(key)}
+        """, (key,))
+
+    def serve_sql(self, key):
+        _, _, _, columns, order, _ = self.REPORTS[key]
+        return f"SELECT {columns} FROM {self.summary_table(key)} ORDER BY {order}"
+
+    def freshness(self, connection, key):
+        # (refreshed_at, groups waiting for a refresh)
+        row = connection.execute("SELECT refreshed_at FROM mv_report_state WHERE report = ?", (key,)).fetchone()
+        pending = connection.execute("SELECT COUNT(*) FROM mv_change_log WHERE report = ?", (key,)).fetchone()[0]
+        return (row[0] if row else None), pending
+
+
+class TableVersions:
+    # Per-table change counters bumped by triggers on every insert, update
+    # and delete, whichever connection or workstation made the change. Used
+    # to tell whether a cached result is still valid for the tables it read.
+    def create(self, connection):
+        existing = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS table_versions (
+                table_name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0
+            ) WITHOUT ROWID
+        """)
+        for table in TABLE_LOAD_ORDER:
+            if table not in existing:
+                continue
+            connection.execute("INSERT OR IGNORE INTO table_versions (table_name) VALUES (?)", (table,))
+            for suffix, event in (('ai', 'INSERT'), ('ad', 'DELETE'), ('au', 'UPDATE')):
+                connection.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS tv_{table}_{suffix} AFTER {event} ON {table} BEGIN
+                        UPDATE table_versions SET version = version + 1 WHERE table_name = '{table}';
+                    END
+                """)
+
+    def drop(self, connection):
+        for table in TABLE_LOAD_ORDER:
+            for suffix in ('ai', 'ad', 'au'):
+                connection.execute(f"DROP TRIGGER IF EXISTS tv_{table}_{suffix}")
+        connection.execute("DROP TABLE IF EXISTS table_versions")
+        connection.commit()
+
+    def current(self, connection, tables):
+        # Versions of the given tables plus the schema version, or None if a
+        # table isn't tracked (its results can't be cached)
+        tables = sorted(set(tables))
+        if not tables:
+            return None
+        try:
+            rows = connection.execute(
+                f"SELECT table_name, version FROM table_versions "
+                f"WHERE table_name IN ({', '.join('?' for _ in tables)})", tables).fetchall()
+        except sqlite3.OperationalError:
+            return None
+        if len(rows) != len(tables):
+            return None
+        schema_version = connection.execute("PRAGMA schema_version").fetchone()[0]
+        return schema_version, tuple(sorted(rows))
+
+
+class ResultCache:
+    # LRU cache of finished query results, bounded by entry count and by an
+    # estimate of their size in memory. An entry is only returned while the
+    # table versions it was stored with are still current. Queries that read
+    # the clock or random() can change without any write, so they are never cached.
+    MAX_ENTRIES = 32
+    MAX_BYTES = 64 * 1024 * 1024
+    VOLATILE = re.compile(r"\bCURRENT_(?:TIMESTAMP|DATE|TIME)\b|'now'|\brandom\s*\(", re.IGNORECASE)
+
+    def __init__(self, max_entries=None, max_bytes=None):
+        self.max_entries = max_entries or self.MAX_ENTRIES
+        self.max_bytes = max_bytes or self.MAX_BYTES
+        self.entries = OrderedDict()  # key -> (versions, columns, rows, size)
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(query_key, params):
+        if isinstance(params, dict):
+            params = tuple(sorted(params.items()))
+        return query_key, tuple(params)
+
+    @classmethod
+    def is_cacheable(cls, sql):
+        return not cls.VOLATILE.search(sql)
+
+    @staticmethod
+    def dependencies(sql, tables):
+        return [table for table in tables if re.search(rf"\b{re.escape(table)}\b", sql, re.IGNORECASE)]
+
+    @staticmethod
+    def estimate_size(columns, rows):
+        # Rough: tuple overhead plus the size of the first row's values for every row
+        if not rows:
+            return sys.getsizeof(columns)
+        row_size = sys.getsizeof(rows[0]) + sum(sys.getsizeof(value) for value in rows[0])
+        return sys.getsizeof(rows) + row_size * len(rows)
+
+    def get(self, key, versions):
+        entry = self.entries.get(key)
+        if entry is None or versions is None or entry[0] != versions:
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1], entry[2]
+
+    def put(self, key, versions, columns, rows):
+        if versions is None:
+            return
+        size = self.estimate_size(columns, rows)
+        if size > self.max_bytes // 4:
+            return  # One huge result shouldn't flush everything else
+        if key in self.entries:
+            self._remove(key)
+        self.entries[key] = (versions, columns, rows, size)
+        self.size += size
+        while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+            self._remove(next(iter(self.entries)))
+
+    def _remove(self, key):
+        self.size -= self.entries.pop(key)[3]
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+
+
+class IndexAdvisor:
+    # Reads EXPLAIN QUERY PLAN output to find full table scans and suggests
+    # indexes for the columns a statement filters or joins on. It also counts
+    # the columns the table browser sorts and filters on, and suggests an
+    # index once a column without one has been used BROWSE_THRESHOLD times.
+    BROWSE_THRESHOLD = 3
+    TABLE_REF = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(?!ON\b|WHERE\b|JOIN\b|LEFT\b|INNER\b|CROSS\b|GROUP\b|ORDER\b|LIMIT\b|HAVING\b|UNION\b|INTERSECT\b|EXCEPT\b)(\w+))?",
+                           re.IGNORECASE)
+    PREDICATE = r"\b{0}\s*(=|==|<>|!=|<=|>=|<|>|\bLIKE\b|\bIN\b|\bBETWEEN\b|\bIS\b)"
+
+    def __init__(self):
+        self.column_use = {}  # (table, column) -> times sorted or filtered
+
+    def note_column_use(self, catalog, table, column):
+        # Returns a CREATE INDEX statement once the column is used often enough
+        key = (table, column)
+        self.column_use[key] = self.column_use.get(key, 0) + 1
+        if self.column_use[key] < self.BROWSE_THRESHOLD:
+            return None
+        for col in catalog.table_columns(table):
+            if col[1] == column and col[5] and col[2].upper() == 'INTEGER':
+                return None  # rowid alias
+        if any(index_columns[:1] == [column] for _, index_columns, _ in catalog.indexes.get(table, [])):
+            return None
+        return f"CREATE INDEX IF NOT EXISTS idx_{table.lower()}_{column} ON {table}({column})"
+
+    def explain(self, connection, sql, params=()):
+        # Returns [(id, parent, detail)]
+        return [(row[0], row[1], row[3]) for row in
+                connection.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()]
+
+    @staticmethod
+    def scan_steps(plan):
+        # Plain "SCAN <table>" steps read every row; index scans are left alone
+        return [detail for _, _, detail in plan
+                if detail.startswith("SCAN ") and " USING " not in detail
+                and not detail.startswith("SCAN CONSTANT ROW")]
+
+    def audit(self, connection, queries):
+        # queries: [(key, sql, params)] -> [(key, plan, scans, error)]
+        report = []
+        for key, sql, params in queries:
+            try:
+                plan = self.explain(connection, sql, params)
+                report.append((key, plan, self.scan_steps(plan), None))
+            except sqlite3.Error as e:
+                report.append((key, [], [], str(e)))
+        return report
+
+    def suggest_indexes(self, connection, sql, params=()):
+        # Returns CREATE INDEX statements for tables the plan scans in full
+        tables = {row[0].lower(): row[0] for row in
+                  connection.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        aliases = {}
+        for table, alias in self.TABLE_REF.findall(sql):
+            if table.lower() in tables:
+                aliases[(alias or table).lower()] = tables[table.lower()]
+                aliases.setdefault(table.lower(), tables[table.lower()])
+        
+        suggestions = []
+        for detail in self.scan_steps(self.explain(connection, sql, params)):
+            name = detail.split()[1].lower()
+            table = aliases.get(name)
+            if not table:
+                continue
+            columns = self._predicate_columns(connection, sql, table, name, len(set(aliases.values())) == 1)
+            if not columns:
+                continue
+            statement = (f"CREATE INDEX IF NOT EXISTS idx_{table.lower()}_{'_'.join(columns)} "
+                         f"ON {table}({', '.join(columns)})")
+            if statement not in suggestions:
+                suggestions.append(statement)
+        return suggestions
+
+    def _predicate_columns(self, connection, sql, table, alias, single_table):
+        table_info = connection.execute(f"PRAGMA table_info({table})").fetchall()
+        indexed = {row[2] for index in connection.execute(f"PRAGMA index_list({table})").fetchall()
+                   for row in connection.execute(f"PRAGMA index_info({index[1]})").fetchall()[:1]}
+        
+        equality, ranges = [], []
+        for col in table_info:
+            col_name = col[1]
+            if col[5] and col[2].upper() == 'INTEGER' or col_name in indexed:
+                continue  # rowid alias or already the leading column of an index
+            qualified = rf"{re.escape(alias)}\.{re.escape(col_name)}"
+            pattern = qualified if not single_table else rf"(?:{qualified}|{re.escape(col_name)})"
+            for match in re.finditer(self.PREDICATE.format(pattern), sql, re.IGNORECASE):
+                operator = match.group(1).strip().upper()
+                target = equality if operator in ('=', '==', 'IN', 'IS') else ranges
+                if col_name not in equality and col_name not in ranges:
+                    target.append(col_name)
+        # Equality columns first so a range column can still use the index
+        return equality + ranges[:1]
+
+
+class Benchmark:
+    # Headless timings of the app's data paths (canned reports, searches, the
+    # table browser, dashboard counts, CRUD and schema loading) against a
+    # generated database per scale factor. Generated databases are kept in
+    # data_dir and each run works on a fresh copy, so writes from one run
+    # (FTS segments, change logs) can't slow down the next. A case regresses
+    # when its best time is more than `tolerance` slower than the baseline
+    # and the slowdown exceeds MIN_DELTA_MS; the best of several runs is far
+    # less noisy than the median on a busy machine.
+    SCALES = [0.1, 1.0]
+    REPEAT = 5
+    TOLERANCE = 0.25
+    MIN_DELTA_MS = 2.0
+    BULK_ROWS = 1000
+    BROWSE_TABLES = ['Patient', 'Appointment']
+    SEARCH_TERM = 'toron'
+    FIRST_TEST_ID = 10 ** 9  # Patient ids used by the CRUD cases, far above generated ones
+    DATA_DIR = os.path.join(tempfile.gettempdir(), "dental_clinic_benchmark")  # outside the working tree
+
+    def __init__(self, scales=None, repeat=None, seed=42, data_dir=DATA_DIR, profile=None, progress=None):
+        self.scales = scales or self.SCALES
+        self.repeat = repeat or self.REPEAT
+        self.seed = seed
+        self.data_dir = data_dir
+        self.profile = profile or ConnectionProfile()
+        self.progress = progress or (lambda message: None)
+
+    def database(self, scale):
+        # Generated into a temporary file first, so an interrupted run is never reused
+        path = os.path.join(self.data_dir, f"benchmark_scale{scale:g}_seed{self.seed}.db")
+        if os.path.exists(path):
+            return path
+        os.makedirs(self.data_dir, exist_ok=True)
+        partial = path + ".partial"
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(partial + suffix):
+                os.remove(partial + suffix)
+        self.progress(f"Generating scale {scale:g} database...")
+        connection = self.profile.connect(partial)
+        try:
+            create_tables(connection)
+            SyntheticDataGenerator(scale=scale, seed=self.seed).generate(connection)
+            connection.execute("PRAGMA journal_mode=DELETE")  # Fold the WAL back in before renaming
+        finally:
+            connection.close()
+        os.replace(partial, path)
+        return path
+
+    def run(self):
+        results = {
+            'created_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'sqlite_version': sqlite3.sqlite_version,
+            'python_version': sys.version.split()[0],
+            'seed': self.seed,
+            'repeat': self.repeat,
+            'scales': {}
+        }
+        for scale in self.scales:
+            source = self.database(scale)
+            work_dir = tempfile.mkdtemp(prefix="dental_benchmark_")
+            path = os.path.join(work_dir, os.path.basename(source))
+            shutil.copyfile(source, path)
+            connection = self.profile.connect(path)
+            try:
+                cases = {}
+                for name, fn in self.cases(connection):
+                    self.progress(f"scale {scale:g}: {name}")
+                    cases[name] = self.time_case(fn)
+                results['scales'][f"{scale:g}"] = cases
+            finally:
+                connection.close()
+                shutil.rmtree(work_dir, ignore_errors=True)
+        return results
+
+    def time_case(self, fn):
+        fn()  # Warm-up: statement cache and page cache
+        samples = []
+        rows = 0
+        for _ in range(self.repeat):
+            started = time.perf_counter()
+            rows = fn()
+            samples.append((time.perf_counter() - started) * 1000)
+        return {
+            'median_ms': round(QueryProfiler.percentile(samples, 50), 3),
+            'p95_ms': round(QueryProfiler.percentile(samples, 95), 3),
+            'min_ms': round(min(samples), 3),
+            'rows': rows
+        }
+
+    def cases(self, connection):
+        # [(name, fn)]; each fn runs one data path the way the app does and returns a row count
+        def fetch(sql, params=()):
+            return lambda: len(connection.execute(sql, params).fetchall())
+        
+        cases = []
+        registry = QueryRegistry()
+        materializer = ReportMaterializer()
+        for key in registry.keys:
+            sql, params = registry.sql(key), registry.bind(key)
+            if materializer.is_materialized(connection, key):
+                def served(key=key):
+                    materializer.refresh(connection, key)
+                    return len(connection.execute(materializer.serve_sql(key)).fetchall())
+                cases.append((f"report {key}", served))
+                cases.append((f"report {key} (live)", fetch(sql, params)))
+            else:
+                cases.append((f"report {key}", fetch(sql, params)))
+        
+        # The search tab's modes, on the patients table
+        term = self.SEARCH_TERM
+        engine = SearchEngine()
+        cases.append(("search contains", fetch(*engine.column_query(connection, 'Patient', 'full_name', term))))
+        cases.append(("search startswith", fetch(*engine.column_query(connection, 'Patient', 'city', term,
+                                                                      startswith=True))))
+        cases.append(("search exact", fetch("SELECT * FROM Patient WHERE city = ?", ("Toronto",))))
+        if SearchEngine.available(connection):
+            cases.append(("search fulltext", lambda: len(engine.search(connection, 'Patient', term)[1])))
+            cases.append(("search everything", lambda: len(engine.search_everything(connection, term)[1])))
+        
+        # Table browser: row count, first page, a page in the middle, the next page
+        for table in self.BROWSE_TABLES:
+            total = connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            middle_key = connection.execute(
+                f"SELECT rowid FROM {table} ORDER BY rowid LIMIT 1 OFFSET ?", (total // 2,)).fetchone()
+            page = PagedTableView.PAGE_SIZE + 1
+            cases.append((f"browse {table} count", fetch(f"SELECT COUNT(*) FROM {table}")))
+            cases.append((f"browse {table} first page", fetch(PagedTableView.seek_sql(table), (0, page))))
+            cases.append((f"browse {table} middle page", fetch(PagedTableView.seek_sql(table), (total // 2, page))))
+            cases.append((f"browse {table} next page", fetch(PagedTableView.adjacent_sql(table, 'after'),
+                                                             (middle_key[0] if middle_key else 0, page))))
+        
+        # Browser sorted and filtered in SQLite: latest unpaid bills, then the next keyset page
+        page = PagedTableView.PAGE_SIZE + 1
+        latest = "SELECT rowid, * FROM Bill WHERE status = ? ORDER BY issue_date DESC, rowid DESC LIMIT ?"
+        cases.append(("browse Bill unpaid latest", fetch(latest, ('UNPAID', page))))
+        last = connection.execute("SELECT issue_date, rowid FROM Bill WHERE status = ? "
+                                  "ORDER BY issue_date DESC, rowid DESC LIMIT 1 OFFSET ?",
+                                  ('UNPAID', page - 2)).fetchone()
+        if last:
+            condition, key_params = PagedTableView.keyset_condition('issue_date', last[0], last[1], greater=False)
+            cases.append(("browse Bill unpaid next page",
+                          fetch(f"SELECT rowid, * FROM Bill WHERE status = ? AND {condition} "
+                                f"ORDER BY issue_date DESC, rowid DESC LIMIT ?", ['UNPAID'] + key_params + [page])))
+        
+        stats = DashboardStats()
+        cases.append(("dashboard counts", lambda: len(stats.count_all(connection))))
+        
+        def load_schema():
+            catalog = SchemaCatalog(connection)
+            catalog.load()
+            catalog.approximate_row_counts()
+            return len(catalog.tables)
+        
+        cases.append(("schema catalog", load_schema))
+        return cases + self.crud_cases(connection)
+
+    def crud_cases(self, connection):
+        # Every insert is undone by a later delete, so the dataset is unchanged afterwards
+        def write(sql, params):
+            # The app's single-statement write, run in place rather than on a writer thread
+            return ConnectionManager.retry(ConnectionManager.apply_write, connection, None, sql, params,
+                                           connection=connection)[0]
+        
+        importer = BulkImporter()
+        columns = [col[1] for col in connection.execute("PRAGMA table_info(Patient)")]
+        insert_sql = importer.insert_sql('Patient', columns)
+        single_ids, bulk_ranges = deque(), deque()
+        next_id = [self.FIRST_TEST_ID]
+        
+        def patient(patient_id):
+            values = {'patient_id': patient_id, 'full_name': f"Benchmark Patient {patient_id}",
+                      'city': 'Toronto', 'email': f"benchmark.{patient_id}@example.com"}
+            return tuple(values.get(column) for column in columns)
+        
+        def insert_one():
+            patient_id = next_id[0]
+            next_id[0] += 1
+            write(insert_sql, patient(patient_id))
+            single_ids.append(patient_id)
+            return 1
+        
+        def update_one():
+            return write("UPDATE Patient SET phone = ? WHERE patient_id = ?", ('416-555-0000', single_ids[-1]))
+        
+        def delete_one():
+            return write("DELETE FROM Patient WHERE patient_id = ?", (single_ids.popleft(),))
+        
+        def insert_bulk():
+            first = next_id[0]
+            next_id[0] += self.BULK_ROWS
+            with connection:
+                connection.executemany(insert_sql, (patient(i) for i in range(first, first + self.BULK_ROWS)))
+            bulk_ranges.append((first, first + self.BULK_ROWS - 1))
+            return self.BULK_ROWS
+        
+        def update_bulk():
+            with connection:
+                return connection.execute("UPDATE Patient SET phone = ? WHERE patient_id BETWEEN ? AND ?",
+                                          ('416-555-0000',) + bulk_ranges[-1]).rowcount
+        
+        def delete_bulk():
+            with connection:
+                return connection.execute("DELETE FROM Patient WHERE patient_id BETWEEN ? AND ?",
+                                          bulk_ranges.popleft()).rowcount
+        
+        return [("insert one patient", insert_one), ("update one patient", update_one),
+                ("delete one patient", delete_one), (f"bulk insert {self.BULK_ROWS} patients", insert_bulk),
+                (f"bulk update {self.BULK_ROWS} patients", update_bulk),
+                (f"bulk delete {self.BULK_ROWS} patients", delete_bulk)]
+
+    @classmethod
+    def compare(cls, results, baseline, tolerance=None):
+        # [(scale, case, baseline_ms, current_ms)] for every regressed case
+        tolerance = cls.TOLERANCE if tolerance is None else tolerance
+        regressions = []
+        for scale, cases in results['scales'].items():
+            for name, current in cases.items():
+                previous = baseline.get('scales', {}).get(scale, {}).get(name)
+                if previous is None:
+                    continue
+                before, after = previous['min_ms'], current['min_ms']
+                if after > before * (1 + tolerance) and after - before > cls.MIN_DELTA_MS:
+                    regressions.append((scale, name, before, after))
+        return regressions
+
+    @staticmethod
+    def format_results(results):
+        lines = []
+        for scale, cases in results['scales'].items():
+            lines.append(f"Scale {scale}")
+            for name, stats in cases.items():
+                lines.append(f"  {name:<50} best {stats['min_ms']:>9.2f} ms  median {stats['median_ms']:>9.2f} ms"
+                             f"  p95 {stats['p95_ms']:>9.2f} ms  {stats['rows']:>10,} rows")
+        return "\n".join(lines)
+
+
+class ResultExporter:
+    # Streams a query result to disk with fetchmany batches, so exports use
+    # bounded memory however large the result is. Formats: CSV, JSONL and a
+    # compact columnar file (see write_columnar / read_columnar).
+    BATCH_SIZE = 5000
+    FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.dcol': 'columnar'}
+    COLUMNAR_MAGIC = b"DCOL1\n"
+
+    def __init__(self, batch_size=BATCH_SIZE):
+        self.batch_size = batch_size
+
+    def format_for_path(self, path, fmt=None):
+        if fmt:
+            return fmt
+        ext = os.path.splitext(path)[1].lower()
+        if ext not in self.FORMATS:
+            raise ValueError(f"Unknown export format for {path}; use .csv, .jsonl or .dcol")
+        return self.FORMATS[ext]
+
+    def export(self, connection, sql, path, params=(), fmt=None, progress=None, job=None):
+        # progress(rows_written) is called after every batch. Returns the row count;
+        # a partially written file is removed if the export fails or is cancelled.
+        fmt = self.format_for_path(path, fmt)
+        cursor = connection.execute(sql, params)
+        if not cursor.description:
+            raise ValueError("Statement does not return rows")
+        columns = [desc[0] for desc in cursor.description]
+        writer = getattr(self, f"write_{fmt}")
+        
+        if fmt == 'columnar':
+            f = open(path, 'wb')
+        else:
+            f = open(path, 'w', newline='', encoding='utf-8')
+        
+        try:
+            with f:
+                return writer(f, columns, self._batches(cursor, job), progress)
+        except BaseException:
+            if os.path.exists(path):
+                os.remove(path)
+            raise
+
+    def _batches(self, cursor, job):
+        while True:
+            if job is not None and job.interrupted:
+                raise sqlite3.OperationalError("interrupted")
+            rows = cursor.fetchmany(self.batch_size)
+            if not rows:
+                return
+            yield rows
+
+    @staticmethod
+    def _json_value(value):
+        if isinstance(value, bytes):
+            return value.hex()
+        return value
+
+    def write_csv(self, f, columns, batches, progress):
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        count = 0
+        for rows in batches:
+            writer.writerows(rows)
+            count += len(rows)
+            if progress:
+                progress(count)
+        return count
+
+    def write_jsonl(self, f, columns, batches, progress):
+        count = 0
+        for rows in batches:
+            f.write("".join(json.dumps(dict(zip(columns, [self._json_value(v) for v in row]))) + "\n"
+                            for row in rows))
+            count += len(rows)
+            if progress:
+                progress(count)
+        return count
+
+    def write_columnar(self, f, columns, batches, progress):
+        # Layout: magic, length-prefixed JSON header, then one row group per batch:
+        # row count followed by each column as a length-prefixed zlib'd JSON array.
+        # A row group with a count of zero ends the file.
+        header = json.dumps({'columns': columns}).encode('utf-8')
+        f.write(self.COLUMNAR_MAGIC)
+        f.write(struct.pack('<I', len(header)))
+        f.write(header)
+        count = 0
+        for rows in batches:
+            f.write(struct.pack('<I', len(rows)))
+            for values in zip(*rows):
+                block = zlib.compress(json.dumps([self._json_value(v) for v in values]).encode('utf-8'))
+                f.write(struct.pack('<I', len(block)))
+                f.write(block)
+            count += len(rows)
+            if progress:
+                progress(count)
+        f.write(struct.pack('<I', 0))
+        return count
+
+    @classmethod
+    def read_columnar(cls, path):
+        # Yields (columns, column_arrays) for each row group in a .dcol file
+        with open(path, 'rb') as f:
+            if f.read(len(cls.COLUMNAR_MAGIC)) != cls.COLUMNAR_MAGIC:
+                raise ValueError(f"{path} is not a columnar export")
+            (length,) = struct.unpack('<I', f.read(4))
+            columns = json.loads(f.read(length))['columns']
+            while True:
+                (row_count,) = struct.unpack('<I', f.read(4))
+                if row_count == 0:
+                    return
+                arrays = []
+                for _ in columns:
+                    (length,) = struct.unpack('<I', f.read(4))
+                    arrays.append(json.loads(zlib.decompress(f.read(length))))
+                yield columns, arrays
+
+
+class ProgressDialog:
+    # Small window showing the progress of a background job, with a Cancel button
+    def __init__(self, root, title, on_cancel=None):
+        self.window = tk.Toplevel(root)
+        self.window.title(title)
+        self.window.geometry("420x150")
+        self.window.configure(bg='#f5f5f5')
+        self.window.transient(root)
+        self.window.protocol("WM_DELETE_WINDOW", lambda: None)
+        
+        frame = ttk.Frame(self.window, padding=20)
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        self.label = ttk.Label(frame, text="Starting...", font=('Arial', 10), wraplength=380)
+        self.label.pack(anchor='w', pady=(0, 10))
+        
+        self.progress = ttk.Progressbar(frame, mode='indeterminate')
+        self.progress.pack(fill=tk.X)
+        self.progress.start(15)
+        
+        if on_cancel:
+            ttk.Button(frame, text="Cancel", command=on_cancel).pack(pady=(10, 0))
+
+    def update(self, text):
+        self.label.config(text=text)
+
+    def close(self):
+        self.progress.stop()
+        self.window.destroy()
+
+
+class DentalClinicApp:
+    SCHEMA_RENDER_BATCH = 3
+    SQL_ROW_LIMIT = 1000
+    
+    def __init__(self, root, connection, cursor, profile=None, timeline=None):
+        self.timeline = timeline or StartupTimeline()
+        self.timeline.mark("Main window created")
+        self.root = root
+        self.root.title("Dental Clinic Management System")
+        self.root.geometry("1200x800")
+        self.root.configure(bg='#f5f5f5')
+        
+        # Use passed connection and cursor
+        self.connection = connection
+        self.cursor = cursor
+        self.db_file = "dental_clinic.db"
+        
+        # Track current table and selected row
+        self.current_table = None
+        self.selected_row = None
+        
+        # Background query execution keeps the Tk main loop responsive
+        self.profile = profile or ConnectionProfile.load()
+        self.profiler = QueryProfiler()
+        self.connections = ConnectionManager(self.db_file, self.profile, self.root, profiler=self.profiler)
+        self.executor = QueryExecutor(self.db_file, self.root, profile=self.profile, read_only=True,
+                                      profiler=self.profiler)
+        # Every write (forms, deletes, DDL, SQL console, bulk import, ANALYZE)
+        # runs on the single writer worker. The console keeps cursors open
+        # between fetches, and they must stay on the thread that owns the
+        # connection. The Tk thread's connection only reads from here on.
+        self.write_executor = self.connections.writer
+        self.connection.execute("PRAGMA query_only = ON")
+        self.dashboard_stats = DashboardStats()
+        self.index_advisor = IndexAdvisor()
+        self.search_engine = SearchEngine()
+        self.report_materializer = ReportMaterializer()
+        self.table_versions = TableVersions()
+        self.result_cache = ResultCache()
+        self.catalog = SchemaCatalog(self.connection)
+        self.query_registry = QueryRegistry()
+        self.query_job = None
+        self.query_generation = 0
+        self.sql_job = None
+        self.sql_pager = None
+        self.sql_generation = 0
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        # Setup UI
+        self.setup_ui()
+        
+        # Update dashboard stats once the window is on screen; other tabs load their data when first opened
+        self.root.after_idle(self.update_dashboard_stats)
+    
+    def setup_ui(self):
+        self.setup_styles()
+        
+        # Create notebook for tabbed interface
+        self.notebook = ttk.Notebook(self.root)
+        self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # Create frames for each tab
+        self.dashboard_frame = ttk.Frame(self.notebook)
+        self.query_frame = ttk.Frame(self.notebook)
+        self.tables_frame = ttk.Frame(self.notebook)
+        self.schema_frame = ttk.Frame(self.notebook)
+        self.sql_frame = ttk.Frame(self.notebook)
+        self.search_frame = ttk.Frame(self.notebook)
+        self.performance_frame = ttk.Frame(self.notebook)
+        
+        # Add tabs to notebook. Only the dashboard is built now; the other tabs
+        # are built, and load their data, the first time they are selected.
+        self.tabs = [
+            (self.dashboard_frame, "🏠 Dashboard", self.setup_dashboard),
+            (self.query_frame, "🔍 Query Builder", self.setup_query_frame),
+            (self.tables_frame, "📊 Browse Tables", self.setup_tables_frame),
+            (self.schema_frame, "📋 Schema", self.setup_schema_frame),
+            (self.sql_frame, "⚡ SQL Console", self.setup_sql_frame),
+            (self.search_frame, "🔎 Search Records", self.setup_search_frame),
+            (self.performance_frame, "⏱ Performance", self.setup_performance_frame)
+        ]
+        self.tab_builders = {}
+        for frame, text, builder in self.tabs:
+            self.notebook.add(frame, text=text)
+            self.tab_builders[str(frame)] = (text, builder)
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+        
+        self.ensure_tab(self.dashboard_frame)
+    
+    def ensure_tab(self, frame):
+        # Builds a tab on first use; frame may also be the widget path from notebook.select()
+        entry = self.tab_builders.pop(str(frame), None)
+        if entry is None:
+            return
+        text, builder = entry
+        started = time.perf_counter()
+        builder()
+        self.timeline.mark(f"{text} tab built", time.perf_counter() - started)
+    
+    def is_built(self, frame):
+        return str(frame) not in self.tab_builders
+    
+    def on_tab_changed(self, event=None):
+        selected = self.notebook.select()
+        self.ensure_tab(selected)
+        if selected == str(self.performance_frame):
+            self.refresh_performance()
+    
+    def setup_styles(self):
+        style = ttk.Style()
+        style.theme_use('clam')
+        
+        # Configure styles
+        style.configure('Title.TLabel', font=('Arial', 16, 'bold'), foreground='#2c3e50')
+        style.configure('Subtitle.TLabel', font=('Arial', 12), foreground='#7f8c8d')
+        style.configure('Card.TFrame', background='white', relief='raised', borderwidth=1)
+        style.configure('Card.TLabel', background='white', font=('Arial', 10))
+        style.configure('Success.TLabel', foreground='#27ae60', font=('Arial', 9))
+        style.configure('Warning.TLabel', foreground='#e67e22', font=('Arial', 9))
+        style.configure('Custom.TButton', font=('Arial', 10), padding=(10, 5))
+        style.configure('Danger.TButton', font=('Arial', 10), padding=(10, 5), background='#e74c3c')
+    
+    def setup_dashboard(self):
+        # Header
+        header_frame = ttk.Frame(self.dashboard_frame)
+        header_frame.pack(fill=tk.X, pady=20)
+        
+        title_label = ttk.Label(header_frame, text="Dental Clinic Management System", style='Title.TLabel')
+        title_label.pack()
+        
+        subtitle = ttk.Label(header_frame, text="Professional Database Management Interface", style='Subtitle.TLabel')
+        subtitle.pack(pady=5)
+        
+        # Connection status
+        self.connection_status = ttk.Label(header_frame, text="✅ Connected to database", style='Success.TLabel')
+        self.connection_status.pack()
+        
+        # Effective connection settings
+        self.profile_info = ttk.Label(header_frame, text="", font=('Arial', 9), foreground='#666')
+        self.profile_info.pack(pady=(5, 0))
+        self.show_connection_profile()
+        
+        # Time from process start until the counts below are shown
+        self.startup_info = ttk.Label(header_frame, text="", font=('Arial', 9), foreground='#666')
+        self.startup_info.pack()
+        
+        # Stats cards
+        stats_frame = ttk.Frame(self.dashboard_frame)
+        stats_frame.pack(fill=tk.X, pady=20)
+        
+        stats_data = [
+            ("Patients", "👥"),
+            ("Staff", "👨‍⚕️"),
+            ("Appointments", "📅"),
+            ("Treatments", "🦷"),
+            ("Prescriptions", "💊"),
+            ("Inventory Items", "📦"),
+            ("Bills", "💰"),
+            ("Dentists", "🩺")
+        ]
+        
+        for i, (title, icon) in enumerate(stats_data):
+            card = ttk.Frame(stats_frame, style='Card.TFrame')
+            card.grid(row=i//4, column=i%4, padx=10, pady=10, sticky='nsew')
+            stats_frame.columnconfigure(i%4, weight=1)
+            
+            # Card content
+            ttk.Label(card, text=icon, style='Card.TLabel', font=('Arial', 20)).pack(pady=5)
+            ttk.Label(card, text=title, style='Card.TLabel', font=('Arial', 11, 'bold')).pack()
+            count_label = ttk.Label(card, text="Loading...", style='Card.TLabel', font=('Arial', 14, 'bold'))
+            count_label.pack(pady=5)
+            
+            # Store reference to update later
+            setattr(self, f"{title.lower().replace(' ', '_')}_count", count_label)
+        
+        # Quick actions
+        actions_frame = ttk.LabelFrame(self.dashboard_frame, text="Quick Actions", padding=15)
+        actions_frame.pack(fill=tk.BOTH, expand=True, pady=10)
+        
+        actions = [
+            ("🗑️ Drop Tables", "Remove all tables from the database", self.drop_tables_only),
+            ("➕ Create Tables", "Create database tables", self.create_tables_only),
+            ("📥 Populate Tables", "Insert sample data into tables", self.insert_sample_data_only),
+            ("🔄 Test Connection", "Verify database connectivity", self.test_connection),
+            ("📊 View All Tables", "Browse all database tables", lambda: self.notebook.select(2)),
+            ("🔍 Run Queries", "Execute analytical queries", lambda: self.notebook.select(1)),
+            ("📋 View Schema", "Database structure overview", lambda: self.notebook.select(3)),
+            ("⚡ SQL Console", "Execute custom SQL commands", lambda: self.notebook.select(4)),
+            ("🔎 Search Records", "Search for specific records", lambda: self.notebook.select(5)),
+            ("📤 Bulk Import", "Load CSV/JSONL files into the tables", self.bulk_import),
+            ("⚙️ Connection Profile", "Tune journal mode, cache and timeouts", self.edit_connection_profile)
+        ]
+        
+        for i, (text, description, command) in enumerate(actions):
+            btn_frame = ttk.Frame(actions_frame)
+            btn_frame.grid(row=i//3, column=i%3, padx=10, pady=10, sticky='nsew')
+            actions_frame.columnconfigure(i%3, weight=1)
+            actions_frame.rowconfigure(i//3, weight=1)
+            
+            btn = ttk.Button(btn_frame, text=text, command=command, style='Custom.TButton')
             btn.pack(fill=tk.X)
             
             desc_label = ttk.Label(btn_frame, text=description, font=('Arial', 8), foreground='#666', 
@@ -563,33 +3745,7 @@ class DentalClinicApp:
         
         # Query dropdown with descriptions
         self.query_var = tk.StringVar()
-        self.queries = [
-            ("Find patients from Toronto", "patients_from_toronto"),
-            ("Find all available surgery rooms", "available_surgery_rooms"),
-            ("Get upcoming appointments for scheduled patients", "upcoming_scheduled_appointments"),
-            ("Find distinct staff emails", "distinct_staff_emails"),
-            ("Find staff schedules longer than 8 hours", "long_staff_schedules"),
-            ("Get all dentists with specialization in Orthodontics", "orthodontic_dentists"),
-            ("List dental assistants with a specific certification", "certified_dental_assistants"),
-            ("Show receptionist staff details", "receptionist_details"),
-            ("Find staff assigned to a specific appointment with ID 1002", "staff_for_appointment_1002"),
-            ("Show dental actions costing more than $200", "expensive_dental_actions"),
-            ("Count treatments by type", "treatment_count_by_type"),
-            ("Get prescriptions for a specific medication 'Amoxicillin'", "prescriptions_amoxicillin"),
-            ("Show items low in stock (less than 40 units)", "low_stock_items"),
-            ("Find total items used per dental action", "total_items_used_per_action"),
-            ("List unpaid bills issued between 2025-09-01 and 2025-09-30", "unpaid_bills_september_2025"),
-            ("Find least popular treatment types (occur less than 3 times)", "least_popular_treatments"),
-            ("Find patients who had both treatments and prescriptions", "patients_both_treatment_prescription"),
-            ("Find patients with appointments but no bills generated", "patients_no_bills"),
-            ("Find the most expensive dental actions per patient", "most_expensive_actions"),
-            ("Find patients who had appointments but no treatments", "patients_no_treatments"),
-            ("Show inventory items used in treatments involving dentists", "inventory_used_by_dentists"),
-            ("Patient billing summary (total billed, average bill amount)", "patient_billing_summary"),
-            ("List all staff members and their roles", "staff_with_roles"),
-            ("Show appointments with assigned staff", "appointments_with_staff"),
-            ("Inventory usage report", "inventory_usage_report")
-        ]
+        self.queries = self.query_registry.descriptions()
         
         ttk.Label(query_selection_frame, text="Choose a query:", font=('Arial', 11, 'bold')).pack(anchor='w', pady=5)
         
@@ -598,6 +3754,12 @@ class DentalClinicApp:
                                   width=80, font=('Arial', 10))
         query_combo.pack(fill=tk.X, pady=5)
         query_combo.set("Select a query from the dropdown...")
+        query_combo.bind('<<ComboboxSelected>>', lambda e: self.show_query_parameters())
+        
+        # Parameter fields for the selected query
+        self.query_params_frame = ttk.Frame(query_selection_frame)
+        self.query_params_frame.pack(fill=tk.X)
+        self.query_param_vars = {}
         
         # Execute button
         execute_frame = ttk.Frame(query_selection_frame)
@@ -605,6 +3767,12 @@ class DentalClinicApp:
         
         ttk.Button(execute_frame, text="Execute Query", command=self.execute_selected_query, 
                   style='Custom.TButton').pack(side=tk.LEFT)
+        ttk.Button(execute_frame, text="Cancel", 
+                  command=lambda: self.cancel_job(self.query_job)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(execute_frame, text="💾 Export...", 
+                  command=self.export_selected_query).pack(side=tk.LEFT, padx=5)
+        ttk.Button(execute_frame, text="🔬 Index Advisor", 
+                  command=self.show_index_advisor).pack(side=tk.LEFT, padx=5)
         
         self.query_status = ttk.Label(execute_frame, text="", style='Success.TLabel')
         self.query_status.pack(side=tk.LEFT, padx=10)
@@ -618,12 +3786,17 @@ class DentalClinicApp:
                                      font=('Arial', 9), foreground='#666')
         self.results_info.pack(anchor='w', pady=5)
         
+        # Query plan warnings (full table scans)
+        self.plan_info = ttk.Label(results_frame, text="", style='Warning.TLabel')
+        self.plan_info.pack(anchor='w')
+        
         # Create a frame to hold treeview and scrollbars
         tree_frame = ttk.Frame(results_frame)
         tree_frame.pack(fill=tk.BOTH, expand=True)
         
         # Treeview for table display
         self.results_tree = ttk.Treeview(tree_frame, show='headings')
+        self.results_grid = ResultGrid(self.results_tree)
         
         # Scrollbars for treeview
         v_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.results_tree.yview)
@@ -658,6 +3831,8 @@ class DentalClinicApp:
                   style='Custom.TButton').pack(side=tk.LEFT, padx=5)
         ttk.Button(table_selection_frame, text="Refresh", command=self.populate_table_list, 
                   style='Custom.TButton').pack(side=tk.LEFT, padx=5)
+        ttk.Button(table_selection_frame, text="💾 Export Table...", command=self.export_table, 
+                  style='Custom.TButton').pack(side=tk.LEFT, padx=5)
         
         # Table actions frame
         actions_frame = ttk.Frame(selection_frame)
@@ -667,12 +3842,41 @@ class DentalClinicApp:
                   style='Custom.TButton').pack(side=tk.LEFT, padx=5)
         ttk.Button(actions_frame, text="✏️ Edit Selected", command=self.edit_record, 
                   style='Custom.TButton').pack(side=tk.LEFT, padx=5)
+        ttk.Button(actions_frame, text="🧮 Set Column...", command=self.bulk_update_records, 
+                  style='Custom.TButton').pack(side=tk.LEFT, padx=5)
         ttk.Button(actions_frame, text="🗑️ Delete Selected", command=self.delete_record, 
                   style='Danger.TButton').pack(side=tk.LEFT, padx=5)
         
         self.table_action_status = ttk.Label(actions_frame, text="", style='Success.TLabel')
         self.table_action_status.pack(side=tk.LEFT, padx=10)
         
+        # Column filters, applied in SQLite; click a heading to sort
+        filter_frame = ttk.Frame(selection_frame)
+        filter_frame.pack(fill=tk.X, pady=5)
+        
+        ttk.Label(filter_frame, text="Filter:", font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+        self.filter_column_var = tk.StringVar()
+        self.filter_column_combo = ttk.Combobox(filter_frame, textvariable=self.filter_column_var, 
+                                                state="readonly", width=20)
+        self.filter_column_combo.pack(side=tk.LEFT, padx=5)
+        self.filter_text_var = tk.StringVar()
+        filter_entry = ttk.Entry(filter_frame, textvariable=self.filter_text_var, width=25)
+        filter_entry.pack(side=tk.LEFT, padx=5)
+        filter_entry.bind('<Return>', lambda e: self.apply_table_filter())
+        ttk.Button(filter_frame, text="Apply Filter", command=self.apply_table_filter).pack(side=tk.LEFT, padx=5)
+        ttk.Button(filter_frame, text="Clear Filters", command=self.clear_table_filters).pack(side=tk.LEFT, padx=5)
+        ttk.Label(filter_frame, text="=, !=, <, <=, >, >=, ^ (starts with), null, not null; otherwise contains", 
+                 font=('Arial', 9), foreground='#666').pack(side=tk.LEFT, padx=5)
+        
+        # Index suggestion for columns the browser sorts or filters on often
+        index_frame = ttk.Frame(selection_frame)
+        index_frame.pack(fill=tk.X)
+        
+        self.index_suggestion = None
+        self.index_hint = ttk.Label(index_frame, text="", font=('Arial', 9), foreground='#666')
+        self.index_hint.pack(side=tk.LEFT, padx=5)
+        self.index_button = ttk.Button(index_frame, text="⚡ Create Index", command=self.create_suggested_index)
+        
         # Table display
         table_display_frame = ttk.LabelFrame(self.tables_frame, text="Table Data", padding=10)
         table_display_frame.pack(fill=tk.BOTH, expand=True, pady=10, padx=10)
@@ -686,14 +3890,14 @@ class DentalClinicApp:
         tree_frame = ttk.Frame(table_display_frame)
         tree_frame.pack(fill=tk.BOTH, expand=True)
         
-        # Treeview for table data
-        self.table_tree = ttk.Treeview(tree_frame, show='headings')
+        # Treeview for table data; ctrl/shift-click selects several rows for bulk actions
+        self.table_tree = ttk.Treeview(tree_frame, show='headings', selectmode='extended')
         
         # Scrollbars
         v_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.table_tree.yview)
         h_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL, command=self.table_tree.xview)
         
-        self.table_tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+        self.table_tree.configure(xscrollcommand=h_scrollbar.set)
         
         # Grid layout for proper scrollbar positioning
         self.table_tree.grid(row=0, column=0, sticky='nsew')
@@ -703,11 +3907,30 @@ class DentalClinicApp:
         tree_frame.grid_rowconfigure(0, weight=1)
         tree_frame.grid_columnconfigure(0, weight=1)
         
+        # Position slider to jump anywhere in the table
+        position_frame = ttk.Frame(table_display_frame)
+        position_frame.pack(fill=tk.X, pady=(5, 0))
+        
+        ttk.Label(position_frame, text="Position:", font=('Arial', 9)).pack(side=tk.LEFT)
+        self.table_position = ttk.Scale(position_frame, from_=0, to=1, orient=tk.HORIZONTAL)
+        self.table_position.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.table_position.bind('<ButtonRelease-1>', 
+                                 lambda e: self.table_view.seek_fraction(self.table_position.get()))
+        
+        # Paged view keeps only a window of rows in the tree and pages in the background
+        self.table_view = PagedTableView(self.table_tree, v_scrollbar, self.executor,
+                                         on_status=lambda text: self.table_info.config(text=text),
+                                         on_error=lambda e: messagebox.showerror(
+                                             "Error", f"Failed to load table data: {str(e)}"),
+                                         on_column_use=self.note_column_use, search_engine=self.search_engine)
+        
         # Bind double-click to edit
         self.table_tree.bind('<Double-1>', lambda e: self.edit_record())
         
         # Bind selection
         self.table_tree.bind('<<TreeviewSelect>>', self.on_table_select)
+        
+        self.populate_table_list()
     
     def on_table_select(self, event):
         selection = self.table_tree.selection()
@@ -716,6 +3939,53 @@ class DentalClinicApp:
         else:
             self.selected_row = None
     
+    def apply_table_filter(self):
+        column = self.filter_column_var.get()
+        if not self.table_view.table_name or not column:
+            messagebox.showwarning("Warning", "Please load a table and choose a column to filter.")
+            return
+        self.table_position.set(0)
+        self.table_view.set_filter(column, self.filter_text_var.get())
+    
+    def clear_table_filters(self):
+        if not self.table_view.table_name:
+            return
+        self.filter_text_var.set("")
+        self.table_position.set(0)
+        self.table_view.clear_filters()
+    
+    def note_column_use(self, table_name, column):
+        statement = self.index_advisor.note_column_use(self.catalog, table_name, column)
+        if statement is None or statement == self.index_suggestion:
+            return
+        self.index_suggestion = statement
+        self.index_hint.config(text=f"💡 {table_name}.{column} is sorted or filtered often but has no index")
+        self.index_button.pack(side=tk.LEFT, padx=5)
+    
+    def create_suggested_index(self):
+        statement = self.index_suggestion
+        if not statement:
+            return
+        
+        def show_done(result):
+            self.catalog.invalidate()
+            self.index_hint.config(text=f"✅ {statement}")
+        
+        def show_error(e):
+            self.index_suggestion = statement
+            self.index_button.pack(side=tk.LEFT, padx=5)
+            messagebox.showerror("Error", f"Failed to create index:\n{str(e)}")
+        
+        # The button is hidden while the index is built so it can't be queued twice
+        self.index_suggestion = None
+        self.index_button.pack_forget()
+        self.index_hint.config(text=f"⏳ {statement}")
+        self.connections.write(statement, label="create index", on_done=show_done, on_error=show_error)
+    
+    def selected_rowids(self):
+        # Browser rows are keyed on rowid, so the selection maps straight to keys
+        return [int(iid) for iid in self.table_tree.selection()]
+    
     def setup_schema_frame(self):
         # Header with refresh button
         header_frame = ttk.Frame(self.schema_frame)
@@ -724,28 +3994,266 @@ class DentalClinicApp:
         ttk.Label(header_frame, text="Database Schema", font=('Arial', 14, 'bold')).pack(side=tk.LEFT)
         ttk.Button(header_frame, text="Refresh Schema", command=self.refresh_schema, 
                   style='Custom.TButton').pack(side=tk.RIGHT)
+        ttk.Button(header_frame, text="Update Statistics", command=self.analyze_database, 
+                  style='Custom.TButton').pack(side=tk.RIGHT, padx=5)
+        ttk.Button(header_frame, text="Exact Count", command=self.count_selected_schema_table, 
+                  style='Custom.TButton').pack(side=tk.RIGHT, padx=5)
+        
+        self.schema_info = ttk.Label(self.schema_frame, text="", font=('Arial', 9), foreground='#666')
+        self.schema_info.pack(anchor='w', padx=10)
+        
+        # Schema tree: one expandable node per table with its columns, keys and indexes
+        tree_frame = ttk.Frame(self.schema_frame)
+        tree_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        self.schema_tree = ttk.Treeview(tree_frame, columns=('type', 'constraints', 'rows'), show='tree headings')
+        self.schema_tree.heading('#0', text='Name')
+        self.schema_tree.heading('type', text='Type')
+        self.schema_tree.heading('constraints', text='Constraints')
+        self.schema_tree.heading('rows', text='Rows')
+        self.schema_tree.column('#0', width=250, minwidth=100)
+        self.schema_tree.column('type', width=120, minwidth=50)
+        self.schema_tree.column('constraints', width=300, minwidth=100)
+        self.schema_tree.column('rows', width=120, minwidth=50, anchor='e')
+        
+        v_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.schema_tree.yview)
+        self.schema_tree.configure(yscrollcommand=v_scrollbar.set)
+        self.schema_tree.grid(row=0, column=0, sticky='nsew')
+        v_scrollbar.grid(row=0, column=1, sticky='ns')
+        tree_frame.grid_rowconfigure(0, weight=1)
+        tree_frame.grid_columnconfigure(0, weight=1)
         
-        # Schema text widget
-        self.schema_text = scrolledtext.ScrolledText(self.schema_frame, wrap=tk.WORD, 
-                                                     font=('Consolas', 10), width=100, height=30)
-        self.schema_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.schema_tree.bind('<Double-1>', lambda e: self.count_selected_schema_table())
         
         # Load schema information
+        self.schema_render_generation = 0
         self.refresh_schema()
     
     def refresh_schema(self):
-        self.schema_text.config(state=tk.NORMAL)
-        self.schema_text.delete(1.0, tk.END)
-        schema_info = self.get_schema_info()
-        self.schema_text.insert(tk.END, schema_info)
-        self.schema_text.config(state=tk.DISABLED)
+        # Metadata comes from the catalog and row counts are estimates, so this
+        # never scans a table; exact counts are fetched per table on request
+        if not self.is_built(self.schema_frame):
+            return
+        try:
+            self.catalog.ensure_current()
+            approximate = self.catalog.approximate_row_counts()
+        except Exception as e:
+            self.schema_info.config(text=f"Error retrieving schema: {str(e)}")
+            return
+        if self.dashboard_stats.counts:
+            for stat, table in DashboardStats.STATS:
+                approximate[table] = self.dashboard_stats.counts[stat]
+        
+        self.schema_tree.delete(*self.schema_tree.get_children())
+        tables = list(self.catalog.tables)
+        self.schema_info.config(text=f"Total Tables: {len(tables)}   "
+                                     f"(~ = estimated rows; double-click a table for an exact count)")
+        
+        # Insert a few tables per idle callback so the tab appears immediately
+        self.schema_render_generation += 1
+        generation = self.schema_render_generation
+        
+        def render(start):
+            if generation != self.schema_render_generation:
+                return
+            for table_name in tables[start:start + self.SCHEMA_RENDER_BATCH]:
+                self.insert_schema_table(table_name, approximate.get(table_name))
+            if start + self.SCHEMA_RENDER_BATCH < len(tables):
+                self.root.after_idle(render, start + self.SCHEMA_RENDER_BATCH)
+        
+        render(0)
+    
+    def insert_schema_table(self, table_name, approximate_rows):
+        rows_text = "?" if approximate_rows is None else f"~{approximate_rows:,}"
+        node = self.schema_tree.insert("", tk.END, iid=f"table:{table_name}", text=f"TABLE {table_name}",
+                                       values=("", "", rows_text))
+        
+        for col in self.catalog.columns.get(table_name, []):
+            col_name, col_type, not_null, default_val, pk = col[1], col[2], col[3], col[4], col[5]
+            constraints = []
+            if pk:
+                constraints.append("PRIMARY KEY")
+            if not_null:
+                constraints.append("NOT NULL")
+            if default_val is not None:
+                constraints.append(f"DEFAULT {default_val}")
+            self.schema_tree.insert(node, tk.END, text=col_name, values=(col_type, ", ".join(constraints), ""))
+        
+        for col_name, ref_table, ref_col in self.catalog.foreign_keys.get(table_name, []):
+            self.schema_tree.insert(node, tk.END, text=f"FK {col_name}", 
+                                    values=("", f"REFERENCES {ref_table}({ref_col})", ""))
+        
+        for index_name, index_columns, unique in self.catalog.indexes.get(table_name, []):
+            kind = "UNIQUE INDEX" if unique else "INDEX"
+            self.schema_tree.insert(node, tk.END, text=index_name, values=(kind, ", ".join(index_columns), ""))
+    
+    def count_selected_schema_table(self):
+        selection = self.schema_tree.selection()
+        if not selection:
+            messagebox.showwarning("Warning", "Please select a table in the schema.")
+            return
+        
+        node = selection[0]
+        while self.schema_tree.parent(node):
+            node = self.schema_tree.parent(node)
+        table_name = node.split(":", 1)[1]
+        
+        def show_count(result):
+            if self.schema_tree.exists(node):
+                self.schema_tree.set(node, 'rows', f"{result[1][0][0]:,}")
+        
+        self.schema_tree.set(node, 'rows', "counting...")
+        self.executor.run_query(f"SELECT COUNT(*) FROM {table_name}", label=f"count {table_name}", on_done=show_count,
+                                on_error=lambda e: messagebox.showerror("Error", f"Failed to count rows:\n{str(e)}"))
+    
+    def analyze_database(self):
+        # analysis_limit keeps ANALYZE quick on big tables; estimates are good enough here
+        def analyze(connection, job):
+            connection.execute("PRAGMA analysis_limit=1000")
+            connection.execute("ANALYZE")
+            connection.commit()
+        
+        self.schema_info.config(text="⏳ Updating statistics...")
+        self.write_executor.submit(analyze, on_done=lambda result: self.refresh_schema(),
+                                   on_error=lambda e: messagebox.showerror("Error", f"Failed to analyze:\n{str(e)}"))
+    
+    def setup_performance_frame(self):
+        # Header with controls
+        header_frame = ttk.Frame(self.performance_frame)
+        header_frame.pack(fill=tk.X, padx=10, pady=10)
+        
+        ttk.Label(header_frame, text="Query Performance", font=('Arial', 14, 'bold')).pack(side=tk.LEFT)
+        ttk.Button(header_frame, text="Export...", command=self.export_performance, 
+                  style='Custom.TButton').pack(side=tk.RIGHT)
+        ttk.Button(header_frame, text="Clear", command=self.clear_performance, 
+                  style='Custom.TButton').pack(side=tk.RIGHT, padx=5)
+        ttk.Button(header_frame, text="Refresh", command=self.refresh_performance, 
+                  style='Custom.TButton').pack(side=tk.RIGHT, padx=5)
+        
+        options_frame = ttk.Frame(self.performance_frame)
+        options_frame.pack(fill=tk.X, padx=10)
+        ttk.Label(options_frame, text="Slow query threshold (ms):").pack(side=tk.LEFT)
+        self.slow_ms_var = tk.StringVar(value=str(self.profiler.slow_ms))
+        slow_spinbox = ttk.Spinbox(options_frame, from_=1, to=60000, increment=50, width=8,
+                                   textvariable=self.slow_ms_var, command=self.set_slow_threshold)
+        slow_spinbox.pack(side=tk.LEFT, padx=5)
+        slow_spinbox.bind('<Return>', lambda e: self.set_slow_threshold())
+        self.trace_var = tk.BooleanVar(value=self.profiler.tracing)
+        ttk.Checkbutton(options_frame, text="Trace statements and VM steps", variable=self.trace_var,
+                        command=self.toggle_tracing).pack(side=tk.LEFT, padx=20)
+        
+        # Latency percentiles per labelled query
+        stats_frame = ttk.LabelFrame(self.performance_frame, text="Latency by Query", padding=5)
+        stats_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        columns = ('calls', 'errors', 'rows', 'p50', 'p95', 'p99', 'max')
+        self.perf_tree = ttk.Treeview(stats_frame, columns=columns, show='tree headings', height=10)
+        self.perf_tree.heading('#0', text='Query')
+        self.perf_tree.column('#0', width=300, minwidth=100)
+        for column, heading in zip(columns, ('Calls', 'Errors', 'Rows', 'p50 (ms)', 'p95 (ms)', 'p99 (ms)', 'Max (ms)')):
+            self.perf_tree.heading(column, text=heading)
+            self.perf_tree.column(column, width=90, minwidth=50, anchor='e')
+        perf_scrollbar = ttk.Scrollbar(stats_frame, orient=tk.VERTICAL, command=self.perf_tree.yview)
+        self.perf_tree.configure(yscrollcommand=perf_scrollbar.set)
+        self.perf_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        perf_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        # Where startup time went, up to the dashboard showing its counts
+        timeline_frame = ttk.LabelFrame(self.performance_frame, text="Startup Timeline", padding=5)
+        timeline_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+        self.timeline_tree = ttk.Treeview(timeline_frame, columns=('at', 'delta', 'took'), show='tree headings',
+                                          height=6)
+        self.timeline_tree.heading('#0', text='Milestone')
+        self.timeline_tree.column('#0', width=300, minwidth=100)
+        for column, heading in (('at', 'Since start (ms)'), ('delta', 'Since previous (ms)'), ('took', 'Took (ms)')):
+            self.timeline_tree.heading(column, text=heading)
+            self.timeline_tree.column(column, width=130, minwidth=50, anchor='e')
+        self.timeline_tree.pack(fill=tk.X)
+        
+        # Rolling slow-query log with plans
+        slow_frame = ttk.LabelFrame(self.performance_frame, text="Slow Query Log", padding=5)
+        slow_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        self.slow_log_text = scrolledtext.ScrolledText(slow_frame, height=10, font=('Consolas', 9), wrap=tk.WORD)
+        self.slow_log_text.pack(fill=tk.BOTH, expand=True)
+        
+        self.perf_info = ttk.Label(self.performance_frame, text="", font=('Arial', 9), foreground='#666')
+        self.perf_info.pack(anchor='w', padx=10, pady=(0, 5))
+
+    
+    def refresh_performance(self):
+        if not self.is_built(self.performance_frame):
+            return
+        self.perf_tree.delete(*self.perf_tree.get_children())
+        for label, calls, errors, rows, p50, p95, p99, slowest in self.profiler.summary():
+            self.perf_tree.insert('', tk.END, text=label, values=(
+                f"{calls:,}", f"{errors:,}", f"{rows:,}", f"{p50:.1f}", f"{p95:.1f}", f"{p99:.1f}", f"{slowest:.1f}"))
+        
+        self.timeline_tree.delete(*self.timeline_tree.get_children())
+        for label, at, delta, took in self.timeline.rows():
+            self.timeline_tree.insert('', tk.END, text=label, values=(
+                f"{at * 1000:,.0f}", f"{delta * 1000:,.0f}", "" if took is None else f"{took * 1000:,.1f}"))
+        
+        self.slow_log_text.delete(1.0, tk.END)
+        slow_log = list(self.profiler.slow_log)
+        if not slow_log:
+            self.slow_log_text.insert(tk.END, f"No queries slower than {self.profiler.slow_ms} ms yet.\n")
+        for entry in reversed(slow_log):
+            rows = "?" if entry['rows'] is None else f"{entry['rows']:,}"
+            self.slow_log_text.insert(tk.END, f"[{entry['time']}] {entry['label']}: {entry['ms']:.1f} ms, {rows} rows")
+            if entry['vm_steps'] is not None:
+                self.slow_log_text.insert(tk.END, f", ~{entry['vm_steps']:,} VM steps")
+            if entry['error']:
+                self.slow_log_text.insert(tk.END, f"\n  ❌ {entry['error']}")
+            if entry['sql']:
+                self.slow_log_text.insert(tk.END, f"\n  {' '.join(entry['sql'].split())}")
+            if entry['params']:
+                self.slow_log_text.insert(tk.END, f"\n  params: {entry['params']}")
+            for detail in entry['plan'] or []:
+                self.slow_log_text.insert(tk.END, f"\n    {detail}")
+            self.slow_log_text.insert(tk.END, "\n\n")
+        
+        traced = f"  ·  {len(self.profiler.trace_log)} traced statements" if self.profiler.tracing else ""
+        self.perf_info.config(text=f"{len(slow_log)} slow queries logged{traced}")
+    
+    def set_slow_threshold(self):
+        try:
+            slow_ms = float(self.slow_ms_var.get())
+            if slow_ms <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Invalid Threshold", "Slow query threshold must be a positive number of milliseconds.")
+            self.slow_ms_var.set(str(self.profiler.slow_ms))
+            return
+        self.profiler.slow_ms = slow_ms
+    
+    def toggle_tracing(self):
+        # Workers, the writer included, re-attach on their next task; the metadata connection lives here
+        self.profiler.set_tracing(self.trace_var.get())
+        self.profiler.attach(self.connection)
+        self.refresh_performance()
+    
+    def clear_performance(self):
+        self.profiler.clear()
+        self.refresh_performance()
+    
+    def export_performance(self):
+        path = filedialog.asksaveasfilename(
+            title="Export Performance Data", initialfile="query_profile.json", defaultextension=".json",
+            filetypes=[("JSON", "*.json"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            self.profiler.export(path)
+            messagebox.showinfo("Export Complete", f"Performance data written to:\n{path}")
+        except OSError as e:
+            messagebox.showerror("Export Error", f"Failed to export performance data:\n{str(e)}")
     
     def setup_sql_frame(self):
         # SQL input section
         input_frame = ttk.LabelFrame(self.sql_frame, text="SQL Console", padding=15)
         input_frame.pack(fill=tk.X, pady=10, padx=10)
         
-        ttk.Label(input_frame, text="Enter SQL Query:", font=('Arial', 11, 'bold')).pack(anchor='w', pady=5)
+        ttk.Label(input_frame, text="Enter SQL (separate statements with ;):", font=('Arial', 11, 'bold')).pack(anchor='w', pady=5)
         
         self.sql_text = scrolledtext.ScrolledText(input_frame, wrap=tk.WORD, 
                                                  font=('Consolas', 10), height=8)
@@ -757,9 +4265,19 @@ class DentalClinicApp:
         
         ttk.Button(button_frame, text="Execute", command=self.execute_custom_sql, 
                   style='Custom.TButton').pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Cancel", 
+                  command=lambda: self.cancel_job(self.sql_job)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="💾 Export...", 
+                  command=self.export_custom_sql).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="🔬 Suggest Indexes", 
+                  command=self.suggest_indexes_for_sql).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Clear", 
                   command=lambda: self.sql_text.delete(1.0, tk.END)).pack(side=tk.LEFT, padx=5)
         
+        self.sql_continue_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(button_frame, text="Continue on error", 
+                        variable=self.sql_continue_var).pack(side=tk.LEFT, padx=5)
+        
         self.sql_status = ttk.Label(button_frame, text="", style='Success.TLabel')
         self.sql_status.pack(side=tk.LEFT, padx=10)
         
@@ -767,8 +4285,41 @@ class DentalClinicApp:
         results_frame = ttk.LabelFrame(self.sql_frame, text="Results", padding=10)
         results_frame.pack(fill=tk.BOTH, expand=True, pady=10, padx=10)
         
-        self.sql_results = scrolledtext.ScrolledText(results_frame, wrap=tk.WORD, font=('Consolas', 10))
-        self.sql_results.pack(fill=tk.BOTH, expand=True)
+        # Row cap and fetch more controls
+        limit_frame = ttk.Frame(results_frame)
+        limit_frame.pack(fill=tk.X, pady=(0, 5))
+        
+        ttk.Label(limit_frame, text="Row limit:").pack(side=tk.LEFT)
+        self.sql_limit_var = tk.StringVar(value=str(self.SQL_ROW_LIMIT))
+        ttk.Spinbox(limit_frame, from_=100, to=1000000, increment=100, 
+                    textvariable=self.sql_limit_var, width=10).pack(side=tk.LEFT, padx=5)
+        self.sql_more_button = ttk.Button(limit_frame, text="Fetch More", command=self.fetch_more_sql, 
+                                          state=tk.DISABLED)
+        self.sql_more_button.pack(side=tk.LEFT, padx=5)
+        
+        self.sql_info = ttk.Label(limit_frame, text="", font=('Arial', 9), foreground='#666')
+        self.sql_info.pack(side=tk.LEFT, padx=10)
+        
+        # Grid for row results
+        tree_frame = ttk.Frame(results_frame)
+        tree_frame.pack(fill=tk.BOTH, expand=True)
+        
+        self.sql_tree = ttk.Treeview(tree_frame, show='headings')
+        self.sql_grid = ResultGrid(self.sql_tree)
+        
+        v_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.sql_tree.yview)
+        h_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL, command=self.sql_tree.xview)
+        self.sql_tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+        
+        self.sql_tree.grid(row=0, column=0, sticky='nsew')
+        v_scrollbar.grid(row=0, column=1, sticky='ns')
+        h_scrollbar.grid(row=1, column=0, sticky='ew')
+        tree_frame.grid_rowconfigure(0, weight=1)
+        tree_frame.grid_columnconfigure(0, weight=1)
+        
+        # Messages, affected row counts and query plans
+        self.sql_results = scrolledtext.ScrolledText(results_frame, wrap=tk.WORD, font=('Consolas', 10), height=6)
+        self.sql_results.pack(fill=tk.X, pady=(5, 0))
     
     def setup_search_frame(self):
         # Search configuration section
@@ -819,6 +4370,8 @@ class DentalClinicApp:
                        value="startswith").pack(side=tk.LEFT)
         ttk.Radiobutton(search_type_frame, text="Exact Match", variable=self.search_type_var, 
                        value="exact").pack(side=tk.LEFT)
+        ttk.Radiobutton(search_type_frame, text="Full-text (all columns)", variable=self.search_type_var, 
+                       value="fulltext").pack(side=tk.LEFT)
         
         # Search button
         button_frame = ttk.Frame(search_config_frame)
@@ -826,6 +4379,8 @@ class DentalClinicApp:
         
         ttk.Button(button_frame, text="Search", command=self.execute_search, 
                   style='Custom.TButton').pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="🔎 Search Everything", command=self.search_everything, 
+                  style='Custom.TButton').pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Clear Results", 
                   command=self.clear_search_results).pack(side=tk.LEFT, padx=5)
         
@@ -870,6 +4425,7 @@ class DentalClinicApp:
         
         # Treeview for search results
         self.search_tree = ttk.Treeview(tree_frame, show='headings')
+        self.search_grid = ResultGrid(self.search_tree)
         
         # Scrollbars
         v_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.search_tree.yview)
@@ -892,14 +4448,14 @@ class DentalClinicApp:
         self.populate_search_tables()
     
     def populate_search_tables(self):
-        if not self.cursor:
+        if not self.cursor or not self.is_built(self.search_frame):
             return
         
         try:
-            self.cursor.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
-            tables = [table[0] for table in self.cursor.fetchall()]
+            tables = self.catalog.table_names()
             self.search_table_combo['values'] = tables
-            self.table_combo['values'] = tables  # Also update the table browser combo
+            if self.is_built(self.tables_frame):
+                self.table_combo['values'] = tables  # Also update the table browser combo
             
             if tables:
                 self.update_search_columns()
@@ -913,8 +4469,7 @@ class DentalClinicApp:
             return
         
         try:
-            self.cursor.execute(f"PRAGMA table_info({table_name})")
-            columns = [col[1] for col in self.cursor.fetchall()]
+            columns = self.catalog.column_names(table_name)
             self.search_column_combo['values'] = columns
             if columns:
                 self.search_column_combo.set(columns[0])
@@ -938,53 +4493,65 @@ class DentalClinicApp:
             messagebox.showwarning("Warning", "Please select a table, column, and enter a search term.")
             return
         
-        try:
-            # Clear previous results
-            for item in self.search_tree.get_children():
-                self.search_tree.delete(item)
-            self.search_tree["columns"] = []
+        if search_type == "fulltext":
+            if table_name not in SearchEngine.FTS_TABLES:
+                messagebox.showwarning("Warning", "Full-text search is available for: " + 
+                                       ", ".join(SearchEngine.FTS_TABLES))
+                return
             
-            # Build search query based on search type
-            if search_type == "contains":
-                query = f"SELECT * FROM {table_name} WHERE {column_name} LIKE ?"
-                params = (f'%{search_term}%',)
-            elif search_type == "startswith":
-                query = f"SELECT * FROM {table_name} WHERE {column_name} LIKE ?"
-                params = (f'{search_term}%',)
+            # Ranked search over every indexed column of the table
+            description = f"in {table_name} matching '{search_term}' (ranked full-text)"
+            self.run_search(lambda connection, job: self.search_engine.search(connection, table_name, search_term),
+                            description, f"search {table_name} (fulltext)")
+            return
+        
+        # Build search query based on search type; starts-with goes through
+        # the full-text index where the column has one
+        def run(connection, job):
+            if search_type in ("contains", "startswith"):
+                query, params = self.search_engine.column_query(connection, table_name, column_name, search_term,
+                                                                startswith=search_type == "startswith")
             else:  # exact match
                 query = f"SELECT * FROM {table_name} WHERE {column_name} = ?"
                 params = (search_term,)
-            
-            # Execute search
-            self.cursor.execute(query, params)
-            rows = self.cursor.fetchall()
-            
-            # Get column names
-            self.cursor.execute(f"PRAGMA table_info({table_name})")
-            columns = [col[1] for col in self.cursor.fetchall()]
-            
-            # Configure treeview
-            self.search_tree["columns"] = columns
-            for col in columns:
-                self.search_tree.heading(col, text=col)
-                self.search_tree.column(col, width=120, minwidth=50)
-            
-            # Insert data
-            for row in rows:
-                self.search_tree.insert("", tk.END, values=row)
+            return QueryExecutor._fetch_all(connection, job, query, params)
+        
+        description = f"in {table_name} where {column_name} {search_type} '{search_term}'"
+        self.run_search(run, description, f"search {table_name} ({search_type})")
+    
+    def search_everything(self):
+        search_term = self.search_term_var.get()
+        if not search_term:
+            messagebox.showwarning("Warning", "Please enter a search term.")
+            return
+        
+        description = f"across {', '.join(SearchEngine.FTS_TABLES)} matching '{search_term}'"
+        self.run_search(lambda connection, job: self.search_engine.search_everything(connection, search_term),
+                        description, "search everything")
+    
+    def run_search(self, fn, description, label):
+        # label names the search kind for the profiler; the term stays out of it
+        # Clear previous results
+        self.search_grid.clear()
+        
+        def show_results(result):
+            columns, rows = result
+            self.search_grid.show(columns, rows)
             
             # Update status
             self.search_status.config(text=f"✅ Found {len(rows)} records")
-            self.search_results_info.config(text=f"Found {len(rows)} records in {table_name} where {column_name} {search_type} '{search_term}'")
-            
-        except Exception as e:
+            self.search_results_info.config(text=f"Found {len(rows)} records {description}")
+        
+        def show_error(e):
             messagebox.showerror("Search Error", f"Failed to execute search:\n{str(e)}")
             self.search_status.config(text="❌ Search failed")
+        
+        # Execute search in the background
+        self.search_status.config(text="⏳ Searching...")
+        self.executor.submit(fn, label=label, on_done=show_results, on_error=show_error)
     
     def clear_search_results(self):
-        for item in self.search_tree.get_children():
-            self.search_tree.delete(item)
-        self.search_tree["columns"] = []
+        self.search_grid.clear()
         self.search_results_info.config(text="No search performed yet")
         self.search_status.config(text="")
     
@@ -996,8 +4563,7 @@ class DentalClinicApp:
             return
         
         # Get column information
-        self.cursor.execute(f"PRAGMA table_info({table_name})")
-        columns = self.cursor.fetchall()
+        columns = self.catalog.table_columns(table_name)
         
         # Create edit dialog
         self.create_edit_dialog(table_name, columns, None, "Add New Record")
@@ -1013,8 +4579,7 @@ class DentalClinicApp:
             return
         
         # Get column information
-        self.cursor.execute(f"PRAGMA table_info({table_name})")
-        columns = self.cursor.fetchall()
+        columns = self.catalog.table_columns(table_name)
         
         # Create edit dialog
         self.create_edit_dialog(table_name, columns, self.selected_row, "Edit Record")
@@ -1115,6 +4680,16 @@ class DentalClinicApp:
         except ValueError:
             return False
     
+    def parse_value(self, col_type, value):
+        # Form text to a column value: empty means NULL, numbers by declared type
+        if value == "":
+            return None
+        if col_type.upper() in ('INTEGER', 'INT'):
+            return int(value)
+        if col_type.upper() in ('REAL', 'FLOAT', 'DECIMAL'):
+            return float(value)
+        return value
+    
     def save_record(self, dialog, table_name, entry_widgets, columns, is_edit):
         try:
             # Build column names and values
@@ -1130,17 +4705,10 @@ class DentalClinicApp:
                 
                 value = entry_widgets[col_name].get()
                 
-                # Handle empty values
-                if value == "":
-                    if is_pk and not is_edit:  # PK can be empty for new records (auto-increment)
-                        continue
-                    value = None
-                else:
-                    # Convert based on type
-                    if col_type.upper() in ('INTEGER', 'INT'):
-                        value = int(value)
-                    elif col_type.upper() in ('REAL', 'FLOAT', 'DECIMAL'):
-                        value = float(value)
+                # PK can be empty for new records (auto-increment)
+                if value == "" and is_pk and not is_edit:
+                    continue
+                value = self.parse_value(col_type, value)
                 
                 if is_pk:
                     primary_key_col = col_name
@@ -1165,109 +4733,230 @@ class DentalClinicApp:
                 placeholders = ", ".join(["?" for _ in col_names])
                 col_list = ", ".join(col_names)
                 query = f"INSERT INTO {table_name} ({col_list}) VALUES ({placeholders})"
-            
-            # Execute query
-            self.cursor.execute(query, values)
-            self.connection.commit()
-            
-            # Refresh table data
-            self.load_table_data()
-            self.update_dashboard_stats()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save record:\n{str(e)}")
+            return
+        
+        def read_back(connection, lastrowid):
+            if is_edit:
+                return self.read_back_rows(connection, table_name, f"{primary_key_col} = ?", (primary_key_value,))
+            return self.read_back_rows(connection, table_name, "rowid = ?", (lastrowid,))
+        
+        def show_saved(result):
+            rowcount, _, rows = result
+            # Patch the saved row into the grid instead of reloading the table
+            if table_name != self.table_view.table_name:
+                self.load_table_data()
+            elif is_edit:
+                self.table_view.refresh_rows(rows)
+            else:
+                self.table_view.insert_rows(rows)
+            self.on_table_select(None)
+            if not is_edit:
+                self.apply_dashboard_delta(table_name, rowcount)
             
             dialog.destroy()
             self.table_action_status.config(text="✅ Record saved successfully")
-            
-        except Exception as e:
+        
+        def show_error(e):
+            dialog.deiconify()
+            dialog.grab_set()
             messagebox.showerror("Error", f"Failed to save record:\n{str(e)}")
+        
+        # Queued on the writer, retrying if another workstation holds the lock.
+        # The form is hidden meanwhile so the record can't be submitted twice.
+        dialog.grab_release()
+        dialog.withdraw()
+        self.table_action_status.config(text="⏳ Saving record...")
+        self.connections.write(query, values, label=f"save {table_name}", read_back=read_back,
+                               on_done=show_saved, on_error=show_error)
+    
+    @staticmethod
+    def read_back_rows(connection, table_name, where, params):
+        # Rows shaped like the browser's pages (rowid first), read on the writer right after a save
+        return connection.execute(f"SELECT rowid, * FROM {table_name} WHERE {where}", params).fetchall()
     
     def delete_record(self):
-        if not self.selected_row:
-            messagebox.showwarning("Warning", "Please select a record to delete.")
+        table_name = self.table_view.table_name
+        rowids = self.selected_rowids()
+        if not table_name or not rowids:
+            messagebox.showwarning("Warning", "Please select one or more records to delete.")
             return
         
-        table_name = self.table_var.get()
-        if not table_name:
-            messagebox.showwarning("Warning", "Please select a table first.")
+        # Confirm deletion
+        if len(rowids) == 1:
+            primary_key = self.catalog.primary_key(table_name)
+            values = self.table_tree.item(str(rowids[0]))['values']
+            columns = self.catalog.column_names(table_name)
+            key_text = ", ".join(f"{col}: {values[columns.index(col)]}" for col in primary_key
+                                 if columns.index(col) < len(values))
+            prompt = f"Are you sure you want to delete this record?\n\n{key_text}"
+        else:
+            prompt = f"Are you sure you want to delete {len(rowids)} records from {table_name}?"
+        if not messagebox.askyesno("Confirm Deletion", prompt):
             return
         
-        # Get primary key column
-        self.cursor.execute(f"PRAGMA table_info({table_name})")
-        columns = self.cursor.fetchall()
-        primary_key_col = None
-        
-        for col in columns:
-            if col[5]:  # pk field
-                primary_key_col = col[1]
-                break
+        def show_deleted(result):
+            rowcount = result[0]
+            if table_name == self.table_view.table_name:
+                self.table_view.remove_rows(rowids)
+            self.apply_dashboard_delta(table_name, -rowcount)
+            
+            if rowcount == 1:
+                self.table_action_status.config(text="✅ Record deleted successfully")
+            else:
+                self.table_action_status.config(text=f"✅ {rowcount} records deleted successfully")
+        
+        # Every selected row in one transaction
+        query = f"DELETE FROM {table_name} WHERE rowid = ?"
+        self.table_action_status.config(text="⏳ Deleting...")
+        self.connections.write_many(query, [(rowid,) for rowid in rowids], label=f"delete {table_name}",
+                                    on_done=show_deleted,
+                                    on_error=lambda e: messagebox.showerror("Error",
+                                                                            f"Failed to delete records:\n{str(e)}"))
+    
+    def bulk_update_records(self):
+        table_name = self.table_view.table_name
+        rowids = self.selected_rowids()
+        if not table_name or not rowids:
+            messagebox.showwarning("Warning", "Please select one or more records to update.")
+            return
         
-        if not primary_key_col:
-            messagebox.showerror("Error", "Cannot delete record - no primary key found.")
+        # Key columns are left out: one value for many rows would collide
+        primary_key = self.catalog.primary_key(table_name)
+        columns = [col for col in self.catalog.table_columns(table_name) if col[1] not in primary_key]
+        if not columns:
+            messagebox.showwarning("Warning", f"{table_name} has no columns to update.")
             return
         
-        # Find primary key value
-        pk_index = None
-        for i, col in enumerate(columns):
-            if col[1] == primary_key_col:
-                pk_index = i
-                break
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Set Column")
+        dialog.geometry("420x230")
+        dialog.configure(bg='#f5f5f5')
+        dialog.transient(self.root)
+        dialog.grab_set()
+        
+        main_frame = ttk.Frame(dialog, padding=20)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        ttk.Label(main_frame, text=f"Set a column on {len(rowids)} selected record(s) of {table_name}", 
+                 font=('Arial', 11, 'bold')).pack(anchor='w', pady=(0, 10))
+        
+        fields_frame = ttk.Frame(main_frame)
+        fields_frame.pack(fill=tk.X)
         
-        if pk_index is None or pk_index >= len(self.selected_row):
-            messagebox.showerror("Error", "Cannot delete record - primary key value not found.")
-            return
+        ttk.Label(fields_frame, text="Column:").grid(row=0, column=0, sticky='w', pady=5, padx=(0, 10))
+        column_var = tk.StringVar(value=columns[0][1])
+        ttk.Combobox(fields_frame, textvariable=column_var, values=[col[1] for col in columns], 
+                     state="readonly", width=25).grid(row=0, column=1, sticky='w', pady=5)
         
-        pk_value = self.selected_row[pk_index]
+        ttk.Label(fields_frame, text="Value:").grid(row=1, column=0, sticky='w', pady=5, padx=(0, 10))
+        value_var = tk.StringVar()
+        ttk.Entry(fields_frame, textvariable=value_var, width=28).grid(row=1, column=1, sticky='w', pady=5)
         
-        # Confirm deletion
-        if not messagebox.askyesno("Confirm Deletion", 
-                                  f"Are you sure you want to delete this record?\n\n{primary_key_col}: {pk_value}"):
-            return
+        ttk.Label(main_frame, text="Leave the value empty to set NULL.", font=('Arial', 9), 
+                 foreground='#666').pack(anchor='w', pady=5)
         
-        try:
-            # Delete record
-            query = f"DELETE FROM {table_name} WHERE {primary_key_col} = ?"
-            self.cursor.execute(query, (pk_value,))
-            self.connection.commit()
+        def apply_update():
+            column_name = column_var.get()
+            col_type = next(col[2] for col in columns if col[1] == column_name)
+            try:
+                value = self.parse_value(col_type, value_var.get())
+            except ValueError:
+                messagebox.showerror("Set Column", f"'{value_var.get()}' is not a valid {col_type} value.", 
+                                     parent=dialog)
+                return
             
-            # Refresh table data
-            self.load_table_data()
-            self.update_dashboard_stats()
+            placeholders = ", ".join("?" for _ in rowids)
             
-            self.table_action_status.config(text="✅ Record deleted successfully")
+            def show_updated(result):
+                rowcount, _, rows = result
+                dialog.destroy()
+                if table_name == self.table_view.table_name:
+                    self.table_view.refresh_rows(rows)
+                self.on_table_select(None)
+                self.table_action_status.config(text=f"✅ {rowcount} record(s) updated successfully")
             
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to delete record:\n{str(e)}")
+            def show_error(e):
+                dialog.deiconify()
+                dialog.grab_set()
+                messagebox.showerror("Set Column", f"Failed to update records:\n{str(e)}", parent=dialog)
+            
+            # Every selected row in one transaction, read back for the grid on the writer
+            query = f"UPDATE {table_name} SET {column_name} = ? WHERE rowid = ?"
+            dialog.grab_release()
+            dialog.withdraw()
+            self.connections.write_many(
+                query, [(value, rowid) for rowid in rowids], label=f"bulk update {table_name}",
+                read_back=lambda connection, lastrowid: self.read_back_rows(
+                    connection, table_name, f"rowid IN ({placeholders})", rowids),
+                on_done=show_updated, on_error=show_error)
+        
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill=tk.X, pady=(10, 0))
+        
+        ttk.Button(button_frame, text="Apply", command=apply_update, style='Custom.TButton').pack(side=tk.RIGHT, padx=5)
+        ttk.Button(button_frame, text="Cancel", command=dialog.destroy).pack(side=tk.RIGHT, padx=5)
     
     def update_dashboard_stats(self):
         if not self.cursor:
             return
-            
-        stats_queries = {
-            'patients': "SELECT COUNT(*) FROM Patient",
-            'staff': "SELECT COUNT(*) FROM Staff",
-            'appointments': "SELECT COUNT(*) FROM Appointment",
-            'treatments': "SELECT COUNT(*) FROM Treatment",
-            'prescriptions': "SELECT COUNT(*) FROM Prescription",
-            'inventory_items': "SELECT COUNT(*) FROM Inventory",
-            'bills': "SELECT COUNT(*) FROM Bill",
-            'dentists': "SELECT COUNT(*) FROM Dentist"
-        }
         
-        for stat, query in stats_queries.items():
+        # Cached counters are reused unless another connection wrote to the database
+        try:
+            if self.dashboard_stats.is_current(self.connection):
+                self.show_dashboard_counts(self.dashboard_stats.counts)
+                return
+        except Exception as e:
+            print(f"Error checking data version: {e}")
+        
+        # Until the first exact counts arrive, show the estimates from the last ANALYZE
+        if self.dashboard_stats.counts is None and not self.timeline.has("Dashboard counts shown"):
             try:
-                self.cursor.execute(query)
-                count = self.cursor.fetchone()[0]
-                getattr(self, f"{stat}_count").config(text=str(count))
+                estimates = self.catalog.approximate_row_counts()
+                for stat, table in DashboardStats.STATS:
+                    if table in estimates:
+                        getattr(self, f"{stat}_count").config(text=f"~{estimates[table]:,}")
+                if estimates:
+                    self.timeline.mark("Dashboard estimates shown")
             except Exception as e:
-                print(f"Error updating {stat}: {e}")
-                getattr(self, f"{stat}_count").config(text="0")
+                print(f"Error reading row estimates: {e}")
+        
+        def store_counts(counts):
+            self.dashboard_stats.set_counts(counts)
+            self.show_dashboard_counts(counts)
+        
+        def show_error(e):
+            print(f"Error updating dashboard stats: {e}")
+            self.show_dashboard_counts({stat: 0 for stat, _ in DashboardStats.STATS})
+        
+        self.executor.submit(self.dashboard_stats.count_all, label="dashboard counts",
+                             on_done=store_counts, on_error=show_error)
+    
+    def apply_dashboard_delta(self, table_name, delta):
+        # The app's own inserts and deletes move the counters without a recount
+        self.dashboard_stats.apply_delta(table_name, delta)
+        if self.dashboard_stats.counts is None:
+            self.update_dashboard_stats()
+        else:
+            self.show_dashboard_counts(self.dashboard_stats.counts)
+    
+    def show_dashboard_counts(self, counts):
+        for stat, count in counts.items():
+            getattr(self, f"{stat}_count").config(text=str(count))
+        if not self.timeline.has("Dashboard counts shown"):
+            self.timeline.mark("Dashboard counts shown")
+            # Time spent typing the password isn't startup time
+            since = "login" if self.timeline.has("Login submitted") else "start"
+            ready = self.timeline.events[-1][1] - self.timeline.at("Login submitted")
+            self.startup_info.config(text=f"⏱ Ready {ready:.2f}s after {since} (timeline in the Performance tab)")
     
     def populate_table_list(self):
-        if not self.cursor:
+        if not self.cursor or not self.is_built(self.tables_frame):
             return
         
         try:
-            self.cursor.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
-            tables = [table[0] for table in self.cursor.fetchall()]
+            tables = self.catalog.table_names()
             self.table_combo['values'] = tables
 
             if tables:
@@ -1286,35 +4975,20 @@ class DentalClinicApp:
             return
         
         self.current_table = table_name
+        self.selected_row = None
         
         try:
-            # Clear existing treeview
-            for item in self.table_tree.get_children():
-                self.table_tree.delete(item)
-            self.table_tree["columns"] = []
-            
-            # Get table data
-            self.cursor.execute(f"SELECT * FROM {table_name} LIMIT 100")
-            rows = self.cursor.fetchall()
-            
-            # Get column names
-            self.cursor.execute(f"PRAGMA table_info({table_name})")
-            columns = [col[1] for col in self.cursor.fetchall()]
-            
-            # Configure treeview columns
-            self.table_tree["columns"] = columns
-            for col in columns:
-                self.table_tree.heading(col, text=col)
-                self.table_tree.column(col, width=120, minwidth=50)
-            
-            # Insert data
-            for row in rows:
-                self.table_tree.insert("", tk.END, values=row)
-            
-            # Update info label
-            total_count = self.get_table_count(table_name)
-            display_count = min(len(rows), 100)
-            self.table_info.config(text=f"Showing 1 to {display_count} of {total_count} entries from {table_name}")
+            # Pages are fetched in the background, keyed on rowid
+            self.table_info.config(text=f"Loading {table_name}...")
+            self.table_position.set(0)
+            self.table_view.full_text_tables = {
+                table for table, (fts, _, _) in SearchEngine.FTS_TABLES.items()
+                if self.connection.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?",
+                                           (fts,)).fetchone()}
+            self.table_view.load(table_name)
+            self.filter_column_combo['values'] = self.catalog.column_names(table_name)
+            self.filter_column_var.set("")
+            self.filter_text_var.set("")
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load table data: {str(e)}")
@@ -1326,44 +5000,109 @@ class DentalClinicApp:
             return
         
         # Find the corresponding query SQL
-        query_sql = None
-        for desc, key in self.queries:
-            if desc == query_text:
-                query_sql = self.get_query_sql(key)
-                break
-        
-        if not query_sql:
+        query_key = self.selected_query_key()
+        if not query_key:
             messagebox.showerror("Error", "Selected query not found.")
             return
         
-        try:
-            # Clear previous results
-            for item in self.results_tree.get_children():
-                self.results_tree.delete(item)
-            self.results_tree["columns"] = []
-            
-            # Execute query
-            self.cursor.execute(query_sql)
-            rows = self.cursor.fetchall()
-            columns = [desc[0] for desc in self.cursor.description]
-            
-            # Configure treeview
-            self.results_tree["columns"] = columns
-            for col in columns:
-                self.results_tree.heading(col, text=col)
-                self.results_tree.column(col, width=120, minwidth=50)
+        query_sql = self.query_registry.sql(query_key)
+        params = self.get_query_params(query_key)
+        if params is None:
+            return
+        materialized = self.report_materializer.is_materialized(self.connection, query_key)
+        
+        # Clear previous results
+        self.cancel_job(self.query_job)
+        self.results_grid.clear()
+        self.plan_info.config(text="")
+        
+        # Batches from a replaced or cancelled query are ignored
+        self.query_generation += 1
+        generation = self.query_generation
+        
+        # A cached result is reused while none of the tables it read has changed;
+        # without versions (time-dependent queries, errors) nothing is cached
+        cache_key = ResultCache.make_key(query_key, params)
+        versions = None
+        if ResultCache.is_cacheable(query_sql):
+            try:
+                tables = ResultCache.dependencies(query_sql, self.catalog.table_names())
+                versions = self.table_versions.current(self.connection, tables)
+            except Exception as e:
+                print(f"Error checking table versions: {e}")
+        cached = self.result_cache.get(cache_key, versions)
+        if cached:
+            columns, rows = cached
+            self.results_grid.show(columns, rows)
+            self.query_status.config(text="✅ Query executed successfully (cached result)")
+            self.results_info.config(text=f"Showing 1 to {len(rows)} of {len(rows)} entries (cached)")
+            return
+        collected = []
+        
+        def show_batch(batch):
+            if generation != self.query_generation:
+                return
+            columns, rows = batch
+            collected.extend(rows)
+            self.results_grid.set_columns(columns, rows)
             
-            # Insert data
-            for row in rows:
-                self.results_tree.insert("", tk.END, values=row)
+            # Rows are queued and inserted in chunks between UI events
+            self.results_grid.append(rows)
+            self.results_info.config(text=f"Loading... {self.results_grid.row_count()} rows so far")
+        
+        def show_done(result):
+            if generation != self.query_generation:
+                return
+            columns, row_count = result[:2]
+            if not self.results_grid.columns:
+                self.results_grid.set_columns(columns)
+            self.result_cache.put(cache_key, versions, columns, collected)
             
             # Update status
             self.query_status.config(text=f"✅ Query executed successfully")
-            self.results_info.config(text=f"Showing 1 to {len(rows)} of {len(rows)} entries")
-            
-        except Exception as e:
+            info = f"Showing 1 to {row_count} of {row_count} entries"
+            if materialized:
+                refreshed_at, pending = result[2]
+                info += f"  ·  snapshot refreshed {refreshed_at or 'never'}"
+                if pending:
+                    info += f", {pending} change(s) not yet applied"
+            else:
+                self.check_query_plan(query_sql, params)
+            self.results_info.config(text=info)
+        
+        def show_error(e):
             messagebox.showerror("Query Error", f"Failed to execute query:\n{str(e)}")
             self.query_status.config(text="❌ Query failed")
+        
+        def show_cancelled():
+            if generation == self.query_generation:
+                self.query_status.config(text="⏹ Query cancelled")
+        
+        def read_snapshot(connection, job):
+            columns, row_count = QueryExecutor._fetch_batches(
+                connection, job, self.report_materializer.serve_sql(query_key), (), 500)
+            return columns, row_count, self.report_materializer.freshness(connection, query_key)
+        
+        def run_query(*args):
+            if generation != self.query_generation:
+                return
+            self.query_status.config(text="⏳ Running query...")
+            callbacks = dict(label=f"report {query_key}", on_batch=show_batch, on_done=show_done,
+                             on_error=show_error, on_cancel=show_cancelled)
+            if materialized:
+                self.query_job = self.executor.submit(read_snapshot, **callbacks)
+            else:
+                self.query_job = self.executor.stream_query(query_sql, params, **callbacks)
+        
+        # Execute query in the background
+        if materialized:
+            # Fold pending changes into the summary table first; if that fails
+            # (e.g. the database is busy) the existing snapshot is still shown
+            self.query_status.config(text="⏳ Refreshing snapshot...")
+            self.write_executor.submit(lambda connection, job: self.report_materializer.refresh(connection, query_key),
+                                       label=f"refresh {query_key}", on_done=run_query, on_error=run_query)
+        else:
+            run_query()
     
     def execute_custom_sql(self):
         query = self.sql_text.get(1.0, tk.END).strip()
@@ -1371,290 +5110,213 @@ class DentalClinicApp:
             messagebox.showwarning("Warning", "Please enter a SQL query.")
             return
         
-        try:
-            self.cursor.execute(query)
-            
-            if query.upper().startswith('SELECT'):
-                columns = [desc[0] for desc in self.cursor.description]
-                rows = self.cursor.fetchall()
+        limit = self.get_sql_row_limit()
+        if limit is None:
+            return
+        
+        statements = ScriptRunner.split(query)
+        if not statements:
+            messagebox.showwarning("Warning", "Please enter a SQL query.")
+            return
+        
+        self.cancel_job(self.sql_job)
+        self.close_sql_cursor()
+        self.sql_generation += 1
+        generation = self.sql_generation
+        self.sql_grid.clear()
+        self.sql_results.delete(1.0, tk.END)
+        self.sql_info.config(text="")
+        
+        if len(statements) > 1:
+            self.run_sql_script(statements, limit, generation)
+            return
+        
+        # Runs on the writer, whose thread owns the cursor kept open for Fetch More
+        def run(connection, job):
+            started = time.perf_counter()
+            job.sql = statements[0]
+            try:
+                cursor = connection.execute(statements[0])
                 
-                self.sql_results.delete(1.0, tk.END)
+                if cursor.description is None:
+                    connection.commit()
+                    return None, cursor.rowcount, time.perf_counter() - started
                 
-                if rows:
-                    # Format as table
-                    header = " | ".join(f"{col:<20}" for col in columns)
-                    self.sql_results.insert(tk.END, header + "\n")
-                    self.sql_results.insert(tk.END, "-" * len(header) + "\n")
-                    
-                    for row in rows:
-                        row_str = " | ".join(f"{str(val):<20}" for val in row)
-                        self.sql_results.insert(tk.END, row_str + "\n")
-                    
-                    self.sql_results.insert(tk.END, f"\n{len(rows)} row(s) returned\n")
-                else:
+                pager = CursorPager(cursor)
+                pager.elapsed = time.perf_counter() - started
+                pager.fetch(job, limit)
+                if not connection.in_transaction:
+                    return pager, None, pager.elapsed
+                
+                # INSERT/UPDATE/DELETE ... RETURNING: the changes are already made,
+                # so commit now rather than hold the write lock for "Fetch More"
+                pager.finish()
+                connection.commit()
+                return pager, pager.fetched, pager.elapsed
+            except Exception:
+                if connection.in_transaction:
+                    connection.rollback()
+                raise
+        
+        def show_results(result):
+            if generation != self.sql_generation:
+                return
+            pager, rowcount, elapsed = result
+            
+            if pager is not None:
+                self.sql_pager = pager
+                if not pager.fetched:
+                    self.sql_grid.set_columns(pager.columns)
                     self.sql_results.insert(tk.END, "No results found.\n")
+                self.show_sql_progress()
             else:
-                self.connection.commit()
-                self.sql_results.delete(1.0, tk.END)
-                self.sql_results.insert(tk.END, f"✅ Query executed successfully. {self.cursor.rowcount} row(s) affected.\n")
+                self.sql_results.insert(tk.END, f"✅ Query executed successfully. {rowcount} row(s) affected "
+                                                f"in {elapsed:.3f}s.\n")
             
-            self.sql_status.config(text="✅ Query executed")
-            self.update_dashboard_stats()  # Refresh stats after potential changes
+            if rowcount is not None:
+                if pager is not None:
+                    self.sql_results.insert(tk.END, "✅ Changes committed.\n")
+                self.catalog.invalidate()  # The statement may have been DDL
+                self.update_dashboard_stats()  # Refresh stats after potential changes
             
-        except Exception as e:
+            self.sql_status.config(text="✅ Query executed")
+        
+        def show_error(e):
             self.sql_results.delete(1.0, tk.END)
             self.sql_results.insert(tk.END, f"❌ Error: {str(e)}\n")
             self.sql_status.config(text="❌ Query failed")
+        
+        self.sql_status.config(text="⏳ Running...")
+        self.sql_job = self.write_executor.submit(
+            run, label="sql console", on_batch=lambda batch: self.show_sql_batch(generation, batch), 
+            on_done=show_results, on_error=show_error,
+            on_cancel=lambda: self.sql_status.config(text="⏹ Query cancelled"))
     
-    def get_query_sql(self, query_key):
-        queries = {
-            "patients_from_toronto": """
-                SELECT patient_id, full_name, city, phone
-                FROM Patient
-                WHERE city = 'Toronto'
-                ORDER BY full_name ASC
-            """,
-            "available_surgery_rooms": """
-                SELECT room_number, room_type, capacity
-                FROM Room
-                WHERE room_type = 'Surgery'
-                AND availability = 'Y'
-            """,
-            "upcoming_scheduled_appointments": """
-                SELECT appointment_id, appointment_datetime, room_number
-                FROM Appointment
-                WHERE status = 'SCHEDULED'
-                AND appointment_datetime > CURRENT_TIMESTAMP
-                ORDER BY appointment_datetime ASC
-            """,
-            "distinct_staff_emails": """
-                SELECT DISTINCT email, salary
-                FROM Staff
-                WHERE email IS NOT NULL
-                ORDER BY salary DESC
-            """,
-            "long_staff_schedules": """
-                SELECT schedule_id, staff_id, start_time, end_time
-                FROM Staff_Schedule
-                WHERE (strftime('%s', end_time) - strftime('%s', start_time)) = 8 * 3600
-                ORDER BY start_time ASC
-            """,
-            "orthodontic_dentists": """
-                SELECT d.staff_id, s.name, d.license_no, d.specialization
-                FROM Dentist d
-                JOIN Staff s ON d.staff_id = s.staff_id
-                WHERE d.specialization = 'Orthodontics';
-            """,
-            "certified_dental_assistants": """
-                SELECT da.staff_id, s.name, da.certification
-                FROM Dental_Assistant da
-                JOIN Staff s ON da.staff_id = s.staff_id
-                WHERE da.certification LIKE '%Dental Assistant Level%';
-            """,
-            "receptionist_details": """
-                SELECT r.staff_id, s.name, s.phone
-                FROM Receptionist r
-                JOIN Staff s ON r.staff_id = s.staff_id
-                ORDER BY s.name ASC
-            """,
-            "staff_for_appointment_1002": """
-                SELECT a.appointment_id, s.name, s.email
-                FROM Appointment_Staff a
-                JOIN Staff s ON a.staff_id = s.staff_id
-                WHERE a.appointment_id = 1002
-            """,
-            "expensive_dental_actions": """
-                SELECT dental_action_id, appointment_id, cost
-                FROM Dental_Action
-                WHERE cost > 200
-                ORDER BY cost DESC;
-            """,
-            "treatment_count_by_type": """
-                SELECT type, COUNT(*) AS num_treatments
-                FROM Treatment
-                GROUP BY type
-                ORDER BY num_treatments DESC
-            """,
-            "prescriptions_amoxicillin": """
-                SELECT prescription_id, medication, dosage, duration
-                FROM Prescription
-                WHERE medication LIKE 'Amoxicillin%'
-            """,
-            "low_stock_items": """
-                SELECT item_id, item_name, quantity
-                FROM Inventory
-                WHERE quantity < 40
-                ORDER BY quantity ASC
-            """,
-            "total_items_used_per_action": """
-                SELECT dental_action_id, SUM(quantity_used) AS total_items_used
-                FROM DentalAction_Inventory
-                GROUP BY dental_action_id
-                ORDER BY total_items_used DESC
-            """,
-            "unpaid_bills_september_2025": """
-                SELECT bill_id, dental_action_id, total_amount, status, issue_date
-                FROM Bill
-                WHERE status = 'UNPAID'
-                AND issue_date BETWEEN '2025-09-01' AND '2025-09-30'
-                ORDER BY total_amount DESC;
-            """,
-            "least_popular_treatments": """
-                SELECT t.type, COUNT(*) AS num_treatments
-                FROM Treatment t
-                GROUP BY t.type
-                HAVING COUNT(*) <= 3
-                ORDER BY num_treatments DESC
-            """,
-            "patients_both_treatment_prescription": """
-                SELECT p.patient_id, p.full_name
-                FROM Patient p
-                JOIN Appointment a ON a.patient_id = p.patient_id
-                JOIN Dental_Action da ON a.appointment_id = da.appointment_id
-                JOIN Treatment t ON t.dental_action_id = da.dental_action_id
-                INTERSECT
-                SELECT p.patient_id, p.full_name
-                FROM Patient p
-                JOIN Appointment a ON a.patient_id = p.patient_id
-                JOIN Dental_Action da ON a.appointment_id = da.appointment_id
-                JOIN Prescription pr ON pr.dental_action_id = da.dental_action_id
-            """,
-            "patients_no_bills": """
-                SELECT DISTINCT p.patient_id, p.full_name
-                FROM Appointment a
-                JOIN Patient p ON a.patient_id = p.patient_id
-                WHERE NOT EXISTS (
-                    SELECT 1
-                    FROM Bill b
-                    JOIN Dental_Action da ON b.dental_action_id = da.dental_action_id
-                    WHERE da.appointment_id = a.appointment_id
-                )
-            """,
-            "most_expensive_actions": """
-                SELECT p.full_name, MAX(da.cost) AS highest_cost
-                FROM Dental_Action da
-                JOIN Appointment a ON da.appointment_id = a.appointment_id
-                JOIN Patient p ON a.patient_id = p.patient_id
-                GROUP BY p.full_name
-                ORDER BY highest_cost DESC
-            """,
-            "patients_no_treatments": """
-                SELECT p.patient_id, p.full_name
-                FROM Patient p
-                JOIN Appointment a ON p.patient_id = a.patient_id
-                WHERE NOT EXISTS (
-                    SELECT 1
-                    FROM Dental_Action da
-                    JOIN Treatment t ON da.dental_action_id = t.dental_action_id
-                    WHERE da.appointment_id = a.appointment_id
-                )
-            """,
-            "inventory_used_by_dentists": """
-                SELECT DISTINCT i.item_name, i.supplier, s.name AS dentist_name
-                FROM Inventory i
-                JOIN DentalAction_Inventory dai ON i.item_id = dai.item_id
-                JOIN Dental_Action da ON dai.dental_action_id = da.dental_action_id
-                JOIN Appointment a ON da.appointment_id = a.appointment_id
-                JOIN Appointment_Staff ast ON a.appointment_id = ast.appointment_id
-                JOIN Dentist d ON ast.staff_id = d.staff_id
-                JOIN Staff s ON d.staff_id = s.staff_id
-                ORDER BY dentist_name, item_name
-            """,
-            "patient_billing_summary": """
-                SELECT p.full_name, 
-                       COUNT(b.bill_id) AS num_bills,
-                       SUM(b.total_amount) AS total_billed, 
-                       ROUND(AVG(b.total_amount),2) AS avg_bill
-                FROM Bill b
-                JOIN Dental_Action da ON b.dental_action_id = da.dental_action_id
-                JOIN Appointment a ON da.appointment_id = a.appointment_id
-                JOIN Patient p ON a.patient_id = p.patient_id
-                GROUP BY p.full_name
-                HAVING SUM(b.total_amount) > 0
-                ORDER BY total_billed DESC
-            """,
-            "staff_with_roles": """
-                SELECT s.staff_id, s.name, s.email, s.salary,
-                       CASE 
-                           WHEN d.staff_id IS NOT NULL THEN 'Dentist - ' || d.specialization
-                           WHEN da.staff_id IS NOT NULL THEN 'Dental Assistant'
-                           WHEN r.staff_id IS NOT NULL THEN 'Receptionist'
-                           ELSE 'Unknown'
-                       END AS role
-                FROM Staff s
-                LEFT JOIN Dentist d ON s.staff_id = d.staff_id
-                LEFT JOIN Dental_Assistant da ON s.staff_id = da.staff_id
-                LEFT JOIN Receptionist r ON s.staff_id = r.staff_id
-                ORDER BY s.name
-            """,
-            "appointments_with_staff": """
-                SELECT a.appointment_id, p.full_name AS patient, 
-                       a.appointment_datetime, a.status,
-                       GROUP_CONCAT(s.name, ', ') AS staff_assigned
-                FROM Appointment a
-                JOIN Patient p ON a.patient_id = p.patient_id
-                LEFT JOIN Appointment_Staff ast ON a.appointment_id = ast.appointment_id
-                LEFT JOIN Staff s ON ast.staff_id = s.staff_id
-                GROUP BY a.appointment_id, p.full_name, a.appointment_datetime, a.status
-                ORDER BY a.appointment_datetime DESC
-            """,
-            "inventory_usage_report": """
-                SELECT i.item_name, i.quantity AS current_stock,
-                       COALESCE(SUM(dai.quantity_used), 0) AS total_used,
-                       COUNT(DISTINCT dai.dental_action_id) AS times_used
-                FROM Inventory i
-                LEFT JOIN DentalAction_Inventory dai ON i.item_id = dai.item_id
-                GROUP BY i.item_id, i.item_name, i.quantity
-                ORDER BY total_used DESC
-            """
-        }
-        return queries.get(query_key, "SELECT 1")
-    
-    def get_schema_info(self):
-        if not self.cursor:
-            return "Database not connected"
+    def run_sql_script(self, statements, limit, generation):
+        runner = ScriptRunner(row_limit=limit, continue_on_error=self.sql_continue_var.get())
+        
+        def show_results(result):
+            if generation != self.sql_generation:
+                return
+            results, outcome = result
+            self.sql_results.insert(tk.END, ScriptRunner.format_report(results, outcome, limit))
             
-        try:
-            schema_info = "=" * 80 + "\n"
-            schema_info += "DATABASE SCHEMA - DENTAL CLINIC MANAGEMENT SYSTEM\n"
-            schema_info += "=" * 80 + "\n\n"
-            
-            self.cursor.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
-            tables = self.cursor.fetchall()
-            
-            schema_info += f"Total Tables: {len(tables)}\n\n"
-            
-            for table in tables:
-                table_name = table[0]
-                schema_info += f"TABLE: {table_name}\n"
-                schema_info += "-" * 80 + "\n"
-                
-                self.cursor.execute(f"PRAGMA table_info({table_name})")
-                columns = self.cursor.fetchall()
-                
-                schema_info += f"{'Column Name':<25} {'Type':<15} {'Constraints':<20}\n"
-                schema_info += "-" * 80 + "\n"
-                
-                for col in columns:
-                    col_name, col_type, not_null, default_val, pk = col[1], col[2], col[3], col[4], col[5]
-                    constraints = []
-                    if pk:
-                        constraints.append("PRIMARY KEY")
-                    if not_null:
-                        constraints.append("NOT NULL")
-                    
-                    constraint_str = ", ".join(constraints) if constraints else ""
-                    schema_info += f"{col_name:<25} {col_type:<15} {constraint_str:<20}\n"
-                
-                # Get row count
-                self.cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-                row_count = self.cursor.fetchone()[0]
-                schema_info += f"\nTotal Rows: {row_count}\n"
-                schema_info += "\n\n"
+            # The grid shows the last result set the script produced
+            row_results = [(columns, rows) for _, _, columns, rows, _, error in results if columns is not None]
+            if row_results:
+                self.sql_grid.show(*row_results[-1])
             
-            return schema_info
-        except Exception as e:
-            return f"Error retrieving schema: {str(e)}"
+            failed = any(error for *_, error in results)
+            self.sql_status.config(text="⚠️ Script finished with errors" if failed else "✅ Script executed")
+            self.catalog.invalidate()  # The script may have run DDL
+            self.update_dashboard_stats()
+        
+        def show_error(e):
+            self.sql_results.insert(tk.END, f"❌ Error: {str(e)}\nThe script was rolled back.\n")
+            self.sql_status.config(text="❌ Script failed")
+        
+        self.sql_status.config(text=f"⏳ Running {len(statements)} statements...")
+        self.sql_job = self.write_executor.submit(
+            lambda connection, job: runner.run(connection, statements, job), label="sql script",
+            on_batch=lambda progress: self.sql_status.config(text=f"⏳ Statement {progress[0]} of {progress[1]}..."),
+            on_done=show_results, on_error=show_error,
+            on_cancel=lambda: self.sql_status.config(text="⏹ Script cancelled and rolled back"))
+    
+    def fetch_more_sql(self):
+        pager = self.sql_pager
+        if pager is None or pager.exhausted:
+            return
+        
+        limit = self.get_sql_row_limit()
+        if limit is None:
+            return
+        
+        generation = self.sql_generation
+        
+        def show_error(e):
+            self.sql_pager = None  # The statement can't be resumed after an error
+            self.sql_more_button.config(state=tk.DISABLED)
+            self.sql_results.insert(tk.END, f"❌ Error: {str(e)}\n")
+            self.sql_status.config(text="❌ Fetch failed")
+        
+        def show_cancelled():
+            self.sql_pager = None
+            self.sql_more_button.config(state=tk.DISABLED)
+            self.sql_status.config(text="⏹ Fetch cancelled")
+        
+        self.sql_more_button.config(state=tk.DISABLED)
+        self.sql_status.config(text="⏳ Fetching...")
+        self.sql_job = self.write_executor.submit(
+            lambda connection, job: pager.fetch(job, limit), label="sql console",
+            on_batch=lambda batch: self.show_sql_batch(generation, batch), 
+            on_done=lambda count: self.show_sql_progress(), on_error=show_error, on_cancel=show_cancelled)
+    
+    def show_sql_batch(self, generation, batch):
+        if generation != self.sql_generation:
+            return
+        columns, rows = batch
+        self.sql_grid.set_columns(columns, rows)
+        self.sql_grid.append(rows)
+    
+    def show_sql_progress(self):
+        pager = self.sql_pager
+        if pager is None:
+            return
+        rate = pager.fetched / pager.elapsed if pager.elapsed > 0 else 0
+        text = f"{pager.fetched:,} row(s) in {pager.elapsed:.3f}s ({rate:,.0f} rows/s)"
+        if not pager.exhausted:
+            text += " - more rows available"
+        self.sql_info.config(text=text)
+        self.sql_more_button.config(state=tk.DISABLED if pager.exhausted else tk.NORMAL)
+        self.sql_status.config(text="✅ Query executed")
+    
+    def get_sql_row_limit(self):
+        try:
+            limit = int(self.sql_limit_var.get())
+            if limit <= 0:
+                raise ValueError
+            return limit
+        except ValueError:
+            messagebox.showerror("Invalid Row Limit", "Row limit must be a positive whole number.")
+            return None
+    
+    def close_sql_cursor(self):
+        # An unfinished SELECT holds a read lock, so close it on its own thread
+        pager, self.sql_pager = self.sql_pager, None
+        self.sql_more_button.config(state=tk.DISABLED)
+        if pager is not None and not pager.exhausted:
+            self.write_executor.submit(lambda connection, job: pager.close(), label="sql close")
+    
+    def selected_query_key(self):
+        query_text = self.query_var.get()
+        for desc, key in self.queries:
+            if desc == query_text:
+                return key
+        return None
+    
+    def show_query_parameters(self):
+        for widget in self.query_params_frame.winfo_children():
+            widget.destroy()
+        self.query_param_vars = {}
+        
+        query_key = self.selected_query_key()
+        if not query_key:
+            return
+        
+        for name, label, default in self.query_registry.parameters(query_key):
+            ttk.Label(self.query_params_frame, text=f"{label}:").pack(side=tk.LEFT, padx=(0, 5))
+            var = tk.StringVar(value=str(default))
+            ttk.Entry(self.query_params_frame, textvariable=var, width=15).pack(side=tk.LEFT, padx=(0, 15))
+            self.query_param_vars[name] = var
+    
+    def get_query_params(self, query_key):
+        # Values typed into the parameter fields, or None if one is invalid
+        values = {name: var.get().strip() for name, var in self.query_param_vars.items()}
+        try:
+            return self.query_registry.bind(query_key, values)
+        except ValueError as e:
+            messagebox.showerror("Invalid Parameter", str(e))
+            return None
     
     def get_table_count(self, table_name):
         try:
@@ -1673,9 +5335,9 @@ class DentalClinicApp:
             self.connection_status.config(text="❌ Connection failed")
     
     def drop_tables_only(self):
-        try:
-            self.drop_tables()
-
+        def show_done(result):
+            self.catalog.invalidate()
+            self.dashboard_stats.invalidate()
             self.update_dashboard_stats()
             self.populate_table_list()
             self.refresh_schema()
@@ -1683,16 +5345,22 @@ class DentalClinicApp:
             self.populate_search_tables()
 
             messagebox.showinfo("Success", "Tables dropped successfully!")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to drop tables: {str(e)}")
+
+        self.write_executor.submit(lambda connection, job: self.drop_tables(connection), label="drop tables",
+                                   on_done=show_done,
+                                   on_error=lambda e: messagebox.showerror("Error", f"Failed to drop tables: {str(e)}"))
 
     def create_tables_only(self):
-        try:
-            login = LoginWindow(tk.Tk())
-            login.cursor = self.cursor
-            login.connection = self.connection
+        login = LoginWindow(tk.Tk())
+
+        def run(connection, job):
+            login.connection = connection
+            login.cursor = connection.cursor()
             login.create_tables()
 
+        def show_done(result):
+            self.catalog.invalidate()
+            self.dashboard_stats.invalidate()
             self.update_dashboard_stats()
             self.populate_table_list()
             self.refresh_schema()
@@ -1700,57 +5368,548 @@ class DentalClinicApp:
             self.populate_search_tables()
 
             messagebox.showinfo("Success", "Tables created successfully!")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to create tables: {str(e)}")
+
+        self.write_executor.submit(run, label="create tables", on_done=show_done,
+                                   on_error=lambda e: messagebox.showerror("Error", f"Failed to create tables: {str(e)}"))
 
     def insert_sample_data_only(self):
-        try:
-            login = LoginWindow(tk.Tk())
-            login.cursor = self.cursor
-            login.connection = self.connection
+        login = LoginWindow(tk.Tk())
+
+        def run(connection, job):
+            login.connection = connection
+            login.cursor = connection.cursor()
             login.populate_tables()
 
+        def show_done(result):
+            self.dashboard_stats.invalidate()
             self.update_dashboard_stats()
             self.populate_table_list()
             self.refresh_schema()
 
             messagebox.showinfo("Success", "Sample data inserted successfully!")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to insert sample data: {str(e)}")
 
-    def update_connection_status(self, message):
-        self.connection_status.config(text=message)
+        self.write_executor.submit(run, label="insert sample data", on_done=show_done,
+                                   on_error=lambda e: messagebox.showerror("Error",
+                                                                           f"Failed to insert sample data: {str(e)}"))
+
+    def show_connection_profile(self):
+        try:
+            values = self.profile.effective(self.connection)
+            self.profile_info.config(text=f"⚙️ {ConnectionProfile.describe(values)}")
+        except Exception as e:
+            self.profile_info.config(text=f"⚙️ Connection settings unavailable: {str(e)}")
     
-    def drop_tables(self):
-        tables = [
-            'Bill',
-            'DentalAction_Inventory',
-            'Inventory',
-            'Prescription',
-            'Treatment',
-            'Dental_Action',
-            'Appointment_Staff',
-            'Appointment',
-            'Staff_Schedule',
-            'Receptionist',
-            'Dental_Assistant',
-            'Dentist',
-            'Staff',
-            'Room',
-            'Patient'
-        ]
+    def edit_connection_profile(self):
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Connection Profile")
+        dialog.geometry("450x420")
+        dialog.configure(bg='#f5f5f5')
+        dialog.transient(self.root)
+        dialog.grab_set()
         
-        for table in tables:
-            self.cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        main_frame = ttk.Frame(dialog, padding=20)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        ttk.Label(main_frame, text="Connection Profile", font=('Arial', 14, 'bold')).pack(anchor='w', pady=(0, 5))
+        ttk.Label(main_frame, text=f"Saved to {self.profile.path}", font=('Arial', 9), 
+                 foreground='#666').pack(anchor='w', pady=(0, 10))
+        
+        fields_frame = ttk.Frame(main_frame)
+        fields_frame.pack(fill=tk.BOTH, expand=True)
+        
+        variables = {}
+        for i, name in enumerate(ConnectionProfile.PRAGMAS):
+            ttk.Label(fields_frame, text=f"{name}:").grid(row=i, column=0, sticky='w', pady=5, padx=(0, 10))
+            value = self.profile.settings[name]
+            if name == 'foreign_keys':
+                var = tk.BooleanVar(value=value)
+                ttk.Checkbutton(fields_frame, variable=var).grid(row=i, column=1, sticky='w', pady=5)
+            elif name in ConnectionProfile.CHOICES:
+                var = tk.StringVar(value=value)
+                ttk.Combobox(fields_frame, textvariable=var, values=ConnectionProfile.CHOICES[name], 
+                             state="readonly", width=20).grid(row=i, column=1, sticky='w', pady=5)
+            else:
+                var = tk.StringVar(value=str(value))
+                ttk.Entry(fields_frame, textvariable=var, width=22).grid(row=i, column=1, sticky='w', pady=5)
+            variables[name] = var
+        
+        def reset_defaults():
+            for name, var in variables.items():
+                default = ConnectionProfile.DEFAULTS[name]
+                var.set(default if isinstance(default, bool) else str(default))
+        
+        def save_profile():
+            # Only a profile that applies cleanly is written, so a bad one can't break the next start
+            try:
+                profile = ConnectionProfile({name: var.get() for name, var in variables.items()}, 
+                                            self.profile.path)
+            except Exception as e:
+                messagebox.showerror("Connection Profile", f"Failed to apply profile:\n{str(e)}", parent=dialog)
+                return
+            previous = self.profile
+            
+            # The writer goes first: only it can change journal_mode
+            def run(connection, job):
+                try:
+                    profile.apply(connection)
+                except Exception:
+                    try:
+                        previous.apply(connection)
+                    except sqlite3.Error:
+                        pass  # Keep whatever SQLite accepted; the settings label shows the effective values
+                    raise
+            
+            def show_applied(result):
+                profile.apply(self.connection, read_only=True)
+                try:
+                    profile.save()
+                except OSError as e:
+                    messagebox.showwarning("Connection Profile", 
+                                           f"Profile applied for this session but not saved:\n{str(e)}", parent=dialog)
+                
+                # Worker connections pick the new profile up before their next query
+                self.profile = profile
+                self.executor.profile = profile
+                self.write_executor.profile = profile
+                self.show_connection_profile()
+                dialog.destroy()
+            
+            def show_error(e):
+                self.show_connection_profile()
+                messagebox.showerror("Connection Profile", f"Failed to apply profile:\n{str(e)}", parent=dialog)
+            
+            self.write_executor.submit(run, label="apply profile", on_done=show_applied, on_error=show_error)
+        
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill=tk.X, pady=(10, 0))
+        
+        ttk.Button(button_frame, text="Save", command=save_profile, style='Custom.TButton').pack(side=tk.RIGHT, padx=5)
+        ttk.Button(button_frame, text="Cancel", command=dialog.destroy).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(button_frame, text="Reset to Defaults", command=reset_defaults).pack(side=tk.LEFT, padx=5)
+    
+    def bulk_import(self):
+        paths = filedialog.askopenfilenames(
+            title="Select files to import",
+            filetypes=[("Data files", "*.csv *.jsonl *.ndjson *.json"), ("All files", "*.*")])
+        if not paths:
+            return
+        
+        importer = BulkImporter()
+        try:
+            plan = importer.plan(paths)
+        except Exception as e:
+            messagebox.showerror("Import Error", str(e))
+            return
+        
+        order = "\n".join(f"{table} ← {os.path.basename(path)}" for table, path in plan)
+        if not messagebox.askyesno("Confirm Import", f"Import {len(plan)} file(s) in this order?\n\n{order}"):
+            return
+        
+        def run(connection, job):
+            return importer.import_files(connection, paths, job=job,
+                                         progress=lambda *progress: job.emit(progress))
+        
+        def show_progress(progress):
+            table_name, rows, seconds = progress
+            rate = rows / seconds if seconds > 0 else 0
+            dialog.update(f"Importing {table_name}: {rows:,} rows ({rate:,.0f} rows/s)")
+        
+        def show_done(results):
+            dialog.close()
+            self.update_dashboard_stats()
+            self.populate_table_list()
+            self.populate_search_tables()
+            messagebox.showinfo("Import Complete", BulkImporter.format_summary(results))
+        
+        def show_error(e):
+            dialog.close()
+            messagebox.showerror("Import Error", f"Import failed and was rolled back:\n{str(e)}")
+        
+        def show_cancelled():
+            dialog.close()
+            messagebox.showinfo("Import Cancelled", "Import cancelled. No rows were written.")
+        
+        job = self.write_executor.submit(run, label="bulk import", on_batch=show_progress, on_done=show_done,
+                                         on_error=show_error, on_cancel=show_cancelled)
+        dialog = ProgressDialog(self.root, "Bulk Import", on_cancel=job.cancel)
+    
+    def check_query_plan(self, query_sql, params=()):
+        def show_plan(plan):
+            scans = IndexAdvisor.scan_steps(plan)
+            if scans:
+                self.plan_info.config(text=f"⚠️ Full table scan: {', '.join(scans)}")
+        
+        self.executor.submit(lambda connection, job: self.index_advisor.explain(connection, query_sql, params),
+                             label="query plan", on_done=show_plan)
+    
+    def show_index_advisor(self):
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Index Advisor")
+        dialog.geometry("800x600")
+        dialog.configure(bg='#f5f5f5')
+        dialog.transient(self.root)
+        
+        main_frame = ttk.Frame(dialog, padding=15)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        ttk.Label(main_frame, text="Query plans for the canned reports", 
+                 font=('Arial', 14, 'bold')).pack(anchor='w', pady=(0, 10))
+        
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        report_text = scrolledtext.ScrolledText(main_frame, wrap=tk.WORD, font=('Consolas', 10))
+        report_text.pack(fill=tk.BOTH, expand=True)
+        
+        def show_report(report):
+            report_text.config(state=tk.NORMAL)
+            report_text.delete(1.0, tk.END)
+            flagged = sum(1 for _, _, scans, _ in report if scans)
+            report_text.insert(tk.END, f"{len(report)} queries checked, {flagged} with full table scans\n\n")
+            for key, plan, scans, error in report:
+                status = "❌" if error else ("⚠️" if scans else "✅")
+                report_text.insert(tk.END, f"{status} {key}\n")
+                if error:
+                    report_text.insert(tk.END, f"    Error: {error}\n")
+                for _, _, detail in plan:
+                    report_text.insert(tk.END, f"    {detail}\n")
+                report_text.insert(tk.END, "\n")
+            report_text.config(state=tk.DISABLED)
+        
+        def run_audit():
+            queries = [(key, self.query_registry.sql(key), self.query_registry.bind(key))
+                       for key in self.query_registry.keys]
+            self.executor.submit(lambda connection, job: self.index_advisor.audit(connection, queries),
+                                 label="index audit", on_done=show_report)
+        
+        def create_recommended():
+            def run(connection, job):
+                create_indexes(connection)
+                connection.commit()
+            
+            def show_done(result):
+                self.catalog.invalidate()
+                run_audit()
+                messagebox.showinfo("Index Advisor", "✅ Recommended indexes created.", parent=dialog)
+            
+            self.write_executor.submit(
+                run, label="create indexes", on_done=show_done,
+                on_error=lambda e: messagebox.showerror("Index Advisor", f"Failed to create indexes:\n{str(e)}",
+                                                        parent=dialog))
+        
+        ttk.Button(button_frame, text="Create Recommended Indexes", command=create_recommended, 
+                  style='Custom.TButton').pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Re-check Plans", command=run_audit).pack(side=tk.LEFT, padx=5)
+        
+        run_audit()
+    
+    def suggest_indexes_for_sql(self):
+        query = self.sql_text.get(1.0, tk.END).strip()
+        if not query:
+            messagebox.showwarning("Warning", "Please enter a SQL query.")
+            return
         
-        self.connection.commit()
+        def analyse(connection, job):
+            return self.index_advisor.explain(connection, query), self.index_advisor.suggest_indexes(connection, query)
+        
+        def show_advice(result):
+            plan, suggestions = result
+            self.sql_results.delete(1.0, tk.END)
+            self.sql_results.insert(tk.END, "Query plan:\n")
+            for _, _, detail in plan:
+                self.sql_results.insert(tk.END, f"    {detail}\n")
+            
+            scans = IndexAdvisor.scan_steps(plan)
+            if scans:
+                self.sql_results.insert(tk.END, f"\n⚠️ Full table scans: {', '.join(scans)}\n")
+            if suggestions:
+                self.sql_results.insert(tk.END, "\nSuggested indexes:\n")
+                for statement in suggestions:
+                    self.sql_results.insert(tk.END, f"    {statement};\n")
+            elif not scans:
+                self.sql_results.insert(tk.END, "\n✅ No full table scans\n")
+            self.sql_status.config(text="✅ Plan analysed")
+        
+        def show_error(e):
+            self.sql_results.delete(1.0, tk.END)
+            self.sql_results.insert(tk.END, f"❌ Error: {str(e)}\n")
+            self.sql_status.config(text="❌ Analysis failed")
+        
+        self.executor.submit(analyse, label="suggest indexes", on_done=show_advice, on_error=show_error)
+    
+    def export_results(self, sql, default_name, params=()):
+        path = filedialog.asksaveasfilename(
+            title="Export Results", initialfile=default_name, defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl"), ("Columnar", "*.dcol")])
+        if not path:
+            return
+        
+        exporter = ResultExporter()
+        try:
+            exporter.format_for_path(path)
+        except ValueError as e:
+            messagebox.showerror("Export Error", str(e))
+            return
+        
+        def run(connection, job):
+            return exporter.export(connection, sql, path, params, job=job,
+                                   progress=lambda rows: job.emit(rows))
+        
+        def show_done(rows):
+            dialog.close()
+            messagebox.showinfo("Export Complete", f"✅ Exported {rows:,} row(s) to\n{path}")
+        
+        def show_error(e):
+            dialog.close()
+            messagebox.showerror("Export Error", f"Failed to export results:\n{str(e)}")
+        
+        def show_cancelled():
+            dialog.close()
+            messagebox.showinfo("Export Cancelled", "Export cancelled. The partial file was removed.")
+        
+        job = self.executor.submit(run, label="export",
+                                   on_batch=lambda rows: dialog.update(f"Exported {rows:,} rows..."),
+                                   on_done=show_done, on_error=show_error, on_cancel=show_cancelled)
+        dialog = ProgressDialog(self.root, "Export", on_cancel=job.cancel)
+    
+    def export_selected_query(self):
+        query_key = self.selected_query_key()
+        if not query_key:
+            messagebox.showwarning("Warning", "Please select a query from the dropdown.")
+            return
+        params = self.get_query_params(query_key)
+        if params is not None:
+            self.export_results(self.query_registry.sql(query_key), f"{query_key}.csv", params)
+    
+    def export_table(self):
+        table_name = self.table_var.get()
+        if not table_name:
+            messagebox.showwarning("Warning", "Please select a table first.")
+            return
+        if table_name == self.table_view.table_name:
+            # What the browser shows: current filters and sort order
+            sql, params = self.table_view.export_query()
+            self.export_results(sql, f"{table_name}.csv", params)
+        else:
+            self.export_results(f"SELECT * FROM {table_name}", f"{table_name}.csv")
+    
+    def export_custom_sql(self):
+        query = self.sql_text.get(1.0, tk.END).strip()
+        if not query:
+            messagebox.showwarning("Warning", "Please enter a SQL query.")
+            return
+        self.export_results(query, "query_results.csv")
+    
+    def cancel_job(self, job):
+        if job is not None and not job.done():
+            job.cancel()
+    
+    def on_close(self):
+        self.executor.shutdown()
+        self.write_executor.shutdown()
+        self.root.destroy()
+    
+    def update_connection_status(self, message):
+        self.connection_status.config(text=message)
+    
+    def drop_tables(self, connection):
+        # Runs on the writer
+        self.report_materializer.drop(connection)
+        self.table_versions.drop(connection)
+        self.search_engine.drop(connection)
+        
+        # Children before parents
+        for table in reversed(TABLE_LOAD_ORDER):
+            connection.execute(f"DROP TABLE IF EXISTS {table}")
+        
+        SchemaMigrator.reset(connection)
+        connection.commit()
+
+
+def run_import(args):
+    connection = ConnectionProfile.load().connect(args.db)
+    create_tables(connection)
+    importer = BulkImporter(chunk_size=args.chunk_size, on_conflict=args.on_conflict)
+    
+    def show_progress(table_name, rows, seconds):
+        rate = rows / seconds if seconds > 0 else 0
+        print(f"\r{table_name}: {rows:,} rows ({rate:,.0f} rows/s)".ljust(60), end="", flush=True)
+    
+    try:
+        results = importer.import_files(connection, args.paths, table=args.table, progress=show_progress)
+    except Exception as e:
+        print(f"\nImport failed and was rolled back: {str(e)}", file=sys.stderr)
+        return 1
+    finally:
+        connection.close()
+    
+    print()
+    print(BulkImporter.format_summary(results))
+    return 0
+
+
+def run_generate(args):
+    try:
+        today = date.fromisoformat(args.today) if args.today else None
+        generator = SyntheticDataGenerator(scale=args.scale, seed=args.seed, today=today,
+                                           importer=BulkImporter(chunk_size=args.chunk_size))
+    except ValueError as e:
+        print(f"Invalid argument: {str(e)}", file=sys.stderr)
+        return 1
+    connection = ConnectionProfile.load().connect(args.db)
+    create_tables(connection)
+    
+    def show_progress(table_name, rows, seconds):
+        print(f"\r{table_name}: {rows:,} rows ({seconds:.0f}s)".ljust(60), end="", flush=True)
+    
+    started = time.perf_counter()
+    try:
+        results = generator.generate(connection, progress=show_progress)
+    except Exception as e:
+        print(f"\nGeneration failed and was rolled back: {str(e)}", file=sys.stderr)
+        return 1
+    finally:
+        connection.close()
+    
+    print()
+    print(BulkImporter.format_summary(results))
+    print(f"Generated {sum(result[2] for result in results):,} rows in {time.perf_counter() - started:.1f}s "
+          f"(scale {args.scale:g}, seed {args.seed}, today {generator.today})")
+    return 0
+
+
+def run_benchmark(args):
+    benchmark = Benchmark(scales=args.scales, repeat=args.repeat, seed=args.seed, data_dir=args.data_dir,
+                          profile=ConnectionProfile.load(),
+                          progress=lambda message: print(f"\r{message}"[:79].ljust(80), end="", flush=True))
+    baseline = None
+    if args.baseline:
+        try:
+            with open(args.baseline, encoding='utf-8') as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Cannot read baseline {args.baseline}: {str(e)}", file=sys.stderr)
+            return 1
+    
+    try:
+        results = benchmark.run()
+    except Exception as e:
+        print(f"\nBenchmark failed: {str(e)}", file=sys.stderr)
+        return 1
+    print("\r".ljust(80))
+    print(Benchmark.format_results(results))
+    
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+    
+    if baseline is None:
+        return 0
+    regressions = Benchmark.compare(results, baseline, args.tolerance)
+    if not regressions:
+        print(f"No regressions against {args.baseline}")
+        return 0
+    print(f"{len(regressions)} regression(s) against {args.baseline}:", file=sys.stderr)
+    for scale, name, before, after in regressions:
+        print(f"  scale {scale} {name}: {before:.2f} ms -> {after:.2f} ms ({after / before - 1:+.0%})", file=sys.stderr)
+    return 1
+
+
+def run_export(args):
+    params = ()
+    if args.table:
+        sql = f"SELECT * FROM {args.table}"
+    elif args.query:
+        registry = QueryRegistry()
+        if args.query not in registry:
+            print(f"Unknown query '{args.query}'. Available: {', '.join(registry.keys)}", file=sys.stderr)
+            return 1
+        try:
+            sql = registry.sql(args.query)
+            params = registry.bind(args.query, dict(param.split("=", 1) for param in args.param))
+        except ValueError as e:
+            print(f"Invalid parameter: {str(e)}", file=sys.stderr)
+            return 1
+    else:
+        sql = args.sql
+    
+    connection = ConnectionProfile.load().connect(args.db)
+    exporter = ResultExporter(batch_size=args.batch_size)
+    started = time.perf_counter()
+    try:
+        rows = exporter.export(connection, sql, args.output, params, fmt=args.format,
+                               progress=lambda rows: print(f"\r{rows:,} rows", end="", flush=True))
+    except Exception as e:
+        print(f"\nExport failed: {str(e)}", file=sys.stderr)
+        return 1
+    finally:
+        connection.close()
+    
+    seconds = time.perf_counter() - started
+    print(f"\rExported {rows:,} rows to {args.output} in {seconds:.2f}s")
+    return 0
 
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dental Clinic Management System")
+    subparsers = parser.add_subparsers(dest='command')
+    
+    import_parser = subparsers.add_parser('import', help="Bulk import CSV/JSONL/JSON files or directories")
+    import_parser.add_argument('paths', nargs='+', help="Files named after their table, or directories of them")
+    import_parser.add_argument('--db', default="dental_clinic.db", help="Database file")
+    import_parser.add_argument('--table', help="Load every file into this table instead of matching file names")
+    import_parser.add_argument('--chunk-size', type=int, default=BulkImporter.CHUNK_SIZE)
+    import_parser.add_argument('--on-conflict', choices=sorted(BulkImporter.CONFLICT_MODES), default='abort')
+    
+    generate_parser = subparsers.add_parser('generate', help="Fill an empty database with seeded synthetic data")
+    generate_parser.add_argument('--db', default="dental_clinic.db", help="Database file")
+    generate_parser.add_argument('--scale', type=float, default=1.0,
+                                 help="1 = 10,000 patients and 100,000 appointments; 100 = 1M patients and 10M appointments")
+    generate_parser.add_argument('--seed', type=int, default=42, help="Random seed; the same seed gives the same data")
+    generate_parser.add_argument('--today', metavar='YYYY-MM-DD',
+                                 help=f"Date the data is centred on (default {SyntheticDataGenerator.TODAY}); "
+                                      f"later appointments are scheduled, earlier ones completed or cancelled")
+    generate_parser.add_argument('--chunk-size', type=int, default=BulkImporter.CHUNK_SIZE)
+    
+    benchmark_parser = subparsers.add_parser('benchmark', help="Time every data path on generated databases")
+    benchmark_parser.add_argument('--scales', type=float, nargs='+', default=Benchmark.SCALES,
+                                  help="Dataset scale factors (see generate --scale)")
+    benchmark_parser.add_argument('--repeat', type=int, default=Benchmark.REPEAT, help="Timed runs per case")
+    benchmark_parser.add_argument('--seed', type=int, default=42)
+    benchmark_parser.add_argument('--data-dir', default=Benchmark.DATA_DIR,
+                                  help="Where generated databases are kept (default: %(default)s)")
+    benchmark_parser.add_argument('-o', '--output', default="benchmark_results.json", help="Results file")
+    benchmark_parser.add_argument('--baseline', help="Earlier results file; exit with status 1 on regressions")
+    benchmark_parser.add_argument('--tolerance', type=float, default=Benchmark.TOLERANCE,
+                                  help="Allowed slowdown of the best time before a case counts as a regression")
+    
+    export_parser = subparsers.add_parser('export', help="Stream a table or query to CSV/JSONL/columnar")
+    source = export_parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--table', help="Export a whole table")
+    source.add_argument('--query', help="Export a canned report by key, e.g. patient_billing_summary")
+    source.add_argument('--sql', help="Export the result of a SELECT statement")
+    export_parser.add_argument('--param', action='append', default=[], metavar='NAME=VALUE',
+                               help="Parameter for --query, e.g. --param start_date=2025-10-01")
+    export_parser.add_argument('-o', '--output', required=True, help="Output file (.csv, .jsonl or .dcol)")
+    export_parser.add_argument('--format', choices=sorted(set(ResultExporter.FORMATS.values())),
+                               help="Override the format implied by the file extension")
+    export_parser.add_argument('--db', default="dental_clinic.db", help="Database file")
+    export_parser.add_argument('--batch-size', type=int, default=ResultExporter.BATCH_SIZE)
+    
+    args = parser.parse_args(argv)
+    if args.command == 'import':
+        return run_import(args)
+    if args.command == 'generate':
+        return run_generate(args)
+    if args.command == 'benchmark':
+        return run_benchmark(args)
+    if args.command == 'export':
+        return run_export(args)
+    
     root = tk.Tk()
     login_app = LoginWindow(root)
     root.mainloop()
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
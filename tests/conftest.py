@@ -0,0 +1,39 @@
+import os
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+
+
+@pytest.fixture
+def db_file(tmp_path):
+    return str(tmp_path / "clinic.db")
+
+
+@pytest.fixture
+def connection(db_file):
+    # A fully migrated clinic database with foreign keys enforced
+    connection = sqlite3.connect(db_file)
+    connection.execute("PRAGMA foreign_keys = ON")
+    main.create_tables(connection)
+    yield connection
+    connection.close()
+
+
+@pytest.fixture
+def patients(connection):
+    connection.executemany("INSERT INTO Patient (patient_id, full_name, city) VALUES (?, ?, ?)",
+                           [(1, "Ann Lee", "Toronto"), (2, "Bo Chen", "Ottawa"), (3, "Cy Diaz", None)])
+    connection.commit()
+    return connection
+
+
+@pytest.fixture
+def generated(connection):
+    # A small reproducible clinic with every table filled
+    main.SyntheticDataGenerator(scale=0.01, seed=7).generate(connection)
+    return connection
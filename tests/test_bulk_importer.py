@@ -0,0 +1,31 @@
+import json
+
+import pytest
+
+import main
+
+
+def read(path):
+    rows = main.BulkImporter().read_file(str(path))
+    return next(rows), list(rows)
+
+
+def test_json_header_is_the_union_of_keys(tmp_path):
+    path = tmp_path / "Patient.json"
+    path.write_text(json.dumps([{"patient_id": 1, "full_name": "Ann Lee"},
+                                {"patient_id": 2, "city": "Ottawa"}]))
+    assert read(path) == (["patient_id", "full_name", "city"],
+                          [(1, "Ann Lee", None), (2, None, "Ottawa")])
+
+
+def test_jsonl_rejects_keys_missing_from_the_first_record(tmp_path):
+    path = tmp_path / "Patient.jsonl"
+    path.write_text('{"patient_id": 1, "full_name": "Ann Lee"}\n\n{"patient_id": 2, "city": "Ottawa"}\n')
+    with pytest.raises(ValueError, match="line 3.*city"):
+        read(path)
+
+
+def test_jsonl_allows_records_with_fewer_keys(tmp_path):
+    path = tmp_path / "Patient.jsonl"
+    path.write_text('{"patient_id": 1, "full_name": "Ann Lee"}\n{"patient_id": 2}\n')
+    assert read(path) == (["patient_id", "full_name"], [(1, "Ann Lee"), (2, None)])
@@ -0,0 +1,59 @@
+import sqlite3
+
+import pytest
+
+import main
+
+
+def names(connection):
+    return connection.execute("SELECT full_name FROM Patient ORDER BY patient_id").fetchall()
+
+
+@pytest.fixture
+def manager(patients, db_file):
+    manager = main.ConnectionManager(db_file, None)
+    yield manager
+    manager.writer.shutdown()
+
+
+def test_write_many_failing_batch_changes_nothing(manager, patients):
+    before = names(patients)
+    job = manager.write_many("UPDATE Patient SET full_name = ? WHERE patient_id = ?",
+                             [("Changed", 1), (None, 2)])
+    with pytest.raises(sqlite3.IntegrityError):
+        job.result()
+    assert names(patients) == before
+    # A later write must not commit any part of the failed batch
+    manager.write("UPDATE Patient SET city = 'Hamilton' WHERE patient_id = 3").result()
+    assert names(patients) == before
+
+
+def test_write_many_commits_every_row(manager, patients):
+    rowcount, _, _ = manager.write_many("DELETE FROM Patient WHERE rowid = ?", [(1,), (3,)]).result()
+    assert rowcount == 2
+    assert names(patients) == [("Bo Chen",)]
+
+
+def test_write_failure_leaves_no_open_transaction(manager, db_file):
+    with pytest.raises(sqlite3.IntegrityError):
+        manager.write("UPDATE Patient SET full_name = NULL WHERE patient_id = 1").result()
+    # An open transaction would hold the write lock against other workstations
+    other = sqlite3.connect(db_file, timeout=0)
+    other.execute("UPDATE Patient SET city = 'Hamilton' WHERE patient_id = 3")
+    other.commit()
+    other.close()
+
+
+def test_write_reads_back_on_the_writer(manager):
+    job = manager.write("INSERT INTO Patient (full_name, city) VALUES (?, ?)", ("Di Park", "Kingston"),
+                        read_back=lambda connection, lastrowid: connection.execute(
+                            "SELECT rowid, full_name FROM Patient WHERE rowid = ?", (lastrowid,)).fetchall())
+    rowcount, lastrowid, rows = job.result()
+    assert rowcount == 1
+    assert rows == [(lastrowid, "Di Park")]
+
+
+def test_writes_run_in_order_on_one_connection(manager):
+    jobs = [manager.writer.submit(lambda connection, job: (id(connection), main.threading.get_ident()))
+               for _ in range(5)]
+    assert len({job.result() for job in jobs}) == 1
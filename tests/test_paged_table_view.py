@@ -0,0 +1,50 @@
+import sqlite3
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def table():
+    # Duplicates and NULLs in the sort column, rowids out of value order
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE t (value)")
+    values = [3, None, 1, 3, None, 2, 1, 3, None, 2, 5, 4, 1, None, 5]
+    connection.executemany("INSERT INTO t (value) VALUES (?)", [(value,) for value in values])
+    yield connection
+    connection.close()
+
+
+def order_by(descending, backward):
+    return "value DESC, rowid DESC" if descending != backward else "value, rowid"
+
+
+def walk(connection, descending, backward, page_size=2):
+    # Pages through t the way PagedTableView does, starting from either end
+    rows = connection.execute(f"SELECT value, rowid FROM t ORDER BY {order_by(descending, backward)} "
+                              f"LIMIT ?", (page_size,)).fetchall()
+    seen = list(rows)
+    while rows:
+        value, rowid = rows[-1]
+        condition, params = main.PagedTableView.keyset_condition('value', value, rowid,
+                                                                 greater=backward == descending)
+        rows = connection.execute(f"SELECT value, rowid FROM t WHERE {condition} "
+                                  f"ORDER BY {order_by(descending, backward)} LIMIT ?",
+                                  params + [page_size]).fetchall()
+        seen.extend(rows)
+    return [rowid for _, rowid in seen]
+
+
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("backward", [False, True])
+def test_keyset_paging_visits_every_row_in_sort_order(table, descending, backward):
+    expected = [row[0] for row in table.execute(
+        f"SELECT rowid FROM t ORDER BY {order_by(descending, backward)}")]
+    assert walk(table, descending, backward) == expected
+
+
+def test_keyset_condition_binds_values():
+    condition, params = main.PagedTableView.keyset_condition('value', "x'); DROP TABLE t; --", 4, greater=True)
+    assert "DROP" not in condition
+    assert params == ["x'); DROP TABLE t; --", 4]
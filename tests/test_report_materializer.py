@@ -0,0 +1,48 @@
+import pytest
+
+import main
+
+
+def summary(connection, key):
+    table = main.ReportMaterializer.summary_table(key)
+    return sorted(connection.execute(f"SELECT * FROM {table}").fetchall(), key=repr)
+
+
+def rebuilt(connection, key):
+    materializer = main.ReportMaterializer()
+    refreshed = summary(connection, key)
+    materializer.rebuild(connection, key)
+    return refreshed, summary(connection, key)
+
+
+@pytest.mark.parametrize("key", list(main.ReportMaterializer.REPORTS))
+def test_refresh_of_a_few_groups_matches_rebuild(generated, key):
+    generated.execute("UPDATE Bill SET total_amount = total_amount + 5 WHERE bill_id % 50 = 0")
+    generated.execute("UPDATE DentalAction_Inventory SET quantity_used = quantity_used + 1 WHERE rowid % 40 = 0")
+    generated.execute("DELETE FROM Appointment_Staff WHERE rowid % 60 = 0")
+    generated.commit()
+    materializer = main.ReportMaterializer()
+    pending = materializer.freshness(generated, key)[1]
+    assert materializer.refresh(generated, key) == pending
+    assert materializer.freshness(generated, key)[1] == 0
+    refreshed, expected = rebuilt(generated, key)
+    assert refreshed == expected
+
+
+def test_refresh_of_most_groups_rebuilds(generated):
+    key = 'patient_billing_summary'
+    generated.execute("UPDATE Bill SET total_amount = total_amount * 2")
+    generated.commit()
+    materializer = main.ReportMaterializer()
+    assert materializer.freshness(generated, key)[1] > 0
+    materializer.refresh(generated, key)
+    refreshed, expected = rebuilt(generated, key)
+    assert refreshed == expected
+
+
+def test_bulk_import_rebuilds_reports_without_change_log(generated, tmp_path):
+    (tmp_path / "Room.csv").write_text("room_number,room_type,capacity,availability\n9001,Surgery,2,Y\n")
+    main.BulkImporter().import_files(generated, [str(tmp_path / "Room.csv")])
+    assert generated.execute("SELECT COUNT(*) FROM mv_change_log").fetchone()[0] == 0
+    triggers = generated.execute("SELECT COUNT(*) FROM sqlite_master WHERE type='trigger' AND name LIKE 'mv%'")
+    assert triggers.fetchone()[0] > 0
@@ -0,0 +1,55 @@
+import sqlite3
+
+import main
+
+
+SQL = "SELECT full_name FROM Patient ORDER BY full_name"
+
+
+def lookup(connection, cache, versions_of):
+    versions = versions_of()
+    cached = cache.get(("patients", ()), versions)
+    if cached is None:
+        cursor = connection.execute(SQL)
+        cache.put(("patients", ()), versions, [d[0] for d in cursor.description], cursor.fetchall())
+    return cached
+
+
+def test_entry_is_served_until_a_dependency_changes(patients, db_file):
+    cache = main.ResultCache()
+    table_versions = main.TableVersions()
+    tables = main.ResultCache.dependencies(SQL, main.SchemaCatalog(patients).table_names())
+    assert tables == ['Patient']
+
+    def versions_of():
+        return table_versions.current(patients, tables)
+
+    assert lookup(patients, cache, versions_of) is None
+    assert lookup(patients, cache, versions_of) is not None
+    # A write from another connection bumps the table's version
+    other = sqlite3.connect(db_file)
+    other.execute("UPDATE Patient SET city = city WHERE patient_id = 1")
+    other.commit()
+    other.close()
+    assert lookup(patients, cache, versions_of) is None
+    assert lookup(patients, cache, versions_of) is not None
+    # Unrelated tables don't invalidate it
+    patients.execute("INSERT INTO Room (room_number, room_type, capacity, availability) VALUES (1, 'Surgery', 1, 'Y')")
+    patients.commit()
+    assert lookup(patients, cache, versions_of) is not None
+    assert (cache.hits, cache.misses) == (3, 2)
+
+
+def test_untracked_tables_are_not_cached(patients):
+    cache = main.ResultCache()
+    versions = main.TableVersions().current(patients, ['NoSuchTable'])
+    assert versions is None
+    cache.put(("x", ()), versions, ['a'], [(1,)])
+    assert cache.get(("x", ()), versions) is None
+
+
+def test_time_dependent_queries_are_not_cacheable():
+    registry = main.QueryRegistry()
+    assert not main.ResultCache.is_cacheable(registry.sql('upcoming_scheduled_appointments'))
+    assert not main.ResultCache.is_cacheable("SELECT date('now')")
+    assert main.ResultCache.is_cacheable(registry.sql('patients_from_city'))
@@ -0,0 +1,50 @@
+import pytest
+
+import main
+
+
+def schema(connection):
+    return sorted(connection.execute("SELECT type, name, sql FROM sqlite_master").fetchall(), key=repr)
+
+
+def test_new_database_gets_every_migration(connection):
+    assert main.SchemaMigrator.current_version(connection) == main.SchemaMigrator.LATEST
+    assert main.SchemaMigrator().pending(connection) == []
+
+
+def test_migrate_is_idempotent(connection):
+    before = schema(connection)
+    assert main.SchemaMigrator().migrate(connection) == []
+    main.SchemaMigrator().migrate(connection, reapply=True)
+    assert schema(connection) == before
+    assert not connection.in_transaction
+
+
+def test_migrate_inside_open_transaction(connection):
+    main.SchemaMigrator.reset(connection)
+    connection.execute("INSERT INTO Patient (patient_id, full_name) VALUES (1, 'Ann Lee')")
+    assert connection.in_transaction
+    main.SchemaMigrator().migrate(connection)
+    connection.commit()
+    assert main.SchemaMigrator.current_version(connection) == main.SchemaMigrator.LATEST
+
+
+def test_failed_step_keeps_previous_version(connection):
+    main.SchemaMigrator.reset(connection)
+    migrator = main.SchemaMigrator()
+
+    def broken(connection):
+        connection.execute("CREATE TABLE half_done (x)")
+        raise RuntimeError("step failed")
+
+    migrator.MIGRATIONS = main.SchemaMigrator.MIGRATIONS[:1] + [(2, "Broken", broken)]
+    with pytest.raises(RuntimeError):
+        migrator.migrate(connection)
+    assert main.SchemaMigrator.current_version(connection) == 1
+    assert connection.execute("SELECT 1 FROM sqlite_master WHERE name = 'half_done'").fetchone() is None
+
+
+def test_newer_database_is_rejected(connection):
+    connection.execute(f"PRAGMA user_version = {main.SchemaMigrator.LATEST + 1}")
+    with pytest.raises(ValueError):
+        main.SchemaMigrator().migrate(connection)
@@ -0,0 +1,55 @@
+from unittest import mock
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def clinic(connection):
+    connection.executemany(
+        "INSERT INTO Patient (patient_id, full_name, city, phone, medical_history) VALUES (?, ?, ?, ?, ?)",
+        [(1, "John O'Brien", "Toronto", "416-555-0101", "Hypertension"),
+         (2, "Ann-Marie Lee", "North York", "(905) 555-0199", "None"),
+         (3, "Élodie Roy", "Montréal", "514 555 0123", "Asthma, hypertension"),
+         (4, "Bo Chen", None, None, None)])
+    connection.commit()
+    return connection
+
+
+def ids(connection, sql, params):
+    return sorted(row[0] for row in connection.execute(sql, params))
+
+
+def like_ids(connection, column, pattern):
+    return ids(connection, f"SELECT patient_id FROM Patient WHERE {column} LIKE ?", (pattern,))
+
+
+@pytest.mark.parametrize("column, term", [
+    ("full_name", "ohn"), ("phone", "16-55"), ("medical_history", "tension"),
+    ("full_name", "Lee"), ("city", "or"), ("full_name", "'B")])
+def test_contains_matches_like(clinic, column, term):
+    sql, params = main.SearchEngine().column_query(clinic, 'Patient', column, term)
+    assert ids(clinic, sql.replace("*", "patient_id"), params) == like_ids(clinic, column, f"%{term}%")
+
+
+@pytest.mark.parametrize("column, term", [
+    ("full_name", "Jo"), ("full_name", "John O'B"), ("full_name", "Ann-M"), ("phone", "(905) 5"),
+    ("phone", "416-555"), ("city", "north y"), ("medical_history", "asthma, hyp"), ("full_name", "ohn")])
+def test_startswith_matches_like(clinic, column, term):
+    engine = main.SearchEngine()
+    sql, params = engine.column_query(clinic, 'Patient', column, term, startswith=True)
+    assert "MATCH" in sql
+    assert ids(clinic, sql.replace("*", "patient_id"), params) == like_ids(clinic, column, f"{term}%")
+
+
+def test_browser_filters(clinic):
+    view = main.PagedTableView(mock.Mock(), None, None, search_engine=main.SearchEngine())
+    view.table_name = 'Patient'
+    view.full_text_tables = {'Patient'}
+    assert view.filter_condition('full_name', 'ohn') == ("full_name LIKE ?", ["%ohn%"])
+    condition, params = view.filter_condition('full_name', '^Jo')
+    assert "MATCH" in condition
+    assert ids(clinic, f"SELECT patient_id FROM Patient WHERE {condition}", params) == [1]
+    view.full_text_tables = set()
+    assert view.filter_condition('full_name', '^Jo') == ("full_name LIKE ?", ["Jo%"])